@@ -0,0 +1,318 @@
+import yaml
+
+from kubernetes.client.rest import ApiException
+
+from gw_agent import settings
+from repository.common import k8s_client
+
+logger = settings.get_logger(__name__)
+
+FIELD_MANAGER = 'gedge-agent'
+HTTP_STATUS_NOT_FOUND = 404
+
+
+class KubeApiCommand:
+    """
+    in-process kubernetes command backend with k8s_client.Connector
+    - every method returns the same tuple as KubeCommand, i.e., (bool) ok, (str) stdout, (str) stderr
+    - ApiException(rejected by kube-apiserver) is returned as a failure;
+      other exceptions(i.e., connection, resource discovery) are raised to let caller fall back to kubectl
+    """
+
+    @staticmethod
+    def _error(exc: ApiException):
+        """
+        convert ApiException to command result
+        :param exc: (ApiException)
+        :return: (bool, str, str)
+        """
+        return False, '', '({}) {}'.format(exc.status, exc.reason)
+
+    @staticmethod
+    def _load_manifest(manifest) -> list:
+        """
+        load multi-document manifest file
+        :param manifest: (str) manifest file path
+        :return: (list(dict)) documents
+        """
+        with open(manifest, 'r') as f:
+            documents = [doc for doc in yaml.safe_load_all(f) if doc]
+
+        # expand 'List' kind documents
+        items = []
+        for doc in documents:
+            if doc.get('kind', '').endswith('List') and 'items' in doc:
+                items.extend(doc['items'])
+            else:
+                items.append(doc)
+
+        return items
+
+    @staticmethod
+    def _get_dynamic_resource(document):
+        """
+        get dynamic resource and namespace for manifest document
+        :param document: (dict)
+        :return: (Resource, str) resource, namespace(None for cluster scoped resource)
+        """
+        resource = k8s_client.Connector().dynamic_client().resources.get(api_version=document['apiVersion'],
+                                                                         kind=document['kind'])
+        namespace = None
+        if resource.namespaced:
+            namespace = document.get('metadata', {}).get('namespace', 'default')
+
+        return resource, namespace
+
+    @staticmethod
+    def apply_manifest_file(manifest):
+        """
+        server-side apply kubernetes manifest file(multi-document)
+        :param manifest: (str) manifest file path
+        :return:
+        """
+        documents = KubeApiCommand._load_manifest(manifest)
+        applied = []
+
+        # resolve all resources before apply, not to apply a part of manifest
+        resources = [KubeApiCommand._get_dynamic_resource(doc) for doc in documents]
+
+        for document, (resource, namespace) in zip(documents, resources):
+            name = document['metadata']['name']
+            try:
+                k8s_client.Connector().dynamic_client().server_side_apply(resource,
+                                                                          body=document,
+                                                                          name=name,
+                                                                          namespace=namespace,
+                                                                          field_manager=FIELD_MANAGER,
+                                                                          force_conflicts=True)
+            except ApiException as exc:
+                return False, '\n'.join(applied), '{} "{}": ({}) {}'.format(document['kind'], name,
+                                                                           exc.status, exc.reason)
+
+            applied.append('{}/{} serverside-applied'.format(document['kind'].lower(), name))
+
+        return True, '\n'.join(applied), ''
+
+    @staticmethod
+    def delete_manifest_file(manifest):
+        """
+        delete resources in kubernetes manifest file(reverse order of documents)
+        :param manifest: (str) manifest file path
+        :return:
+        """
+        documents = KubeApiCommand._load_manifest(manifest)
+        resources = [KubeApiCommand._get_dynamic_resource(doc) for doc in documents]
+        deleted = []
+        errors = []
+
+        for document, (resource, namespace) in reversed(list(zip(documents, resources))):
+            name = document['metadata']['name']
+            try:
+                resource.delete(name=name, namespace=namespace)
+            except ApiException as exc:
+                errors.append('{} "{}": ({}) {}'.format(document['kind'], name, exc.status, exc.reason))
+                continue
+
+            deleted.append('{} "{}" deleted'.format(document['kind'].lower(), name))
+
+        return len(errors) == 0, '\n'.join(deleted), '\n'.join(errors)
+
+    @staticmethod
+    def delete_namespace(namespace, force=False):
+        """
+        delete kubernetes namespace
+        :param namespace: (str)
+        :param force: (bool) delete immediately
+        :return:
+        """
+        kwargs = {'grace_period_seconds': 0} if force else {}
+        try:
+            k8s_client.Connector().core_v1_api().delete_namespace(namespace, **kwargs)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'namespace "{}" deleted'.format(namespace), ''
+
+    @staticmethod
+    def read_namespace(namespace):
+        """
+        read kubernetes namespace
+        :param namespace: (str)
+        :return:
+        """
+        try:
+            k8s_client.Connector().core_v1_api().read_namespace(namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, namespace, ''
+
+    @staticmethod
+    def create_namespace(namespace):
+        """
+        create kubernetes namespace
+        :param namespace: (str)
+        :return:
+        """
+        body = {'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': namespace}}
+        try:
+            k8s_client.Connector().core_v1_api().create_namespace(body)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'namespace/{} created'.format(namespace), ''
+
+    @staticmethod
+    def delete_pod(namespace, pod, force=False):
+        """
+        delete kubernetes pod
+        :param namespace: (str)
+        :param pod: (str)
+        :param force: (bool) delete immediately
+        :return:
+        """
+        kwargs = {'grace_period_seconds': 0} if force else {}
+        try:
+            k8s_client.Connector().core_v1_api().delete_namespaced_pod(pod, namespace, **kwargs)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'pod "{}" deleted'.format(pod), ''
+
+    @staticmethod
+    def read_pod(namespace, pod):
+        """
+        read kubernetes pod
+        :param namespace: (str)
+        :param pod: (str)
+        :return: (bool, V1Pod, str)
+        """
+        try:
+            result = k8s_client.Connector().core_v1_api().read_namespaced_pod(pod, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, result, ''
+
+    @staticmethod
+    def delete_service(namespace, service):
+        """
+        delete kubernetes service
+        :param namespace: (str)
+        :param service: (str)
+        :return:
+        """
+        try:
+            k8s_client.Connector().core_v1_api().delete_namespaced_service(service, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'service "{}" deleted'.format(service), ''
+
+    @staticmethod
+    def read_service(namespace, service):
+        """
+        read kubernetes service
+        :param namespace: (str)
+        :param service: (str)
+        :return:
+        """
+        try:
+            k8s_client.Connector().core_v1_api().read_namespaced_service(service, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, service, ''
+
+    @staticmethod
+    def delete_deployment(namespace, deployment):
+        """
+        delete kubernetes deployment
+        :param namespace: (str)
+        :param deployment: (str)
+        :return:
+        """
+        try:
+            k8s_client.Connector().app_v1_api().delete_namespaced_deployment(deployment, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'deployment.apps "{}" deleted'.format(deployment), ''
+
+    @staticmethod
+    def read_deployment(namespace, deployment):
+        """
+        read kubernetes deployment
+        :param namespace: (str)
+        :param deployment: (str)
+        :return: (bool, V1Deployment, str)
+        """
+        try:
+            result = k8s_client.Connector().app_v1_api().read_namespaced_deployment(deployment, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, result, ''
+
+    @staticmethod
+    def scale_deployment(namespace, deployment, replicas):
+        """
+        adjust replicas for deployment
+        :param namespace: (str)
+        :param deployment: (str)
+        :param replicas: (int)
+        :return:
+        """
+        try:
+            k8s_client.Connector().app_v1_api().patch_namespaced_deployment_scale(deployment, namespace,
+                                                                                  {'spec': {'replicas': replicas}})
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'deployment.apps/{} scaled'.format(deployment), ''
+
+    @staticmethod
+    def delete_daemonset(namespace, daemonset):
+        """
+        delete kubernetes daemonset
+        :param namespace: (str)
+        :param daemonset: (str)
+        :return:
+        """
+        try:
+            k8s_client.Connector().app_v1_api().delete_namespaced_daemon_set(daemonset, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'daemonset.apps "{}" deleted'.format(daemonset), ''
+
+    @staticmethod
+    def read_daemonset(namespace, daemonset):
+        """
+        read kubernetes daemonset
+        :param namespace: (str)
+        :param daemonset: (str)
+        :return: (bool, V1DaemonSet, str)
+        """
+        try:
+            result = k8s_client.Connector().app_v1_api().read_namespaced_daemon_set(daemonset, namespace)
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, result, ''
+
+    @staticmethod
+    def set_node_label(node, label):
+        """
+        set(overwrite) node label
+        :param node: (str)
+        :param label: (str) 'key=value'
+        :return:
+        """
+        key, value = label.split('=', 1)
+        try:
+            k8s_client.Connector().core_v1_api().patch_node(node, {'metadata': {'labels': {key: value}}})
+        except ApiException as exc:
+            return KubeApiCommand._error(exc)
+
+        return True, 'node/{} labeled'.format(node), ''
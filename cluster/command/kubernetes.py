@@ -5,13 +5,15 @@ import os
 
 from gw_agent import settings
 from gw_agent.common.error import get_exception_traceback
-from repository.common.type import MultiClusterRole
+from repository.common.type import MultiClusterRole, Kubernetes
 from repository.cache.network import NetworkStatusRepository
 from repository.cache.resources import ResourceRepository
 from repository.model.k8s.service import Service
 from utils.fileutils import FileUtil
 from utils.run import RunCommand
 from cluster.watcher.commands import CommandExecutor
+from cluster.command.kubeapi import KubeApiCommand
+from cluster.watcher.informer import InformerFactory
 from repository.common import nfs_server_client
 from repository.common import k8s_client
 from utils.validate import Validator
@@ -27,6 +29,7 @@ logger = settings.get_logger(__name__)
 class KubeCommand:
     """
     kube-system resources checklist
+    commands are executed with kubernetes api(KubeApiCommand), and kubectl is used as fallback
     """
 
     def __new__(cls, *args, **kwargs):
@@ -34,6 +37,26 @@ class KubeCommand:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @staticmethod
+    def _execute(method, args, cmdline):
+        """
+        execute command with kubernetes api, and fall back to kubectl when kubernetes api is not available
+        :param method: (callable) KubeApiCommand method
+        :param args: (tuple) method arguments
+        :param cmdline: (str) fallback kubectl command line
+        :return:
+        (bool) success
+        (str) stdout
+        (str) stderr
+        """
+        try:
+            return method(*args)
+        except Exception as exc:
+            logger.warning('Fail to call KubeApiCommand.{}(), fall back to kubectl, '
+                           'caused by {}'.format(method.__name__, get_exception_traceback(exc)))
+
+        return RunCommand.execute_shell_wait(cmdline)
+
     @staticmethod
     def execute_shell_nowait(cmdline):
         executor = CommandExecutor()
@@ -51,7 +74,7 @@ class KubeCommand:
 
         cmdline = ' '.join([KUBECTL, 'apply', '-f', manifest])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.apply_manifest_file, (manifest,), cmdline)
 
     @staticmethod
     def delete_manifest_file(manifest):
@@ -65,7 +88,7 @@ class KubeCommand:
 
         cmdline = ' '.join([KUBECTL, 'delete', '-f', manifest])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_manifest_file, (manifest,), cmdline)
 
     @staticmethod
     def validate_manifest(manifest):
@@ -93,7 +116,7 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'delete', 'namespace', namespace, '--force'])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_namespace, (namespace, True), cmdline)
 
     @staticmethod
     def is_namespace_deployed(namespace: str):
@@ -107,7 +130,7 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'namespace', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.read_namespace, (namespace,), cmdline)
 
     @staticmethod
     def delete_pod(namespace, pod):
@@ -119,7 +142,7 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'delete', 'pod', pod, '-n', namespace, '--force'])
         # cmdline = ' '.join([KUBECTL, 'delete', 'pod', pod, '-n', namespace])
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_pod, (namespace, pod, True), cmdline)
 
     @staticmethod
     def is_pod_deployed(namespace: str, pod: str):
@@ -131,7 +154,11 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'pod', pod, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_pod, (namespace, pod), cmdline)
+        if ok and type(stdout) != str:
+            stdout = pod
+
+        return ok, stdout, stderr
 
     @staticmethod
     def is_pod_running(namespace: str, pod: str):
@@ -143,11 +170,17 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'pod', pod,
                             '-n', namespace, '-o', 'json'])
-        ok, stdout, stderr = RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_pod, (namespace, pod), cmdline)
 
         if not ok:
             return ok, stdout, stderr
 
+        if type(stdout) != str:
+            # V1Pod from kubernetes api
+            if stdout.status is not None and stdout.status.phase == 'Running':
+                return True, '', ''
+            return False, '', ''
+
         result = json.loads(stdout)
         if result is None:
             return False, '', ''
@@ -171,7 +204,7 @@ class KubeCommand:
         # cmdline = ' '.join([KUBECTL, 'delete', 'service', service, '-n', namespace, '--force'])
         cmdline = ' '.join([KUBECTL, 'delete', 'service', service, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_service, (namespace, service), cmdline)
 
     @staticmethod
     def is_service_deployed(namespace: str, service: str):
@@ -186,7 +219,7 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'service', service, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.read_service, (namespace, service), cmdline)
 
     @staticmethod
     def delete_deployment(namespace, deployment):
@@ -199,7 +232,7 @@ class KubeCommand:
         # cmdline = ' '.join([KUBECTL, 'delete', 'deployment', deployment, '-n', namespace, '--force'])
         cmdline = ' '.join([KUBECTL, 'delete', 'deployment', deployment, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_deployment, (namespace, deployment), cmdline)
 
     @staticmethod
     def is_deployment_deployed(namespace: str, deployment: str):
@@ -214,7 +247,11 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'deployment', deployment, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_deployment, (namespace, deployment), cmdline)
+        if ok and type(stdout) != str:
+            stdout = deployment
+
+        return ok, stdout, stderr
 
     @staticmethod
     def is_all_deployment_replicas_ready(namespace: str, deployment: str):
@@ -225,10 +262,19 @@ class KubeCommand:
         :return:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'deployment', deployment, '-n', namespace, '-o', 'json'])
-        ok, stdout, stderr = RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_deployment, (namespace, deployment), cmdline)
         if not ok:
             return ok, stdout, stderr
 
+        if type(stdout) != str:
+            # V1Deployment from kubernetes api
+            status = stdout.status
+            if status is None or status.ready_replicas is None or status.replicas is None:
+                return False, '', ''
+            if status.ready_replicas == status.replicas:
+                return True, '', ''
+            return False, '', 'All pod are not ready'
+
         result = json.loads(stdout)
         if result is None:
             return False, '', ''
@@ -263,7 +309,7 @@ class KubeCommand:
                             '--replicas', str(replicas),
                             '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.scale_deployment, (namespace, deployment, replicas), cmdline)
 
     @staticmethod
     def is_daemonset_deployed(namespace: str, daemonset: str) -> (bool, str, str):
@@ -278,7 +324,11 @@ class KubeCommand:
         """
         cmdline = ' '.join([KUBECTL, 'get', 'daemonset', daemonset, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_daemonset, (namespace, daemonset), cmdline)
+        if ok and type(stdout) != str:
+            stdout = daemonset
+
+        return ok, stdout, stderr
 
     @staticmethod
     def is_all_daemonset_replicas_ready(namespace: str, daemonset: str):
@@ -291,10 +341,19 @@ class KubeCommand:
         cmdline = ' '.join([KUBECTL, 'get', 'daemonset', daemonset, '-n', namespace, '-o', 'json'])
         # '--no-headers',
         # '-o', 'custom-columns=":status.numberReady,:status.desiredNumberScheduled""'])
-        ok, stdout, stderr = RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.read_daemonset, (namespace, daemonset), cmdline)
         if not ok:
             return ok, stdout, stderr
 
+        if type(stdout) != str:
+            # V1DaemonSet from kubernetes api
+            status = stdout.status
+            if status is None or status.number_ready is None or status.desired_number_scheduled is None:
+                return False, '', ''
+            if status.number_ready == status.desired_number_scheduled:
+                return True, '', ''
+            return False, '', 'All pod are not ready'
+
         result = json.loads(stdout)
         if result is None:
             return False, '', ''
@@ -336,7 +395,7 @@ class KubeCommand:
         # cmdline = ' '.join([KUBECTL, 'delete', 'daemonset', daemonset, '-n', namespace, '--force'])
         cmdline = ' '.join([KUBECTL, 'delete', 'daemonset', daemonset, '-n', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.delete_daemonset, (namespace, daemonset), cmdline)
 
     @staticmethod
     def delete_namespace_nowait(name):
@@ -679,7 +738,7 @@ class KubeCommand:
             return False, None, 'Invalid label({})'.format(label)
 
         cmdline = ' '.join([KUBECTL, 'label', 'node', node, label, '--overwrite'])
-        ok, stdout, stderr = RunCommand.execute_shell_wait(cmdline)
+        ok, stdout, stderr = KubeCommand._execute(KubeApiCommand.set_node_label, (node, label), cmdline)
 
         if not ok:
             return False, None, 'Fail to set label to node({}) caused by {}'.format(node, stderr)
@@ -698,7 +757,7 @@ class KubeCommand:
 
         cmdline = ' '.join([KUBECTL, 'create', 'ns', namespace])
 
-        return RunCommand.execute_shell_wait(cmdline)
+        return KubeCommand._execute(KubeApiCommand.create_namespace, (namespace,), cmdline)
 
     @staticmethod
     def deploy_gedge_namespace():
@@ -1012,9 +1071,20 @@ class KubeCommand:
         (str) List[str]; matched pod name list
         (str) error message
         """
-        api_client = k8s_client.Connector().core_v1_api()
         found_pods = []
 
+        # pod informer feeds resource cache, so list pods from it once synced
+        if InformerFactory().has_synced(Kubernetes.POD):
+            for pod in ResourceRepository().get_pods_by_namespace(namespace):
+                if pod_name_prefix in pod.get_name():
+                    found_pods.append(pod.get_name())
+
+            if not found_pods:
+                return False, found_pods, 'Not found pod'
+            return True, found_pods, None
+
+        api_client = k8s_client.Connector().core_v1_api()
+
         try:
             result = api_client.list_namespaced_pod(namespace=namespace,
                                                     _request_timeout=settings.KUBE_API_REQUEST_TIMEOUT)
@@ -8,6 +8,8 @@ class ClusterDAO:
     """
     Cluster data access object(DAO) class
     """
+    _NOT_CACHED = object()
+    _remote_cluster_name = _NOT_CACHED  # cached Cluster.remote_cluster_name; updated when it is saved
 
     @classmethod
     def initialize_cluster(cls, cluster_name: str) -> (bool, str):
@@ -74,12 +76,17 @@ class ClusterDAO:
         (str) remote cluster id connected
         (str) error message
         """
+        remote_cluster_name = cls._remote_cluster_name
+        if remote_cluster_name is not cls._NOT_CACHED:
+            return True, remote_cluster_name, None
+
         ok, cluster_object, error_message = ClusterDAO.get_cluster()
 
         if not ok:
             return ok, None, error_message
 
         remote_cluster_name = cluster_object.remote_cluster_name
+        cls._remote_cluster_name = remote_cluster_name
 
         return ok, remote_cluster_name, None
 
@@ -121,9 +128,12 @@ class ClusterDAO:
         try:
             cluster_object.save()
         except Exception as exc:
+            cls._remote_cluster_name = cls._NOT_CACHED
             error_message = get_exception_traceback(exc)
             return False, error_message
 
+        cls._remote_cluster_name = remote_cluster_name
+
         return True, error_message
 
     @classmethod
@@ -186,9 +196,12 @@ class ClusterDAO:
         try:
             cluster_object.save()
         except Exception as exc:
+            cls._remote_cluster_name = cls._NOT_CACHED
             error_message = get_exception_traceback(exc)
             return False, error_message
 
+        cls._remote_cluster_name = None
+
         return True, error_message
 
     @classmethod
@@ -1,5 +1,3 @@
-import six
-
 from repository.common.type import Kubernetes, Metric, NetStat, Common
 # from repository.model.common.delete import DeleteModel
 from repository.model.k8s.daemonset import DaemonSet
@@ -13,6 +11,7 @@ from repository.model.metric.multi_cluster import MultiClusterMetric
 from repository.model.metric.node import NodeMetric
 from repository.model.netstat.multi_cluster import MultiClusterNetwork
 from repository.model.netstat.service import MultiClusterService, ServiceExport, ServiceImport
+from utils.serializer import Serializer
 
 
 class EventObject:
@@ -24,13 +23,15 @@ class EventObject:
         'event_type': 'str',
         'object_type': 'str',
         'object_value': 'object',
+        'sequence': 'int',
     }
 
     event_type = None
     object_type = None
     object_value = None
+    sequence = None
 
-    def __init__(self, event_type, object_type, object_value):
+    def __init__(self, event_type, object_type, object_value, sequence=None):
         """
         EventObject()
         :param event_type:
@@ -38,33 +39,17 @@ class EventObject:
         :param object_type:
             (str) class(Enum)'s value in class cluster.repository.common.type
         :param object_value:
+        :param sequence:
+            (int) change sequence of ResourceRepository; None for non kubernetes resource
         """
         self.event_type = event_type
         self.object_type = object_type
         self.object_value = object_value
+        self.sequence = sequence
 
     def to_dict(self):
         """Returns the model properties as a dict"""
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-        return result
+        return Serializer.to_dict(self)
 
     @classmethod
     def to_object(cls, _dict):
@@ -106,4 +91,5 @@ class EventObject:
 
         return EventObject(event_type=_dict['event_type'],
                            object_type=_dict['object_type'],
-                           object_value=obj)
+                           object_value=obj,
+                           sequence=_dict.get('sequence'))
@@ -1,5 +1,6 @@
-import json
 import threading
+from collections import OrderedDict
+
 import requests
 import time
 
@@ -8,20 +9,35 @@ import urllib3
 from gw_agent import settings
 from gw_agent.common.error import get_exception_traceback
 from gw_agent.settings import get_logger
+from repository.cache.metric import MetricRepository
 from repository.cache.network import NetworkStatusRepository
-from cluster.common.type import ThreadState, ThreadControl
-from repository.common.type import ClusterSessionStatus
+from cluster.common.type import ThreadState, ThreadControl, Event
+from cluster.event.object import EventObject
+from repository.common.type import ClusterSessionStatus, Metric
+from restclient.center import CenterSession
+from utils.serializer import Serializer
 
 
 class Notifier:
     """
     Notify gedge-agent events to gedge-center
+    - events are queued in a bounded compaction queue keyed by (object_type, namespace, name);
+      only the latest event for a key is kept until it is flushed
+    - when the queue is full, the oldest metric update is evicted, and resource events wait for room
+      up to NOTIFIER_PUT_TIMEOUT seconds(backpressure); a resource event that cannot be queued
+      marks the cluster session for resync, so the change is repaired by delta-sync
+    - worker coalesces up to NOTIFIER_BATCH_SIZE events or NOTIFIER_BATCH_INTERVAL milliseconds
+      into a single request, and a batch is acknowledged as a whole
     """
+    # http status codes to retry pushing events
+    RETRYABLE_HTTP_STATUS = (429, 500, 502, 503, 504)
+
     _netstat_repository = None
     _watch_threads = {}
     _cluster_id = None
-    _wait_queue = []
+    _wait_queue = OrderedDict()  # {(object_type, namespace, name): EventObject}
     _wait_queue_lock = threading.Lock()
+    _wait_queue_cond = threading.Condition(_wait_queue_lock)
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "_instance"):
@@ -35,7 +51,9 @@ class Notifier:
         self._netstat_repository = NetworkStatusRepository()
         self._number_of_executor = settings.NUMBER_OF_EVENT_NOTIFIERS
         self._notifier_wait_seconds = settings.WATCH_NOTIFIER_INTERVAL
-        self._notifier_max_retransmission_counts = settings.WATCH_NOTIFIER_INTERVAL
+        self._notifier_max_retransmission_counts = settings.NOTIFIER_MAX_RETRANSMISSION_COUNT
+        self._batch_size = settings.NOTIFIER_BATCH_SIZE
+        self._batch_interval = settings.NOTIFIER_BATCH_INTERVAL / 1000
 
         # register thread pool
         for i in range(0, self._number_of_executor):
@@ -77,53 +95,118 @@ class Notifier:
         thread callback for watch request command, and execute it
         :return:
         """
-        logger = self._logger
         self._init_thread(target)
 
         while True:
             # sleep until center connection is available
             session_status = self._netstat_repository.get_cluster_session_status()
-            name = self._netstat_repository.get_center_network_name()
 
             # if cluster session is not established, wait continuously
             if session_status != ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
                 time.sleep(self._notifier_wait_seconds)
                 continue
 
-            # get event
-            event = self._get_event()
-            if not event:
-                time.sleep(self._notifier_wait_seconds)
+            # get events(wait until an event is queued)
+            events = self._get_events()
+            if not events:
                 continue
-            # logger.debug('[T{}] _get_event(), event={}'.format(target, event.to_dict()))
 
-            # Push event to center
-            for retry_count in range(0, self._notifier_max_retransmission_counts):
-                session_status = self._netstat_repository.get_cluster_session_status()
-                # when cluster session status is changed from CLUSTER_SESSION_ESTABLISHED to others
-                if session_status != ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
+            # Push events to center
+            self._push_events(events)
+
+    def _push_events(self, events):
+        """
+        push a batch of events to center
+        - connection errors and retryable http status(429, 5xx) are retried up to NOTIFIER_MAX_RETRANSMISSION_COUNT
+        - if the batch is given up, metric updates are requeued(only for retryable failures),
+          and resource events are repaired by cluster session resync
+        :param events: (list(EventObject))
+        :return: (bool) True - acknowledged by center, False - given up
+        """
+        name = self._netstat_repository.get_center_network_name()
+        url = name + '/api/agent/v1/cluster/{}/event'.format(self._cluster_id)
+        data = Serializer.dumps(events)
+
+        retryable = False
+
+        for retry_count in range(0, self._notifier_max_retransmission_counts):
+            session_status = self._netstat_repository.get_cluster_session_status()
+            # when cluster session status is changed from CLUSTER_SESSION_ESTABLISHED to others,
+            # queued events are flushed and the session is resynced
+            if session_status != ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
+                return False
+
+            try:
+                # retransmission is controlled here, not in CenterSession
+                response = CenterSession().put(url=url, data=data, retries=0)
+
+                if response.status_code == 200:
+                    return True
+
+                self._logger.error('Fail to send events. '
+                                   'count={}, status={}, reason={}'.format(len(events),
+                                                                          response.status_code,
+                                                                          response.reason))
+
+                if response.status_code not in self.RETRYABLE_HTTP_STATUS:
+                    retryable = False
                     break
 
-                try:
-                    url = name + '/api/agent/v1/cluster/{}/event'.format(self._cluster_id)
-                    headers = {'Content-Type': 'application/json; charset=utf-8'}
-                    response = requests.put(url=url,
-                                            headers=headers,
-                                            data=json.dumps(event.to_dict()),
-                                            timeout=settings.REST_REQUEST_TIMEOUT)
-                    if response.status_code != 200:
-                        logger.error('Fail to send event.'
-                                     '\nevent=\n{}\nreason={}'.format(event.to_dict(), response.reason))
-
-                except (urllib3.exceptions.NewConnectionError,
-                        requests.exceptions.ConnectionError,
-                        ConnectionRefusedError):
-                    # retry to transfer event
-                    time.sleep(self._notifier_wait_seconds)
+                # retry to transfer events
+                retryable = True
+                time.sleep(self._notifier_wait_seconds)
+                continue
+
+            except (urllib3.exceptions.NewConnectionError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    ConnectionRefusedError):
+                # retry to transfer events
+                retryable = True
+                time.sleep(self._notifier_wait_seconds)
+                continue
+
+            except Exception as exc:
+                self._logger.fatal('{}'.format(get_exception_traceback(exc)))
+                retryable = False
+                break
+
+        if retryable:
+            # metric cursors are already advanced past these points, so keep them for the next batch
+            self._requeue_metric_events(events)
+
+        if any(not self._is_metric_event(event) for event in events):
+            # resource events after the sequence acknowledged by center are resent by delta-sync
+            self._logger.warning('Fail to push {} events, resync cluster session'.format(len(events)))
+            self._request_resync()
+
+        return False
+
+    def _requeue_metric_events(self, events):
+        """
+        put undelivered metric updates back to the head of wait queue,
+        merged with newer updates for the same metric model
+        :param events: (list(EventObject)) undelivered events
+        :return:
+        """
+        with self._wait_queue_cond:
+            for event in reversed(events):
+                if not self._is_metric_event(event):
                     continue
 
-                except Exception as exc:
-                    self._logger.fatal('{}'.format(get_exception_traceback(exc)))
+                key = self._get_event_key(event)
+
+                if key in self._wait_queue:
+                    queued = self._wait_queue[key]
+                    MetricRepository.merge_updates(event.object_value, queued.object_value)
+                else:
+                    if len(self._wait_queue) >= settings.NOTIFIER_MAX_QUEUE_SIZE:
+                        continue
+                    self._wait_queue[key] = event
+
+                self._wait_queue.move_to_end(key, last=False)
+
+            self._wait_queue_cond.notify()
 
     def put_event(self, event):
         """
@@ -136,33 +219,154 @@ class Notifier:
         if center_network_session_status != ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
             return
 
-        self._wait_queue_lock.acquire()
-        self._wait_queue.append(event)
-        self._wait_queue_lock.release()
+        key = self._get_event_key(event)
+
+        with self._wait_queue_cond:
+            dropped = False
+
+            if key not in self._wait_queue and len(self._wait_queue) >= settings.NOTIFIER_MAX_QUEUE_SIZE:
+                dropped = not self._make_room(event)
+
+            if not dropped:
+                if key in self._wait_queue:
+                    # keep queued position, and replace with the latest state
+                    self._wait_queue[key] = self._compact(self._wait_queue[key], event)
+                else:
+                    self._wait_queue[key] = event
+                    self._wait_queue_cond.notify_all()
+
+        if dropped and not self._is_metric_event(event):
+            self._logger.warning('Notifier queue is full, drop {} {} event '
+                                 'and resync cluster session'.format(event.event_type, event.object_type))
+            self._request_resync()
+
+    @staticmethod
+    def _is_metric_event(event) -> bool:
+        """
+        whether event is a metric update
+        :param event: (EventObject)
+        :return: (bool)
+        """
+        return event.object_type in (Metric.NODE_METRIC.value, Metric.MULTI_CLUSTER_METRIC.value)
+
+    def _make_room(self, event) -> bool:
+        """
+        make room in full wait queue for event
+        - the oldest queued metric update is evicted first, since it is not a resource state change
+        - otherwise, a resource event waits up to NOTIFIER_PUT_TIMEOUT seconds for worker to take events,
+          and a metric update is not queued
+        caution: you must call it with _wait_queue_cond acquired
+        :param event: (EventObject) event to put
+        :return: (bool) True - room is made, False - queue is still full
+        """
+        for key, queued in self._wait_queue.items():
+            if self._is_metric_event(queued):
+                del self._wait_queue[key]
+                return True
+
+        if self._is_metric_event(event):
+            return False
+
+        deadline = time.monotonic() + settings.NOTIFIER_PUT_TIMEOUT
+
+        while len(self._wait_queue) >= settings.NOTIFIER_MAX_QUEUE_SIZE:
+            remains = deadline - time.monotonic()
+            if remains <= 0:
+                return False
+            self._wait_queue_cond.wait(remains)
+
+        return True
+
+    def _request_resync(self):
+        """
+        mark cluster session for resync; network watcher resyncs it with changes
+        after the sequence acknowledged by center(delta-sync), or with all resources
+        :return:
+        """
+        name = self._netstat_repository.get_center_network_name()
+
+        try:
+            self._netstat_repository.set_cluster_session_status(
+                name, ClusterSessionStatus.CLUSTER_SESSION_NOT_ESTABLISHED.value)
+        except LookupError as exc:
+            self._logger.error('Fail to request cluster session resync, caused by ' + str(exc))
+
+    @staticmethod
+    def _get_event_key(event) -> tuple:
+        """
+        get compaction key for event
+        :param event: (EventObject)
+        :return: (tuple) (object_type, namespace, name);
+        namespace and name are None for cluster scoped or snapshot objects(i.e., MultiClusterMetric)
+        """
+        value = event.object_value
+
+        return event.object_type, getattr(value, 'namespace', None), getattr(value, 'name', None)
+
+    @classmethod
+    def _compact(cls, queued, event):
+        """
+        compact queued event and new event for the same key(last writer wins)
+        - DELETED supersedes all the earlier events
+        - ADDED followed by MODIFIED is kept as ADDED with the latest object
+        - metric updates(points since the previous push) are merged, not to lose points
+        :param queued: (EventObject) queued event
+        :param event: (EventObject) new event
+        :return: (EventObject)
+        """
+        if cls._is_metric_event(event):
+            MetricRepository.merge_updates(queued.object_value, event.object_value)
+
+        if queued.event_type == Event.ADDED.value and event.event_type == Event.MODIFIED.value:
+            return EventObject(event_type=Event.ADDED.value,
+                               object_type=event.object_type,
+                               object_value=event.object_value,
+                               sequence=event.sequence)
+
+        return event
 
     def flush_events(self):
         """
         flush all queued events
         :return:
         """
-        self._wait_queue_lock.acquire()
-        self._wait_queue.clear()
-        self._wait_queue_lock.release()
+        with self._wait_queue_cond:
+            self._wait_queue.clear()
+            self._wait_queue_cond.notify_all()
 
-    def _get_event(self):
+    def _get_events(self):
         """
-        get command from wait queue
+        get a batch of events from wait queue
+        wait up to WATCH_NOTIFIER_INTERVAL seconds for the first event,
+        and then coalesce events up to batch size or batch interval
         caution: you must call it in worker thread
-        :return:
+        :return: (list(EventObject)); empty list if no event is queued
         """
-        val = None
+        events = []
+
+        with self._wait_queue_cond:
+            if not self._wait_queue:
+                self._wait_queue_cond.wait(self._notifier_wait_seconds)
+
+            deadline = time.monotonic() + self._batch_interval
+
+            while len(events) < self._batch_size:
+                if self._wait_queue:
+                    events.append(self._wait_queue.popitem(last=False)[1])
+                    continue
+
+                if not events:
+                    break
+
+                remains = deadline - time.monotonic()
+                if remains <= 0 or not self._wait_queue_cond.wait(remains):
+                    break
 
-        self._wait_queue_lock.acquire()
-        if len(self._wait_queue) > 0:
-            val = self._wait_queue.pop(0)
-        self._wait_queue_lock.release()
+            if events:
+                # wake up producers waiting for room
+                self._wait_queue_cond.notify_all()
 
-        return val
+        return events
 
     def _send_to_thread(self, target, command):
         """
@@ -3,8 +3,6 @@ import sys
 import os
 from configparser import ConfigParser
 
-from cluster.watcher.pods import PodStatusWatcher
-from cluster.watcher.services import ServiceStatusWatcher
 from gw_agent import settings
 from cluster.command.submariner import SubmarinerCommand
 from cluster.common.type import Event
@@ -15,6 +13,7 @@ from cluster.watcher.commands import CommandExecutor
 from cluster.watcher.components import ComponentWatcher
 from cluster.watcher.metrics import MetricWatcher
 from cluster.watcher.networks import NetworkWatcher
+from cluster.watcher.prober import LatencyProber
 from cluster.watcher.resources import ResourceWatcher
 from mqtt.consumer import Consumer
 from repository.cache.network import NetworkStatusRepository
@@ -107,12 +106,6 @@ def start():
     # start kubernetes resource watcher
     ResourceWatcher().start()
 
-    # Pod Status watcher
-    PodStatusWatcher().start()
-
-    # Service Status watcher
-    ServiceStatusWatcher().start()
-
     # start command execute thread pool
     CommandExecutor().start()
 
@@ -122,6 +115,9 @@ def start():
     # start metric watcher(node, mc_network)
     MetricWatcher().start()
 
+    # start multi-cluster endpoint latency prober
+    LatencyProber().start()
+
     # start component watcher
     ComponentWatcher().start()
 
@@ -1,3 +1,54 @@
 from django.test import TestCase
 
-# Create your tests here.
+from cluster.common.type import Event
+from cluster.event.object import EventObject
+from cluster.notifier.notify import Notifier
+from repository.common.type import Metric
+from repository.model.metric.endpoint import EndpointNetworkMetric
+from repository.model.metric.multi_cluster import MultiClusterMetric
+
+
+class NotifierRequeueTestCase(TestCase):
+    """
+    requeue undelivered metric updates in Notifier
+    """
+    @staticmethod
+    def _get_mc_metric_event(latencies):
+        """
+        get multi-cluster metric update event
+        :param latencies: (dict) {(str) endpoint name: (list) [[timestamp, latency],]}
+        :return: (EventObject)
+        """
+        mc_metric = MultiClusterMetric()
+
+        for name, points in latencies.items():
+            endpoint = EndpointNetworkMetric(name)
+            for attr in ('latencies', 'latencies_p90', 'latencies_p99', 'tx_bytes', 'rx_bytes'):
+                setattr(endpoint, attr, [])
+            endpoint.latencies = points
+            mc_metric.endpoints.append(endpoint)
+
+        return EventObject(Event.ADDED.value, Metric.MULTI_CLUSTER_METRIC.value, mc_metric)
+
+    def tearDown(self):
+        Notifier().flush_events()
+
+    def test_requeue_keeps_endpoint_missing_in_newer_update(self):
+        notifier = Notifier()
+        notifier.flush_events()
+
+        # newer update is queued while the older one is being pushed
+        newer = self._get_mc_metric_event({'cluster1': [[2.0, 1.5]]})
+        key = notifier._get_event_key(newer)
+        notifier._wait_queue[key] = newer
+
+        # older update(with an endpoint that newer does not have) is given up
+        older = self._get_mc_metric_event({'cluster1': [[1.0, 1.0]], 'cluster2': [[1.0, 3.0]]})
+        notifier._requeue_metric_events([older])
+
+        merged = {endpoint.get_name(): endpoint.latencies
+                  for endpoint in notifier._wait_queue[key].object_value.endpoints}
+
+        self.assertEqual(list(notifier._wait_queue.keys())[0], key)
+        self.assertEqual(merged['cluster1'], [[1.0, 1.0], [2.0, 1.5]])
+        self.assertEqual(merged['cluster2'], [[1.0, 3.0]])
@@ -0,0 +1,371 @@
+"""
+    desc: shared informers for kubernetes resources
+    (nodes, namespaces, pods, deployments, daemonsets, services, submariner and lighthouse custom resources)
+"""
+import threading
+import time
+
+import urllib3
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import watch
+
+from gw_agent import settings
+from gw_agent.common.error import get_exception_traceback
+from gw_agent.settings import get_logger
+from gw_agent.settings import KUBE_API_REQUEST_TIMEOUT
+from repository.common.k8s_client import Connector
+from repository.common.type import Kubernetes, CustomResource
+from cluster.common.type import ThreadState, ThreadControl
+from cluster.common.type import Event
+
+
+class Informer:
+    """
+    list-watch a kubernetes resource kind(GVR) and fan out events to subscribers
+    - each informer owns its watch stream and resourceVersion,
+      and relists only when resourceVersion is expired(410 Gone)
+    - subscribers are called in the informer thread in subscription order, so they must not block
+    """
+    # http status code for expired resourceVersion
+    HTTP_STATUS_GONE = 410
+    # http status code for not installed custom resource definition
+    HTTP_STATUS_NOT_FOUND = 404
+
+    def __init__(self, target, api, api_kwargs=None):
+        """
+        Informer()
+        :param target: (Kubernetes(Enum) or CustomResource(Enum)) resource kind
+        :param api: (callable) list api method for target
+        :param api_kwargs: (dict) keyword arguments of api, i.e., group, version, plural for custom objects
+        """
+        self._logger = get_logger(__name__)
+        self._target = target
+        self._api = api
+        self._api_kwargs = api_kwargs or {}
+        self._watch = watch.Watch()
+        self._resource_version = None
+        self._synced = False
+        self._subscribers = []  # [(event handler, relist handler)]
+        self._thread = None
+        self._lock = threading.Lock()
+        self._state = ThreadState.NOT_READY
+        self._control = ThreadControl.EMPTY
+
+    def get_target(self):
+        """
+        getter
+        :return: (Kubernetes(Enum) or CustomResource(Enum))
+        """
+        return self._target
+
+    def get_resource_version(self):
+        """
+        get last resourceVersion that informer received
+        :return: (str) resourceVersion; None - not listed yet
+        """
+        return self._resource_version
+
+    def get_state(self):
+        """
+        getter
+        :return: (ThreadState(Enum))
+        """
+        return self._state
+
+    def has_synced(self) -> bool:
+        """
+        whether initial list is delivered to subscribers
+        :return: (bool)
+        """
+        return self._synced
+
+    def subscribe(self, handler, relist_handler=None):
+        """
+        subscribe events of informer
+        :param handler: (callable) handler(event: dict); watch event({'type', 'object', 'raw_object'})
+        :param relist_handler: (callable) relist_handler(items: list); listed objects(dict for custom objects).
+            None - listed objects are delivered to handler as ADDED event
+        :return:
+        """
+        self._subscribers.append((handler, relist_handler))
+
+    def _publish(self, event):
+        """
+        deliver watch event to subscribers
+        :param event: (dict) watch event
+        :return:
+        """
+        for handler, _ in self._subscribers:
+            try:
+                handler(event)
+            except Exception as exc:
+                self._logger.error('[T:{}] Fail to call subscriber, '
+                                   'caused by {}'.format(self._target, get_exception_traceback(exc)))
+
+    def _relist(self) -> str:
+        """
+        list resources and deliver them to subscribers
+        :return: (str) resourceVersion of list
+        """
+        result = self._api(_request_timeout=settings.REST_REQUEST_TIMEOUT, **self._api_kwargs)
+
+        if isinstance(result, dict):
+            # custom objects are not deserialized
+            items = result.get('items', [])
+            resource_version = result['metadata']['resourceVersion']
+        else:
+            items = result.items
+            resource_version = result.metadata.resource_version
+            for item in items:
+                # list items do not have 'kind', so set it from target
+                item.kind = self._target.value
+
+        for handler, relist_handler in self._subscribers:
+            try:
+                if relist_handler is not None:
+                    relist_handler(items)
+                    continue
+                for item in items:
+                    handler({'type': Event.ADDED.value, 'object': item, 'raw_object': None})
+            except Exception as exc:
+                self._logger.error('[T:{}] Fail to call subscriber, '
+                                   'caused by {}'.format(self._target, get_exception_traceback(exc)))
+
+        return resource_version
+
+    @staticmethod
+    def _get_event_resource_version(event):
+        """
+        get resourceVersion from watch event
+        :param event: (<class 'dict'>); watch event
+        :return: (str) resourceVersion; None - not exist
+        """
+        raw_object = event['raw_object']
+
+        if type(raw_object) != dict or 'metadata' not in raw_object:
+            return None
+
+        if 'resourceVersion' not in raw_object['metadata']:
+            return None
+
+        return raw_object['metadata']['resourceVersion']
+
+    def start(self):
+        """
+        start informer thread
+        :return:
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        stop informer thread
+        :return:
+        """
+        if self._thread is None:
+            return
+
+        self.send_control(ThreadControl.THREAD_EXIT)
+        self._thread.join()
+        self._thread = None
+        self._state = ThreadState.NOT_READY
+
+    def send_control(self, command) -> bool:
+        """
+        send command to informer thread
+        :param command: (str); ThreadControl(Enum)
+        :return: (bool); True - success to deliver command, False - Fail to deliver command
+        """
+        command = ThreadControl.to_enum(command)
+
+        if command == ThreadControl.UNKNOWN:
+            raise ValueError('Unknown thread control')
+
+        with self._lock:
+            if self._state is not ThreadState.RUNNING:
+                return False
+            self._control = command
+
+        return True
+
+    def _receive_control(self):
+        """
+        receive command in thread
+        :return: (ThreadControl(Enum))
+        """
+        with self._lock:
+            command = self._control
+            if command is not ThreadControl.EMPTY:
+                self._state = ThreadState.BUSY
+
+        return command
+
+    def _set_state(self, state):
+        """ set thread state and clear command """
+        with self._lock:
+            self._state = state
+            if state is ThreadState.RUNNING:
+                self._control = ThreadControl.EMPTY
+
+    def _run(self):
+        """
+        thread callback
+        list resources once, then watch from the last resourceVersion.
+        relist only when resourceVersion is expired(410 Gone)
+        :return:
+        """
+        logger = self._logger
+        target = self._target
+        self._set_state(ThreadState.RUNNING)
+
+        while True:
+            try:
+                if self._resource_version is None:
+                    self._resource_version = self._relist()
+                    self._synced = True
+
+                for event in self._watch.stream(self._api,
+                                                resource_version=self._resource_version,
+                                                allow_watch_bookmarks=True,
+                                                _request_timeout=KUBE_API_REQUEST_TIMEOUT,
+                                                **self._api_kwargs):
+                    resource_version = self._get_event_resource_version(event)
+                    if resource_version is not None:
+                        self._resource_version = resource_version
+
+                    # BOOKMARK event only refreshes resourceVersion
+                    if Event.to_enum(event['type']) == Event.BOOKMARK:
+                        continue
+
+                    self._publish(event)
+
+            except urllib3.exceptions.ReadTimeoutError:
+                """ event watch timeout """
+                """ process thread control command """
+                command = ThreadControl.to_enum(self._receive_control())
+
+                if command == ThreadControl.UNKNOWN:
+                    logger.error('[T:{}] Unknown thread command'.format(target))
+
+                if command == ThreadControl.THREAD_EXIT:
+                    logger.info('[T:{}] receive {} command'.format(target, command))
+                    return
+
+                if command in (ThreadControl.ADD_HOOK_METHOD, ThreadControl.REMOVE_HOOK_METHOD):
+                    # not supported
+                    self._set_state(ThreadState.RUNNING)
+
+            except ApiException as exc:
+                if exc.status == self.HTTP_STATUS_GONE:
+                    """ resourceVersion is expired, relist """
+                    logger.info('[T:{}] resourceVersion({}) is expired, '
+                                'relist resources'.format(target, self._resource_version))
+                    self._resource_version = None
+                    continue
+
+                if exc.status == self.HTTP_STATUS_NOT_FOUND:
+                    """ custom resource definition is not installed yet """
+                    logger.debug('[T:{}] Not found resource'.format(target))
+                    time.sleep(settings.WATCH_COMMON_INTERVAL)
+                    continue
+
+                logger.error('[T:{}] Fail to watch, caused by {}'.format(target, get_exception_traceback(exc)))
+                time.sleep(settings.WATCH_COMMON_INTERVAL)
+
+
+class InformerFactory:
+    """
+    shared informer factory
+    - a single informer(watch connection) is created for each resource kind,
+      and all consumers(watchers, metric collector, component validator, migration) subscribe to it
+      or read the resource cache it feeds, so each object crosses the wire once
+    """
+    _logger = None
+    _informers = {}
+
+    # (group, version, plural) for custom resources
+    _custom_resources = {
+        CustomResource.SUBMARINER_CLUSTER: ('submariner.io', 'v1', 'clusters'),
+        CustomResource.SUBMARINER: ('submariner.io', 'v1alpha1', 'submariners'),
+        CustomResource.SERVICE_DISCOVERY: ('submariner.io', 'v1alpha1', 'servicediscoveries'),
+        CustomResource.SERVICE_IMPORT: ('multicluster.x-k8s.io', 'v1alpha1', 'serviceimports'),
+    }
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._config()
+
+        return cls._instance
+
+    def _config(self):
+        self._logger = get_logger(__name__)
+
+    @staticmethod
+    def _get_list_api(target):
+        """
+        get list api method for target
+        :param target: (Kubernetes(Enum))
+        :return: (callable)
+        """
+        core_v1_api = Connector().core_v1_api()
+        app_v1_api = Connector().app_v1_api()
+
+        if target is Kubernetes.NODE:
+            return core_v1_api.list_node
+        if target is Kubernetes.NAMESPACE:
+            return core_v1_api.list_namespace
+        if target is Kubernetes.POD:
+            return core_v1_api.list_pod_for_all_namespaces
+        if target is Kubernetes.DEPLOYMENT:
+            return app_v1_api.list_deployment_for_all_namespaces
+        if target is Kubernetes.DAEMONSET:
+            return app_v1_api.list_daemon_set_for_all_namespaces
+        if target is Kubernetes.SERVICE:
+            return core_v1_api.list_service_for_all_namespaces
+
+        raise ValueError('Invalid resource type')
+
+    def get_informer(self, target) -> Informer:
+        """
+        get shared informer for target; created if not exist
+        :param target: (Kubernetes(Enum) or CustomResource(Enum))
+        :return: (Informer)
+        """
+        if not isinstance(target, CustomResource):
+            target = Kubernetes.to_enum(target)
+
+        with self._lock:
+            if target in self._informers:
+                return self._informers[target]
+
+            if target in self._custom_resources:
+                group, version, plural = self._custom_resources[target]
+                self._informers[target] = Informer(target,
+                                                   Connector().custom_objects_api().list_cluster_custom_object,
+                                                   {'group': group, 'version': version, 'plural': plural})
+            else:
+                self._informers[target] = Informer(target, self._get_list_api(target))
+
+            return self._informers[target]
+
+    def has_synced(self, *targets) -> bool:
+        """
+        whether informers of targets are synced
+        :param targets: (Kubernetes(Enum) or CustomResource(Enum)) resource kinds; empty - all informers
+        :return: (bool)
+        """
+        if not targets:
+            targets = list(self._informers.keys())
+
+        for target in targets:
+            if not isinstance(target, CustomResource):
+                target = Kubernetes.to_enum(target)
+            informer = self._informers.get(target)
+            if informer is None or not informer.has_synced():
+                return False
+
+        return True
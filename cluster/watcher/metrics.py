@@ -1,37 +1,41 @@
 import threading
 import time
 
-import os
-
-from cluster.command.localhost import LocalHostCommand
 from cluster.data_access_object import ClusterDAO
 from gw_agent import settings
 from gw_agent.settings import WATCH_NETWORK_INTERVAL
 from cluster.common.type import Event
 from cluster.event.object import EventObject
 from cluster.notifier.notify import Notifier
+from cluster.watcher.resources import ResourceWatcher
 from repository.cache.components import ComponentRepository
 from repository.cache.metric import MetricRepository
 from repository.cache.network import NetworkStatusRepository
 from repository.cache.resources import ResourceRepository
 from repository.common import prometheus_client
-from repository.common.type import Metric, SubmarinerState
+from repository.common.type import Kubernetes, Metric, SubmarinerState, ClusterSessionStatus
 from repository.model.metric.cpu import CPUMetric
 from repository.model.metric.memory import MemoryMetric
 from repository.model.metric.network import NetworkMetric
 from utils.dateformat import DateFormatter
+from utils.sysfs import InterfaceCounterSampler
 
 
 class MetricWatcher:
     """
     Node, pod, multi-cluster metric watcher
+    - node metrics are added or deleted on node events,
+      node-exporter instance to node mapping is maintained on node-exporter pod events
     """
     _logger = None
     _prom_client = None
     _notifier = None
     _watch_threads = {}
+    _instance_lock = threading.Lock()
+    _instances = {}     # {node-exporter instance('ip:port'): node name}
     _last_node_metric_event_push = None
     _last_mcn_metric_event_push = None
+    _submariner_sampler = None
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "_instance"):
@@ -48,6 +52,7 @@ class MetricWatcher:
         self._logger = settings.get_logger(__name__)
         self._prom_client = prometheus_client.Connector()
         self._notifier = Notifier()
+        self._submariner_sampler = InterfaceCounterSampler(settings.SUBMARINER_DEV)
         self._add_watch(Metric.NODE_METRIC)
         self._add_watch(Metric.MULTI_CLUSTER_METRIC)
 
@@ -68,6 +73,15 @@ class MetricWatcher:
         start watcher threads
         :return:
         """
+        # register handlers first, and then apply resources already cached(handlers are idempotent)
+        ResourceWatcher().add_event_handler(Kubernetes.NODE, self._on_node_event)
+        ResourceWatcher().add_event_handler(Kubernetes.POD, self._on_pod_event)
+
+        for node in ResourceRepository().get_nodes():
+            self._on_node_event(Event.ADDED, node)
+        for pod in ResourceRepository().get_pods():
+            self._on_pod_event(Event.ADDED, pod)
+
         for _, value in self._watch_threads.items():
             if value['target'] == Metric.MULTI_CLUSTER_METRIC:
                 value['paused'] = True
@@ -179,21 +193,22 @@ class MetricWatcher:
                 logger.error('Invalid metric target')
                 raise ValueError('[T:{}]Invalid metric target'.format(target.value))
 
-            time.sleep(WATCH_NETWORK_INTERVAL)
+            if target == Metric.MULTI_CLUSTER_METRIC:
+                time.sleep(settings.WATCH_MC_NETWORK_METRIC_INTERVAL)
+            else:
+                time.sleep(WATCH_NETWORK_INTERVAL)
 
     def _collect_multi_cluster_network_metric(self, target):
         """
         collect multi cluster network metric
         :return:
         """
-        self._logger.debug('[CALL] MC METRIC THREAD')
-
-        if not os.path.isdir(settings.SUBMARINER_DEV_PATH) or \
-                not os.path.isfile(settings.SUBMARINER_RX) or \
-                not os.path.isfile(settings.SUBMARINER_TX):
+        # if gateway is connected bet/ multi-cluster
+        if ComponentRepository().get_submariner_state() != SubmarinerState.GATEWAY_CONNECTED:
+            self._submariner_sampler.close()
             return
 
-        # get connected cluster name
+        # get connected cluster name(cached in ClusterDAO until it is changed)
         ok, remote_cluster_name, error_message = ClusterDAO.get_remote_cluster_name()
         if not ok:
             self._logger.error('Fail to get_remote_cluster_name(), caused by' + error_message)
@@ -202,141 +217,149 @@ class MetricWatcher:
         if not remote_cluster_name:
             return
 
-        # if gateway is connected bet/ multi-cluster
-        if ComponentRepository().get_submariner_state() != SubmarinerState.GATEWAY_CONNECTED:
-            return
-
-        if ComponentRepository().get_submariner_state() == SubmarinerState.GATEWAY_CONNECTED:
-            timestamp = time.time()
+        # drop metrics of endpoints removed from multi-cluster network
+        if NetworkStatusRepository().get_mc_network() is not None:
+            names = {endpoint.get_name() for endpoint in NetworkStatusRepository().get_mc_network_endpoints() or []}
+            names.add(remote_cluster_name)
+            MetricRepository().retain_endpoints(names)
 
-            # measure rx bytes
-            ok, rx_byte, error = LocalHostCommand.get_network_rx_bytes(settings.SUBMARINER_DEV)
-            if not ok:
-                self._logger.error('Fail to read RX bytes in {}'.format(settings.SUBMARINER_DEV))
-                return
+        # measure rx, tx bytes(submariner interface may not be created yet)
+        ok, sample, error = self._submariner_sampler.sample()
+        if not ok:
+            self._logger.debug(error)
+            return
 
-            MetricRepository().set_mc_network_rx_byte(name=remote_cluster_name,
-                                                      rx_byte=rx_byte,
-                                                      timestamp=timestamp)
+        timestamp, rx_bytes, tx_bytes = sample
 
-            # measure tx bytes
-            ok, tx_bytes, error = LocalHostCommand.get_network_tx_bytes(settings.SUBMARINER_DEV)
-            if not ok:
-                self._logger.error('Fail to read TX bytes in {}'.format(settings.SUBMARINER_DEV))
-                return
+        MetricRepository().set_mc_network_rx_byte(name=remote_cluster_name,
+                                                  rx_byte=rx_bytes,
+                                                  timestamp=timestamp)
+        MetricRepository().set_mc_network_tx_byte(name=remote_cluster_name,
+                                                  tx_byte=tx_bytes,
+                                                  timestamp=timestamp)
+        MetricRepository().rollup(MetricRepository().get_mc_network())
 
-            MetricRepository().set_mc_network_tx_byte(name=remote_cluster_name,
-                                                      tx_byte=tx_bytes,
-                                                      timestamp=timestamp)
-            # push event(period=5)
-            current_ts = time.time()
-            event_push = False
+        # push event(period=5)
+        current_ts = time.time()
+        event_push = False
 
-            if not self._last_mcn_metric_event_push:
-                self._last_mcn_metric_event_push = current_ts
+        if not self._last_mcn_metric_event_push:
+            self._last_mcn_metric_event_push = current_ts
+            event_push = True
+        else:
+            if current_ts - self._last_mcn_metric_event_push > 5:
                 event_push = True
-            else:
-                if current_ts - self._last_mcn_metric_event_push > 5:
-                    event_push = True
-                    self._last_mcn_metric_event_push = current_ts
-
-            if event_push:
-                # trigger event to notifier to send mc_network metric periodically
-                event_object = EventObject(Event.ADDED.value,
-                                           Metric.MULTI_CLUSTER_METRIC.value,
-                                           MetricRepository().get_mc_network())
+                self._last_mcn_metric_event_push = current_ts
 
-                self._notifier.put_event(event_object)
+        if event_push:
+            # trigger event to notifier to send mc_network metric periodically
+            self._push_metric_updates(Event.ADDED, Metric.MULTI_CLUSTER_METRIC, MetricRepository().get_mc_network())
         return
 
-    @staticmethod
-    def get_node_exporter_pod_by_node(node_name):
+    def _push_metric_updates(self, event_type, object_type, obj):
         """
-        get node-exporter pod hosted in a node
-        :param node_name: (str)
-        :return: (Pod)
+        push only points newer than the previous push(tier in METRIC_PUSH_TIERS) to center
+        :param event_type: (Event)
+        :param object_type: (Metric)
+        :param obj: (object) metric model, i.e., NodeMetric, MultiClusterMetric
+        :return:
         """
-        pods = ResourceRepository().get_pods()
+        # do not consume updates while events are not delivered
+        session_status = NetworkStatusRepository().get_cluster_session_status()
+        if session_status != ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
+            return
 
-        for pod in pods:
-            if pod.get_node_name() == node_name and 'node-exporter' in pod.get_name():
-                return pod
+        updates = MetricRepository().get_updates(obj, 'center', settings.METRIC_PUSH_TIERS.get('center', 'raw'))
+        if updates is None:
+            return
 
-        return None
+        self._notifier.put_event(EventObject(event_type.value, object_type.value, updates))
 
-    def _collect_node_metric(self, target):
+    def _on_node_event(self, event_type, node):
         """
-        collect node metric
+        node event handler called in node watch thread; add or delete node metric
+        :param event_type: (Event)
+        :param node: (Node)
         :return:
         """
-        nodes = ResourceRepository().get_nodes()
-        node_metrics = MetricRepository().get_nodes()
-        n_nodes = len(nodes)
-        n_node_metrics = len(node_metrics)
-        node_names = []
-        notifier = self._notifier
-        logger = self._logger
-        self._last_node_metric_event_push = None
-
-        if n_nodes == 0:
+        if event_type == Event.DELETED:
+            MetricRepository().delete_node(node.get_name())
+            with self._instance_lock:
+                for instance in [key for key, value in self._instances.items() if value == node.get_name()]:
+                    del self._instances[instance]
             return
-        else:
-            if n_nodes == n_node_metrics:
-                pass
 
-            elif n_nodes > n_node_metrics:  # add node to node metric
-                for node_metric in node_metrics:
-                    node_names.append(node_metric.get_name())
+        MetricRepository().set_node(node.get_name())
 
-                for node in nodes:
-                    if node.get_name() not in node_names:
-                        node_name = node.get_name()
-                        MetricRepository().set_node(node_name)
+    def _on_pod_event(self, event_type, pod):
+        """
+        pod event handler called in pod watch thread; map node-exporter instance to node
+        :param event_type: (Event)
+        :param pod: (Pod)
+        :return:
+        """
+        if 'node-exporter' not in pod.get_name() or pod.get_node_name() is None:
+            return
 
-            elif n_nodes < n_node_metrics:  # delete node from node metric
-                deleted = False
-                first = True
+        node_name = pod.get_node_name()
+        instance = '{}:{}'.format(pod.get_pod_ip(), settings.NODE_EXPORTER_PORT) if pod.get_pod_ip() else None
 
-                for node in nodes:
-                    node_names.append(node.get_name())
+        with self._instance_lock:
+            if event_type == Event.DELETED:
+                # a replacement pod on the same node may already be mapped; remove only the deleted pod's instance
+                if instance is not None and self._instances.get(instance) == node_name:
+                    del self._instances[instance]
+                return
 
-                while True:
-                    if not deleted and not first:
-                        break
+            if instance is None:
+                return
 
-                    first = False
+            # pod ip is changed when node-exporter pod is re-created; replace stale instances of the node
+            for key in [key for key, value in self._instances.items() if value == node_name and key != instance]:
+                del self._instances[key]
 
-                    for index in range(0, len(node_metrics)):
-                        deleted = False
+            self._instances[instance] = node_name
 
-                        if node_metrics[index].get_name() not in node_names:
-                            del node_metrics[index]
-                            deleted = True
-                            break
+    def _get_node_metric_by_instance(self, instance):
+        """
+        get node metric for node-exporter instance
+        :param instance: (str) 'ip:port'
+        :return: (NodeMetric); None - not exist
+        """
+        node_name = self._instances.get(instance)
+        if node_name is None:
+            return None
 
-        """ set prometheus server endpoint setup """
-        if not self._prom_client.is_ready():
-            return
+        node_metric = MetricRepository().get_node(node_name)
+        if node_metric is not None and node_metric.get_instance() != instance:
+            node_metric.set_instance(instance)
 
-        """ set node instance(prometheus instance) to node metric """
-        ok = False
+        return node_metric
 
-        for node_metric in MetricRepository().get_nodes():
-            node_name = node_metric.get_name()
-            pod = self.get_node_exporter_pod_by_node(node_name)
+    def _collect_node_metric(self, target):
+        """
+        collect node metric
+        - node metrics are managed by node events(_on_node_event())
+        - samples are appended to existing metric series
+        :return:
+        """
+        node_metrics = MetricRepository().get_nodes()
+        logger = self._logger
+        self._last_node_metric_event_push = None
 
-            if pod is None:
-                continue
+        if len(node_metrics) == 0:
+            return
 
-            node_metric.set_instance('{}:{}'.format(pod.get_pod_ip(), settings.NODE_EXPORTER_PORT))
-            ok = True
+        """ set prometheus server endpoint setup """
+        if not self._prom_client.is_ready():
+            return
 
-        if not ok:  # there are no node-exporter, skip collecting node metric
+        if not self._instances:  # there are no node-exporter, skip collecting node metric
             return
 
-        """ set_node_cpu_metric, CPUMetric """
+        """ get cpu, memory, network metrics(concurrent prometheus queries) """
         try:
-            metrics = self._prom_client.get_cpu_usages()
+            cpu_metrics, memory_metrics, network_metrics = self._prom_client.get_node_usages()
         except SystemError as exc:
             error_message = ','.join(exc.args)
             if 'Fail to connect to prometheus server' in error_message:  # permit
@@ -346,52 +369,49 @@ class MetricWatcher:
                 logger.error('{} exception caused by {}'.format(exc.__class__.__name__, ','.join(exc.args)))
                 return
 
-        for metric in metrics:
-            for node_metric in node_metrics:
-                if metric['instance'] == node_metric.get_instance():
-                    cpu_metric = CPUMetric(metric['total'], metric['usages'])
-                    node_metric.set_cpu_metric(cpu_metric)
+        """ set_node_cpu_metric, CPUMetric """
+        for metric in cpu_metrics:
+            node_metric = self._get_node_metric_by_instance(metric['instance'])
+            if node_metric is None:
+                continue
+
+            cpu_metric = node_metric.get_cpu_metric()
+            if cpu_metric is not None and cpu_metric.total == metric['total']:
+                cpu_metric.update_usages(metric['usages'])
+            else:
+                node_metric.set_cpu_metric(CPUMetric(metric['total'], metric['usages']))
 
         """ set_node_mem_metric, MemoryMetric """
-        try:
-            metrics = self._prom_client.get_memory_usages()
-        except Exception as exc:
-            error_message = ','.join(exc.args)
-            if 'Fail to connect to prometheus server' in error_message:  # permit
-                return
+        for metric in memory_metrics:
+            node_metric = self._get_node_metric_by_instance(metric['instance'])
+            if node_metric is None:
+                continue
 
+            memory_metric = node_metric.get_memory_metric()
+            if memory_metric is not None and memory_metric.total == metric['total']:
+                memory_metric.update_usages(metric['usages'])
             else:
-                logger.error('{} exception caused by {}'.format(exc.__class__.__name__, ','.join(exc.args)))
-                return
-
-        for metric in metrics:
-            for node_metric in node_metrics:
-                if metric['instance'] == node_metric.get_instance():
-                    memory_metric = MemoryMetric(metric['total'], metric['usages'])
-                    node_metric.set_memory_metric(memory_metric)
+                node_metric.set_memory_metric(MemoryMetric(metric['total'], metric['usages']))
 
         """ set_node_net_metric, NetworkMetric """
-        try:
-            metrics = self._prom_client.get_network_usages()
-        except SystemError as exc:
-            error_message = ','.join(exc.args)
-            if 'Fail to connect to prometheus server' in error_message:  # permit
-                return
+        for metric in network_metrics:
+            if 'device' not in metric or 'rx_bytes' not in metric or 'tx_bytes' not in metric:
+                continue
+
+            node_metric = self._get_node_metric_by_instance(metric['instance'])
+            if node_metric is None:
+                continue
+
+            network_metric = node_metric.get_network_metric()
+            if network_metric is not None and network_metric.device == metric['device']:
+                network_metric.update(metric['rx_bytes'], metric['tx_bytes'])
             else:
-                logger.error('{} exception caused by {}'.format(exc.__class__.__name__, ','.join(exc.args)))
-                return
+                node_metric.set_network_metric(NetworkMetric(metric['device'],
+                                                             metric['rx_bytes'],
+                                                             metric['tx_bytes']))
 
-        for metric in metrics:
-            for node_metric in node_metrics:
-                if metric['instance'] == node_metric.get_instance():
-                    if 'device' not in metric:
-                        continue
-                    if 'rx_bytes' not in metric:
-                        continue
-                    if 'tx_bytes' not in metric:
-                        continue
-                    network_metric = NetworkMetric(metric['device'], metric['rx_bytes'], metric['tx_bytes'])
-                    node_metric.set_network_metric(network_metric)
+        for node_metric in node_metrics:
+            MetricRepository().rollup(node_metric)
 
         # push event(period=5)
         current_ts = time.time()
@@ -408,8 +428,5 @@ class MetricWatcher:
         if event_push:
             """ push node metric event """
             for node_metric in node_metrics:
-                event = EventObject(Event.MODIFIED.value,
-                                    Metric.NODE_METRIC.value,
-                                    node_metric)
-                notifier.put_event(event)
+                self._push_metric_updates(Event.MODIFIED, Metric.NODE_METRIC, node_metric)
         return
@@ -9,6 +9,8 @@ from gw_agent.common.error import get_exception_traceback
 from gw_agent.settings import get_logger, WATCH_NETWORK_INTERVAL
 from cluster.data_access_object import ClusterDAO
 from cluster.event.object import EventObject
+from cluster.watcher.informer import InformerFactory
+from cluster.watcher.prober import LatencyProber
 from cluster.watcher.resources import ResourceWatcher
 from mqtt.service import MultiClusterNetworkService
 from repository.cache.components import ComponentRepository
@@ -20,8 +22,11 @@ from cluster.common.type import Event, ThreadType
 from cluster.notifier.notify import Notifier
 from repository.cache.network import NetworkStatusRepository
 from repository.common.type import NetStat, MultiClusterRole, ClusterSessionStatus, ClusterNetworkConnectionStatus
+from repository.common.type import CustomResource
 from repository.model.netstat.multi_cluster import MultiClusterNetwork
 from repository.model.netstat.service import ServiceExport, ServiceImport
+from restclient.center import CenterSession
+from utils.serializer import Serializer
 from utils.threads import ThreadUtil
 from utils.validate import Validator
 
@@ -36,7 +41,13 @@ class NetworkWatcher:
     _mc_network_name = None
     _k8s_connector = None
     _last_connection_error_date = None
-    _custom_obj = None
+
+    # submariner, lighthouse custom resources fed by informers
+    _crd_stores = {}                    # {CustomResource(Enum): {(namespace, name): (dict) custom object}}
+    _crd_lock = threading.Lock()
+    _crd_changed = threading.Event()    # set when custom resources are changed after last collection
+    _crd_informers_started = False
+    _mc_network_resync = False          # set when center session is (re)initialized to resend multi-cluster status
 
     # Center agent rest API error definition for network watcher
     SUCCESS = 'no_error'
@@ -62,7 +73,16 @@ class NetworkWatcher:
         """
         self._logger = get_logger(__name__)
         self._k8s_connector = Connector()
-        self._custom_obj = self._k8s_connector.custom_objects_api()
+
+        # subscribe submariner, lighthouse custom resource informers
+        for target in (CustomResource.SUBMARINER_CLUSTER,
+                       CustomResource.SUBMARINER,
+                       CustomResource.SERVICE_DISCOVERY,
+                       CustomResource.SERVICE_IMPORT):
+            self._crd_stores[target] = {}
+            InformerFactory().get_informer(target).subscribe(
+                lambda event, crd=target: self._on_crd_event(crd, event),
+                lambda items, crd=target: self._on_crd_relist(crd, items))
 
         # set self object to NetworkStatusRepository
         NetworkStatusRepository().set_mc_network_status_watcher(self)
@@ -168,6 +188,15 @@ class NetworkWatcher:
         start multi cluster network status monitoring thread
         :return:
         """
+        # custom resource informers are started when multi-cluster network is monitored first
+        if not self._crd_informers_started:
+            for target in self._crd_stores.keys():
+                InformerFactory().get_informer(target).start()
+            self._crd_informers_started = True
+
+        # multi-cluster network status is cleared while paused, so collect it again
+        self._crd_changed.set()
+
         if self.is_paused(NetStat.MULTI_CLUSTER_NETWORK):
             self.resume(NetStat.MULTI_CLUSTER_NETWORK)
 
@@ -204,6 +233,8 @@ class NetworkWatcher:
                 if not ok:
                     self._logger.debug(error_message)
                     NetworkStatusRepository().clear_mc_network()
+                    # custom resources may be partially listed, so collect again in next cycle
+                    self._crd_changed.set()
 
             elif target == NetStat.CENTER_NETWORK:
                 self._audit_cluster_session()
@@ -217,51 +248,48 @@ class NetworkWatcher:
 
             time.sleep(WATCH_NETWORK_INTERVAL)
 
-    def initialize_cluster_session(self) -> (bool, str):
+    def _get_cluster_session_target(self) -> (str, str, str):
         """
-        initialize cluster session to center
-        :return: (bool) success, (str) error_message
+        get center network name and cluster id to initialize cluster session
+        :return: (str) center network name, (str) cluster id, (str) error_message; None - ready to initialize
         """
         # check whether center network interface(http, https, amqp, etc) is defined or not
         name = NetworkStatusRepository().get_center_network_name()
         if name is None:
-            return False, self.NotFoundCenterNetworkError
+            return None, None, self.NotFoundCenterNetworkError
 
         # cluster_id refers cluster name
         cluster_id = ResourceRepository().get_cluster_id()
         if cluster_id is None:
-            return False, self.NotFoundCenterClusterName
+            return None, None, self.NotFoundCenterClusterName
 
         # If cluster session is initializing, do not anything
         cluster_session_status = NetworkStatusRepository().get_cluster_session_status()
         if cluster_session_status == ClusterSessionStatus.CLUSTER_SESSION_INITIALIZING.value:
-            return True, self.ResourceBusy
+            return None, None, self.ResourceBusy
 
         # If all cluster data is ready, do not anything
-        if ResourceWatcher().is_all_resource_data_ready():
-            # suspend resource watch
-            ResourceWatcher().suspend_all_watches()
-
-            # get resource bulk data
-            bulk_resource = ResourceRepository().get_bulk_resource()
-            cluster_initialize_data = {'resource': bulk_resource.to_dict()}
-
-            # resume resource watch
-            ResourceWatcher().resume_all_watches()
+        if not ResourceWatcher().is_all_resource_data_ready():
+            return None, None, self.ClusterDataNotReady
 
-        else:
-            return False, self.ClusterDataNotReady
+        return name, cluster_id, None
 
+    def _request_cluster_session(self, url, data, compress) -> (bool, str):
+        """
+        request to initialize(or resync) cluster session
+        :param url: (str)
+        :param data: (generator or bytes) request body
+        :param compress: (bool) True - data is gzip compressed
+        :return: (bool) success, (str) error_message
+        """
         try:
-            # request to initialize cluster session
-            url = name + '/api/agent/v1' \
-                         '/cluster/{cluster_id}/initialize'.format(cluster_id=cluster_id)
-            headers = {'Content-Type': 'application/json; charset=utf-8'}
+            headers = {'Content-Encoding': 'gzip'} if compress else {}
 
-            response = requests.post(url,
-                                     headers=headers,
-                                     data=json.dumps(cluster_initialize_data),
-                                     timeout=settings.REST_REQUEST_TIMEOUT)
+            response = CenterSession().post(url,
+                                            headers=headers,
+                                            data=data,
+                                            timeout=(settings.REST_REQUEST_TIMEOUT,
+                                                     settings.CLUSTER_INITIALIZE_READ_TIMEOUT))
             if response.status_code == 200:
                 content = json.loads(response.content)
                 if 'error' not in content:
@@ -285,6 +313,88 @@ class NetworkWatcher:
             self._logger.error(error)
             return False, self.HttpConnectionError
 
+        except requests.exceptions.Timeout:
+            error = 'Http request timeout'
+            self._logger.error(error)
+            return False, self.HttpConnectionError
+
+    def initialize_cluster_session(self) -> (bool, str):
+        """
+        initialize cluster session to center with all resources
+        :return: (bool) success, (str) error_message
+        """
+        name, cluster_id, error_message = self._get_cluster_session_target()
+        if error_message == self.ResourceBusy:
+            return True, error_message
+        if error_message is not None:
+            return False, error_message
+
+        # get resource bulk data(point-in-time snapshot; resource watches keep running)
+        snapshot = ResourceRepository().get_snapshot()
+        bulk_resource = ResourceRepository().get_bulk_resource(snapshot=snapshot)
+
+        # request to initialize cluster session
+        url = name + '/api/agent/v1' \
+                     '/cluster/{cluster_id}/initialize'.format(cluster_id=cluster_id)
+
+        # stream bulk resource as chunked request body, each resource is encoded when sent
+        # 'sequence' is the change sequence of the snapshot to resync from later
+        cluster_initialize_data = Serializer.iterdumps({'resource': bulk_resource, 'sequence': snapshot[0]},
+                                                       chunk_size=settings.CLUSTER_INITIALIZE_CHUNK_SIZE,
+                                                       compress=settings.CLUSTER_INITIALIZE_COMPRESSION)
+
+        return self._request_cluster_session(url, cluster_initialize_data, settings.CLUSTER_INITIALIZE_COMPRESSION)
+
+    def resync_cluster_session(self, sequence) -> (bool, str):
+        """
+        re-initialize cluster session with changes after the sequence acknowledged by center(delta-sync)
+        fall back to initialize_cluster_session() if changes are not available(change log is truncated)
+        or center rejects them
+        :param sequence: (int) last change sequence acknowledged by center; None - unknown
+        :return: (bool) success, (str) error_message
+        """
+        if sequence is None:
+            return self.initialize_cluster_session()
+
+        name, cluster_id, error_message = self._get_cluster_session_target()
+        if error_message == self.ResourceBusy:
+            return True, error_message
+        if error_message is not None:
+            return False, error_message
+
+        current, changes = ResourceRepository().get_changes_since(sequence)
+        if changes is None:
+            self._logger.info('Change log is truncated after sequence({}), '
+                              'initialize cluster session with all resources'.format(sequence))
+            return self.initialize_cluster_session()
+
+        events = [EventObject(event_type=event_type.value,
+                              object_type=kind.value,
+                              object_value=resource,
+                              sequence=change_sequence) for change_sequence, event_type, kind, resource in changes]
+
+        url = name + '/api/agent/v1' \
+                     '/cluster/{cluster_id}/resync'.format(cluster_id=cluster_id)
+        cluster_resync_data = Serializer.iterdumps({'since': sequence, 'sequence': current, 'events': events},
+                                                   depth=2,
+                                                   chunk_size=settings.CLUSTER_INITIALIZE_CHUNK_SIZE,
+                                                   compress=settings.CLUSTER_INITIALIZE_COMPRESSION)
+
+        ok, error_message = self._request_cluster_session(url,
+                                                          cluster_resync_data,
+                                                          settings.CLUSTER_INITIALIZE_COMPRESSION)
+        if ok:
+            self._logger.info('Cluster session is resynced, '
+                              'sequence={}~{}, changes={}'.format(sequence, current, len(events)))
+            return ok, error_message
+
+        if error_message == self.HttpConnectionError:
+            return ok, error_message
+
+        self._logger.info('Fail to resync cluster session, initialize cluster session with all resources')
+
+        return self.initialize_cluster_session()
+
     def _thread_watchdog(self):
         """
         thread watchdog callback
@@ -335,16 +445,14 @@ class NetworkWatcher:
             url = name + '/api/agent/v1' \
                          '/cluster/{cluster_id}/keep_alive'.format(cluster_id=cluster_id)
 
-            headers = {'Content-Type': 'application/json; charset=utf-8'}
-
             keep_alive_content = {
                 'submariner_state': ComponentRepository().get_submariner_state().value,
             }
 
-            response = requests.post(url,
-                                     headers=headers,
-                                     data=json.dumps(keep_alive_content),
-                                     timeout=settings.REST_REQUEST_TIMEOUT)
+            # keep alive is a probe for network connection status, so it is not retried
+            response = CenterSession().post(url,
+                                            data=json.dumps(keep_alive_content),
+                                            retries=0)
             connection_status = ClusterNetworkConnectionStatus.CONNECTED.value
 
             if response.status_code == 200:
@@ -395,14 +503,15 @@ class NetworkWatcher:
                         '''
                         CLUSTER_SESSION_NOT_ESTABLISHED: session not initialized ever
                         CLUSTER_SESSION_ESTABLISHED: agent is restarted after failure '''
-                        # initialize cluster session
-                        ok, error_message = self.initialize_cluster_session()
+                        # initialize cluster session; only changes after 'sequence' if center reports it
+                        ok, error_message = self.resync_cluster_session(content.get('sequence'))
                         if ok:
                             ''' 
                             If session initialization is succeed, 
                             change session status to CLUSTER_SESSION_INITIALIZING '''
                             status = ClusterSessionStatus.CLUSTER_SESSION_INITIALIZING.value
                             NetworkStatusRepository().set_cluster_session_status(name, status)
+                            self._resync_multi_cluster_network_status()
 
                         else:
                             if error_message == self.HttpConnectionError:
@@ -435,6 +544,9 @@ class NetworkWatcher:
                         CLUSTER_SESSION_NOT_ESTABLISHED: fail to initialize cluster session'''
                         NetworkStatusRepository().set_cluster_session_status(name, session_status)
 
+                        if session_status == ClusterSessionStatus.CLUSTER_SESSION_ESTABLISHED.value:
+                            self._resync_multi_cluster_network_status()
+
                     else:
                         self._logger.error('Fatal: Invalid ClusterSessionStatus')
                 else:
@@ -445,7 +557,7 @@ class NetworkWatcher:
                 error = 'Fatal: Invalid http response status code. status code = {}'.format(response.status_code)
                 self._logger.error(error)
 
-        except requests.exceptions.ConnectionError:
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             connection_status = ClusterNetworkConnectionStatus.TEMPORARY_NETWORK_FAILURE.value
 
         '''
@@ -464,13 +576,94 @@ class NetworkWatcher:
             session_status = ClusterSessionStatus.CLUSTER_SESSION_NOT_ESTABLISHED.value
             NetworkStatusRepository().set_cluster_session_status(name, session_status)
 
+    @staticmethod
+    def _get_crd_key(item) -> tuple:
+        """
+        get store key for custom object
+        :param item: (dict) custom object
+        :return: (tuple) (namespace, name)
+        """
+        metadata = item.get('metadata', {})
+
+        return metadata.get('namespace'), metadata.get('name')
+
+    def _on_crd_event(self, target, event):
+        """
+        custom resource informer event handler
+        :param target: (CustomResource(Enum))
+        :param event: (dict) watch event
+        :return:
+        """
+        event_type = Event.to_enum(event['type'])
+        item = event['object']
+
+        if type(item) != dict:
+            return
+
+        with self._crd_lock:
+            store = self._crd_stores[target]
+            key = self._get_crd_key(item)
+
+            if event_type == Event.ADDED or event_type == Event.MODIFIED:
+                if store.get(key) == item:
+                    return
+                store[key] = item
+            elif event_type == Event.DELETED:
+                if store.pop(key, None) is None:
+                    return
+            else:
+                return
+
+        self._crd_changed.set()
+
+    def _on_crd_relist(self, target, items):
+        """
+        custom resource informer relist handler
+        :param target: (CustomResource(Enum))
+        :param items: (list(dict)) custom objects
+        :return:
+        """
+        store = {self._get_crd_key(item): item for item in items}
+
+        with self._crd_lock:
+            if self._crd_stores[target] == store:
+                return
+            self._crd_stores[target] = store
+
+        self._crd_changed.set()
+
+    def _get_crd_items(self, target) -> list:
+        """
+        get cached custom objects
+        :param target: (CustomResource(Enum))
+        :return: (list(dict))
+        """
+        with self._crd_lock:
+            return list(self._crd_stores[target].values())
+
+    def _resync_multi_cluster_network_status(self):
+        """
+        resend multi-cluster network status, service exports and imports in next collection,
+        since they are not included in bulk resources and events are flushed while session is not established
+        :return:
+        """
+        NetworkStatusRepository().reset_mc_network_services()
+        self._mc_network_resync = True
+        self._crd_changed.set()
+
     def _collect_multi_cluster_network_status(self) -> (bool, str):
         """
-        collect multi cluster network status
+        collect multi cluster network status from submariner, lighthouse custom resources cached by informers
+        status is collected only when custom resources are changed,
+        and events are notified only when status is changed
         :return:
         (bool) True - success
         (str) error message
         """
+        if not self._crd_changed.is_set():
+            return True, None
+        self._crd_changed.clear()
+
         self._logger.debug('[CALL] MC_STATUS THREAD')
 
         """
@@ -480,25 +673,9 @@ class NetworkWatcher:
         - name: cluster
         - plural: clusters
         """
-        try:
-            result = self._custom_obj.list_cluster_custom_object(
-                group='submariner.io',
-                plural='clusters',
-                version='v1',
-                _request_timeout=settings.REST_REQUEST_TIMEOUT)
-
-        except Exception as exc:  # not exist ApiService resource
-            error_message = 'Failed in list_cluster_custom_object(submariner.io.clusters.v1) request, ' \
-                            'caused by ' + get_exception_traceback(exc)
-            return False, error_message
-
-        error_message = 'Failed in list_cluster_custom_object(submariner.io.clusters.v1) response, caused by '
-
-        if 'items' not in result:
-            error_message += 'not found items in body'
-            return False, error_message
+        error_message = 'Failed in parsing submariner.io.clusters.v1, caused by '
 
-        items = result['items']
+        items = self._get_crd_items(CustomResource.SUBMARINER_CLUSTER)
         if len(items) <= 0:
             error_message += 'not found items in body'
             return False, error_message
@@ -536,26 +713,9 @@ class NetworkWatcher:
         - name: submariner
         - plural: submariners
         """
-        try:
-            result = self._custom_obj.list_cluster_custom_object(
-                group='submariner.io',
-                plural='submariners',
-                version='v1alpha1',
-                _request_timeout=settings.REST_REQUEST_TIMEOUT)
-
-        except Exception as exc:  # not exist ApiService resource
-            error_message = 'Failed in list_cluster_custom_object(submariner.io.submariners.v1alpha1) request, ' \
-                            'caused by ' + get_exception_traceback(exc)
-            return False, error_message
-
-        error_message = 'Failed in list_cluster_custom_object(submariner.io.submariners.v1alpha1) response, caused by '
-
-        if 'items' not in result:
-            error_message += 'not found items'
-            return False, error_message
-
-        items = result['items']
+        error_message = 'Failed in parsing submariner.io.submariners.v1alpha1, caused by '
 
+        items = self._get_crd_items(CustomResource.SUBMARINER)
         if len(items) <= 0:
             error_message += 'not found items'
             return False, error_message
@@ -683,10 +843,13 @@ class NetworkWatcher:
                         latency = float(0)
 
                     try:
-                        MetricRepository().set_mc_network_latency(
-                            name=connection['endpoint']['cluster_id'],
-                            latency=latency,
-                            timestamp=time.time())
+                        # latency is measured by LatencyProber if enabled and the endpoint had samples
+                        if not settings.LATENCY_PROBE_ENABLED or \
+                                connection['endpoint']['cluster_id'] not in LatencyProber().get_probed_endpoints():
+                            MetricRepository().set_mc_network_latency(
+                                name=connection['endpoint']['cluster_id'],
+                                latency=latency,
+                                timestamp=time.time())
                     except Exception as exc:
                         return False, 'set() TypeError in MetricRepository().set_mc_network_latency(), ' \
                                       'caused by ' + get_exception_traceback(exc)
@@ -700,25 +863,9 @@ class NetworkWatcher:
         - name: servicediscovery
         - plural: ServiceDiscoveries
         """
-        try:
-            result = self._custom_obj.list_cluster_custom_object(
-                group='submariner.io',
-                plural='servicediscoveries',
-                version='v1alpha1',
-                _request_timeout=settings.REST_REQUEST_TIMEOUT)
-        except Exception as exc:  # not exist ApiService resource
-            error_message = 'Failed in list_cluster_custom_object(submariner.io.servicediscoveries.v1alpha1) ' \
-                            'request, caused by ' + get_exception_traceback(exc)
-            return False, error_message
-
-        error_message = 'Failed in list_cluster_custom_object(submariner.io.servicediscoveries.v1alpha1) response, ' \
-                        'caused by '
-
-        if 'items' not in result:
-            error_message += 'not found items'
-            return False, error_message
-        items = result['items']
+        error_message = 'Failed in parsing submariner.io.servicediscoveries.v1alpha1, caused by '
 
+        items = self._get_crd_items(CustomResource.SERVICE_DISCOVERY)
         if len(items) <= 0:
             error_message += 'not found items'
             return False, error_message
@@ -750,7 +897,17 @@ class NetworkWatcher:
                             'caused by ' + get_exception_traceback(exc)
             return False, error_message
 
+        # set multi-cluster network's endpoints status
+        if len(endpoints) > 0:
+            try:
+                mc_network.set_endpoints(endpoints)
+            except Exception as exc:
+                error_message = 'Failed in MultiClusterNetwork().set_endpoints(endpoints), ' \
+                                'caused by ' + get_exception_traceback(exc)
+                return False, error_message
+
         # set multi-cluster network status
+        previous = NetworkStatusRepository().get_mc_network()
         try:
             NetworkStatusRepository().set_mc_network(mc_network)
         except Exception as exc:
@@ -758,21 +915,13 @@ class NetworkWatcher:
                             'caused by ' + get_exception_traceback(exc)
             return False, error_message
 
-        # set multi-cluster network's endpoints status
-        if len(endpoints) > 0:
-            try:
-                NetworkStatusRepository().set_mc_network_endpoints(endpoints)
-            except Exception as exc:
-                error_message = 'Failed in NetworkStatusRepository().set_mc_network_endpoints(endpoints), ' \
-                                'caused by ' + get_exception_traceback(exc)
-                return False, error_message
-
-        # send multi-cluster network status event
-        event = EventObject(Event.MODIFIED.value,
-                            NetStat.MULTI_CLUSTER_NETWORK.value,
-                            NetworkStatusRepository().get_mc_network())
+        # send multi-cluster network status event only if changed
+        if previous is None or self._mc_network_resync or previous.to_dict() != mc_network.to_dict():
+            event = EventObject(Event.MODIFIED.value,
+                                NetStat.MULTI_CLUSTER_NETWORK.value,
+                                mc_network)
 
-        Notifier().put_event(event)
+            Notifier().put_event(event)
 
         """
         PARSE service imports/exports
@@ -780,27 +929,12 @@ class NetworkWatcher:
         - API version: v1alpha1
         - plural: serviceimports
         """
-        try:
-            result = self._custom_obj.list_cluster_custom_object(
-                group='multicluster.x-k8s.io',
-                plural='serviceimports',
-                version='v1alpha1',
-                _request_timeout=settings.REST_REQUEST_TIMEOUT)
-        except Exception as exc:  # not exist ApiService resource
-            error_message = 'Failed in list_cluster_custom_object(multicluster.x-k8s.io.serviceimports.v1alpha1) ' \
-                            'request, caused by ' + get_exception_traceback(exc)
-            return False, error_message
-
-        if 'items' not in result:
-            error_message += 'not found items'
-            return False, error_message
-        items = result['items']
+        items = self._get_crd_items(CustomResource.SERVICE_IMPORT)
 
         service_exports = []
         service_imports = []
 
-        error_message = 'Failed in list_cluster_custom_object(multicluster.x-k8s.io.serviceimports.v1alpha1) ' \
-                        'response, caused by '
+        error_message = 'Failed in parsing multicluster.x-k8s.io.serviceimports.v1alpha1, caused by '
 
         if len(items) > 0:
             for item in items:
@@ -895,18 +1029,23 @@ class NetworkWatcher:
                         continue
 
         """ 
-        NOTIFY event for service export 
+        NOTIFY event for service export only if changed
         """
-        NetworkStatusRepository().set_mc_network_service_exports(service_exports)
-        Notifier().put_event(EventObject(event_type=Event.MODIFIED.value,
-                                         object_type=NetStat.SERVICE_EXPORTS.value,
-                                         object_value=service_exports))
+        if NetworkStatusRepository().synchronize_mc_network_service_exports(service_exports) or \
+                self._mc_network_resync:
+            Notifier().put_event(EventObject(event_type=Event.MODIFIED.value,
+                                             object_type=NetStat.SERVICE_EXPORTS.value,
+                                             object_value=service_exports))
 
         """ 
-        NOTIFY event for service import 
+        NOTIFY event for service import only if changed
         """
-        NetworkStatusRepository().set_mc_network_service_imports(service_imports)
-        Notifier().put_event(EventObject(event_type=Event.MODIFIED.value,
-                                         object_type=NetStat.SERVICE_IMPORTS.value,
-                                         object_value=service_imports))
+        if NetworkStatusRepository().synchronize_mc_network_service_imports(service_imports) or \
+                self._mc_network_resync:
+            Notifier().put_event(EventObject(event_type=Event.MODIFIED.value,
+                                             object_type=NetStat.SERVICE_IMPORTS.value,
+                                             object_value=service_imports))
+
+        self._mc_network_resync = False
+
         return True, None
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+
+from gw_agent import settings
+from gw_agent.common.error import get_exception_traceback
+from gw_agent.settings import get_logger
+from repository.cache.metric import MetricRepository
+from repository.cache.network import NetworkStatusRepository
+from repository.common.type import MultiClusterRole
+
+
+class LatencyProber:
+    """
+    multi-cluster endpoint latency prober
+    - measures TCP connect RTT(SYN to SYN-ACK or RST) to remote gateways and imported services in asyncio loop
+    - endpoints(remote cluster_id) are probed concurrently, and each endpoint is bounded by LATENCY_PROBE_BUDGET
+    - a round of probes is summarized as percentiles and fed to EndpointNetworkMetric
+    - endpoints without samples in the last round(i.e., firewalled gateway) are left to CR-derived latency
+    """
+    _logger = None
+    _thread = None
+    _loop = None
+    _probed = frozenset()   # endpoint names(remote cluster_id) that had samples in the last round
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._config()
+
+        return cls._instance
+
+    def _config(self):
+        self._logger = get_logger(__name__)
+
+    def start(self):
+        """
+        start prober thread
+        :return:
+        """
+        if not settings.LATENCY_PROBE_ENABLED or self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        """
+        is prober thread alive
+        :return: (bool)
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_probed_endpoints(self) -> frozenset:
+        """
+        get endpoints that had probe samples in the last round
+        :return: (frozenset[str]) remote cluster_ids; empty - prober is not running or no samples
+        """
+        if not self.is_alive():
+            return frozenset()
+
+        return self._probed
+
+    def _run(self):
+        """
+        prober thread callback
+        :return:
+        """
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        while True:
+            try:
+                self._loop.run_until_complete(self._probe_round())
+            except Exception as exc:
+                self._logger.error('Fail to probe latency, caused by ' + get_exception_traceback(exc))
+
+            time.sleep(settings.LATENCY_PROBE_INTERVAL)
+
+    @staticmethod
+    def _get_targets() -> dict:
+        """
+        get probe targets for each remote cluster
+        :return: (dict) {(str) cluster_id: [((str) host, (int) port),]}
+        """
+        targets = {}
+        local_cluster_id = NetworkStatusRepository().get_mc_network_name()
+
+        for endpoint in NetworkStatusRepository().get_mc_network_endpoints() or []:
+            if endpoint.get_role() != MultiClusterRole.REMOTE.value or not endpoint.get_gateway_ip():
+                continue
+            targets.setdefault(endpoint.get_name(), []).append((endpoint.get_gateway_ip(),
+                                                                 settings.LATENCY_PROBE_GATEWAY_PORT))
+
+        for service_import in NetworkStatusRepository().get_mc_network_service_imports() or []:
+            cluster_id = service_import.get_cluster_id()
+            port = service_import.get_port()
+            if cluster_id == local_cluster_id or not service_import.get_ip() or not port:
+                continue
+            targets.setdefault(cluster_id, []).append((service_import.get_ip(), int(port)))
+
+        return targets
+
+    @staticmethod
+    async def _connect_rtt(host: str, port: int):
+        """
+        measure TCP connect round-trip time
+        :param host: (str)
+        :param port: (int)
+        :return: (float) RTT(ms); None - no response
+        """
+        start = time.perf_counter()
+
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except ConnectionRefusedError:
+            # RST is a response from the host, so it is a round trip as well
+            return (time.perf_counter() - start) * 1000
+        except OSError:
+            return None
+
+        rtt = (time.perf_counter() - start) * 1000
+        writer.close()
+
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+        return rtt
+
+    async def _probe_endpoint(self, targets: list) -> list:
+        """
+        probe targets of an endpoint within LATENCY_PROBE_BUDGET seconds
+        :param targets: (list) [((str) host, (int) port),]
+        :return: (list(float)) RTTs(ms) measured within budget
+        """
+        tasks = [asyncio.ensure_future(self._connect_rtt(host, port))
+                 for host, port in targets
+                 for _ in range(settings.LATENCY_PROBE_COUNT)]
+
+        done, pending = await asyncio.wait(tasks, timeout=settings.LATENCY_PROBE_BUDGET)
+        for task in pending:
+            task.cancel()
+
+        # a failed task must not abort the round for all endpoints
+        return [task.result() for task in done
+                if not task.cancelled() and task.exception() is None and task.result() is not None]
+
+    @staticmethod
+    def _percentile(sorted_values: list, percent: float) -> float:
+        """
+        get percentile with linear interpolation
+        :param sorted_values: (list(float)) sorted values
+        :param percent: (float) 0 ~ 100
+        :return: (float)
+        """
+        position = (len(sorted_values) - 1) * percent / 100
+        lower = int(position)
+        upper = min(lower + 1, len(sorted_values) - 1)
+
+        return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+    async def _probe_round(self):
+        """
+        probe all endpoints concurrently and feed percentiles to metric repository
+        :return:
+        """
+        targets = self._get_targets()
+        if not targets:
+            self._probed = frozenset()
+            return
+
+        names = list(targets.keys())
+        results = await asyncio.gather(*[self._probe_endpoint(targets[name]) for name in names])
+        timestamp = time.time()
+        probed = set()
+
+        for name, rtts in zip(names, results):
+            if not rtts:
+                continue
+            probed.add(name)
+
+            rtts.sort()
+            percentiles = {percent: self._percentile(rtts, percent) for percent in (50, 90, 99)}
+            MetricRepository().set_mc_network_latency_percentiles(name=name,
+                                                                  percentiles=percentiles,
+                                                                  timestamp=timestamp)
+
+        self._probed = frozenset(probed)
@@ -226,18 +226,59 @@ def get_logger(app_name):
 NUMBER_OF_COMMAND_EXECUTORS = 3
 NUMBER_OF_EVENT_NOTIFIERS = 1
 
+# component provisioning graph
+# (number of concurrent provisioning steps, seconds to wait for dependencies ready in a provisioning round)
+NUMBER_OF_PROVISION_WORKERS = 4
+PROVISION_READY_TIMEOUT = 30
+
 """ number of MQTT consumers """
 NUMBER_OF_MQTT_CONSUMERS = 3
 
+""" MQTT request dispatch(prefetch count per consumer, number of workers, default concurrency per route) """
+MQTT_PREFETCH_COUNT = 10
+NUMBER_OF_MQTT_DISPATCH_WORKERS = 8
+MQTT_ROUTE_CONCURRENCY = 4
+MQTT_ROUTE_CACHE_SIZE = 1024
+
 # interval for network watcher thread collector
 WATCH_NETWORK_INTERVAL = 3
 WATCH_NOTIFIER_INTERVAL = 1
 WATCH_COMMON_INTERVAL = 1
 WATCH_COMPONENT_INTERVAL = 5
+WATCH_MC_NETWORK_METRIC_INTERVAL = 3  # submariner RX/TX sampling interval(float; sub-second is allowed)
+
+# multi-cluster endpoint latency prober
+# (interval seconds between rounds, probes per target, seconds budget per endpoint, TCP port probed for gateways)
+LATENCY_PROBE_ENABLED = True
+LATENCY_PROBE_INTERVAL = 5
+LATENCY_PROBE_COUNT = 5
+LATENCY_PROBE_BUDGET = 1.0
+LATENCY_PROBE_GATEWAY_PORT = 8080
 
 # notifier max retransmission count
 NOTIFIER_MAX_RETRANSMISSION_COUNT = 30
 
+# metric rollup tiers({tier name: (bucket interval seconds, number of buckets)})
+# and tier pushed to each consumer('raw' or a tier name)
+METRIC_ROLLUP_TIERS = {
+    '1m': (60, 60),
+    '5m': (300, 288),
+}
+METRIC_PUSH_TIERS = {
+    'center': 'raw',
+}
+
+# resource change log size for delta-sync(number of changes kept to resync center)
+RESOURCE_CHANGE_LOG_SIZE = 50000
+
+# notifier wait queue and batch config
+# (max queued events, max seconds a resource event waits for room in full queue,
+#  max events per request, max milliseconds to coalesce a batch)
+NOTIFIER_MAX_QUEUE_SIZE = 10000
+NOTIFIER_PUT_TIMEOUT = 1
+NOTIFIER_BATCH_SIZE = 100
+NOTIFIER_BATCH_INTERVAL = 200
+
 # kubernetes configuration
 KUBECONFIG_FILE='/etc/kubernetes/admin.conf'
 
@@ -287,6 +328,8 @@ PROM_NAMESPACE = 'monitoring'
 PROM_SERVICE = 'prometheus-service'
 PROM_DEPLOYMENT = 'prometheus-server'
 PROM_SERVICE_PORT = 8080
+PROM_QUERY_WORKERS = 4              # number of concurrent prometheus queries
+PROM_STATIC_METRIC_CACHE_TTL = 300  # seconds to cache static series(number of cpu, total memory)
 
 """ prometheus metric settings """
 K8S_STATE_METRIC_NAMESPACE = 'kube-system'
@@ -316,6 +359,24 @@ CENTER_RECONNECT_WAIT_TIME = 30
 """ k8s api request timeout """
 REST_REQUEST_TIMEOUT = 10
 
+""" center REST client config
+(pooled hosts, keep-alive connections per host, retries and jittered backoff seconds for connection error or
+retry status, consecutive failures to open circuit and seconds to try again) """
+CENTER_POOL_CONNECTIONS = 2
+CENTER_POOL_MAXSIZE = 16
+CENTER_RETRY_COUNT = 2
+CENTER_RETRY_BACKOFF = 0.2
+CENTER_RETRY_BACKOFF_MAX = 2
+CENTER_RETRY_STATUS = (502, 503, 504)
+CENTER_CIRCUIT_FAILURE_THRESHOLD = 5
+CENTER_CIRCUIT_RESET_TIMEOUT = 10
+
+""" cluster session initialize(streaming bulk resource upload) config
+(gzip request body, chunk bytes, seconds to wait for center between chunks and for response) """
+CLUSTER_INITIALIZE_COMPRESSION = True
+CLUSTER_INITIALIZE_CHUNK_SIZE = 64 * 1024
+CLUSTER_INITIALIZE_READ_TIMEOUT = 60
+
 """ monitoring thread join timeout """
 THREAD_JOIN_TIMEOUT = 30
 
@@ -1,3 +1,4 @@
+import functools
 import threading
 from gw_agent import settings
 import pika
@@ -80,13 +81,18 @@ class Consumer:
     def __callback_on_message(cls, channel, method, properties, body):
         """
         consume message callback
+        request is executed in Dispatcher's worker pool not to block connection I/O(heartbeat),
+        and acknowledged after completion; unacknowledged messages are bounded by prefetch count
         :param channel:
         :param method:
         :param properties:
         :param body:
         :return:
         """
-        return Dispatcher().dispatch(body)
+        ack = functools.partial(channel.basic_ack, delivery_tag=method.delivery_tag)
+        completed = functools.partial(channel.connection.add_callback_threadsafe, ack)
+
+        Dispatcher().submit(body, completed)
 
     def _callback_consumer(self, index):
         """
@@ -115,9 +121,10 @@ class Consumer:
             thread_data['connection'] = connection
             channel = connection.channel()
             channel.queue_declare(queue=self._queue)
+            channel.basic_qos(prefetch_count=settings.MQTT_PREFETCH_COUNT)
             channel.basic_consume(queue=self._queue,
                                   on_message_callback=Consumer.__callback_on_message,
-                                  auto_ack=True)
+                                  auto_ack=False)
 
             self._logger.info('MQTT consumer thread[{}] is started: queue[{}]'.format(index, self._queue))
 
@@ -1,6 +1,11 @@
+import functools
 import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 
+from gw_agent import settings
 from gw_agent.common.error import get_exception_traceback
 from gw_agent.settings import get_logger
 from mqtt.model.request import Request
@@ -10,13 +15,23 @@ from mqtt.urls import urlpatterns
 class Dispatcher:
     """
     MQTT Request dispatcher from CEdge-center
+    - requests are executed in a bounded worker pool(NUMBER_OF_MQTT_DISPATCH_WORKERS)
+    - each route runs at most its concurrency limit at once, and the others wait in the route's pending queue
+      not to occupy workers
     """
     _route = {}
+    _trie = {'resource': {}, 'parameter': None, 'route': None}  # compiled route segment trie
+    _executor = None
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "_instance"):
             cls._instance = super().__new__(cls)
             cls._instance._logger = get_logger(__name__)
+            cls._instance._executor = ThreadPoolExecutor(max_workers=settings.NUMBER_OF_MQTT_DISPATCH_WORKERS,
+                                                         thread_name_prefix='mqtt-dispatch')
+            cls._instance._match_path = functools.lru_cache(maxsize=settings.MQTT_ROUTE_CACHE_SIZE)(
+                cls._instance._match_path)
         return cls._instance
 
     @classmethod
@@ -48,11 +63,12 @@ class Dispatcher:
         for pattern in urlpatterns:
             self._register(*pattern)
 
-    def _register(self, url, callback):
+    def _register(self, url, callback, concurrency=settings.MQTT_ROUTE_CONCURRENCY):
         """
         register route
         :param url: (str)
         :param callback: method
+        :param concurrency: (int) max number of concurrent requests for the route
         :return:
         """
         # example /cluster/:cluster_id/node/:node_id/
@@ -61,49 +77,87 @@ class Dispatcher:
 
         self._route[url] = {
             'match_rule': self._parse_path(path),
-            'callback': callback
+            'callback': callback,
+            'concurrency': concurrency,
+            'running': 0,
+            'pending': deque()
         }
 
+        # compile route to segment trie
+        node = self._trie
+        for rule in self._route[url]['match_rule']:
+            if rule['type'] == 'resource':
+                node = node['resource'].setdefault(rule['name'],
+                                                   {'resource': {}, 'parameter': None, 'route': None})
+            else:
+                if node['parameter'] is None:
+                    node['parameter'] = (rule['name'], {'resource': {}, 'parameter': None, 'route': None})
+                node = node['parameter'][1]
+
+        node['route'] = self._route[url]
+        self._match_path.cache_clear()
+
+    def _match_node(self, node, values, index, path_variables):
+        """
+        match path segments with route trie(resource segment is preferred to parameter)
+        :param node: (dict) trie node
+        :param values: (list(str)) path segments
+        :param index: (int) current segment index
+        :param path_variables: (list) matched (name, value) parameters
+        :return: (dict) route entry; None if not matched
+        """
+        if index == len(values):
+            return node['route']
+
+        child = node['resource'].get(values[index])
+        if child is not None:
+            route = self._match_node(child, values, index + 1, path_variables)
+            if route is not None:
+                return route
+
+        if node['parameter'] is not None:
+            name, child = node['parameter']
+            path_variables.append((name, values[index]))
+            route = self._match_node(child, values, index + 1, path_variables)
+            if route is not None:
+                return route
+            path_variables.pop()
+
+        return None
+
+    def _match_path(self, path):
+        """
+        match path with route trie(cached with LRU in instance)
+        :param path: (str) url path without query
+        :return: (dict, tuple) route entry and path variables; (None, None) if not matched
+        """
+        values = list(filter(len, path.split('/')))
+        path_variables = []
+        route = self._match_node(self._trie, values, 0, path_variables)
+
+        if route is None:
+            return None, None
+
+        return route, tuple(path_variables)
+
     def _get_route(self, url):
         """
         get route entry
         :param url: (str)
         :return:
         """
-        values = url.split('/')
-        values = list(filter(len, values))
-        path_variables = {}
-        not_matched = True
-        route = None
-
-        for item in self._route.values():
-            match_rule = item['match_rule']
-            if len(match_rule) == len(values):
-                not_matched = False
-                path_variables = {}
-                for i in range(0, len(match_rule)):
-                    if match_rule[i]['type'] == 'resource':
-                        if match_rule[i]['name'] != values[i]:
-                            not_matched = True
-                            break
-                    else:
-                        path_variables[match_rule[i]['name']] = values[i]
-                if not_matched:
-                    continue
-                else:   # matched
-                    route = item
-                    break
-
-        if not_matched:
+        route, path_variables = self._match_path(urlparse(url).path)
+
+        if route is None:
             return False, None, None
 
-        return True, route, path_variables
+        return True, route, dict(path_variables)
 
-    def dispatch(self, data: bytes):
+    def _resolve(self, data: bytes):
         """
-        dispatch request message
-        :param data:
-        :return:
+        parse request message and find route
+        :param data: (bytes) request message
+        :return: (Request, dict) request and route; (None, None) if message is invalid or not routable
         """
         decoded = data.decode('utf-8')
 
@@ -111,18 +165,93 @@ class Dispatcher:
             body = json.loads(decoded)
         except json.decoder.JSONDecodeError:
             self._logger.error('Invalid request: raw message: \'{}\''.format(decoded))
-            return
+            return None, None
+
+        # reject malformed request before creating Request object
+        if type(body) != dict or type(body.get('path')) != str:
+            self._logger.error('Invalid request: not found path: raw message: \'{}\''.format(decoded))
+            return None, None
+
+        ok, route, arguments = self._get_route(body['path'])
+
+        if not ok:
+            self._logger.error('Not found route for path({})'.format(body['path']))
+            return None, None
 
-        # dispatch
         try:
             request = Request.to_object(body)
         except Exception as exc:
             self._logger.error('Failed to Request.to_object(body), caused by ' + get_exception_traceback(exc))
+            return None, None
 
-        ok, route, arguments = self._get_route(request.get_path())
+        request.set_arguments(arguments)
 
-        if ok:
-            request.set_arguments(arguments)
+        return request, route
+
+    def dispatch(self, data: bytes):
+        """
+        dispatch request message(execute callback in caller thread)
+        :param data:
+        :return:
+        """
+        request, route = self._resolve(data)
+
+        if route is None:
+            return
 
         # call callback method
-        route['callback'](request)
\ No newline at end of file
+        route['callback'](request)
+
+    def submit(self, data: bytes, completed):
+        """
+        submit request message to worker pool
+        :param data: (bytes) request message
+        :param completed: (callable) called with no argument when request is completed or discarded
+        :return:
+        """
+        request, route = self._resolve(data)
+
+        if route is None:
+            self._complete(completed)
+            return
+
+        with self._lock:
+            if route['running'] >= route['concurrency']:
+                route['pending'].append((request, completed))
+                return
+
+            route['running'] += 1
+
+        self._executor.submit(self._execute, request, route, completed)
+
+    def _execute(self, request, route, completed):
+        """
+        execute route callback in worker, and then schedule pending request for the route
+        :param request: (Request)
+        :param route: (dict) route entry
+        :param completed: (callable)
+        :return:
+        """
+        try:
+            route['callback'](request)
+        except Exception as exc:
+            self._logger.error('Failed to execute request(path={}), '
+                               'caused by {}'.format(request.get_path(), get_exception_traceback(exc)))
+        finally:
+            self._complete(completed)
+
+        with self._lock:
+            if len(route['pending']) == 0:
+                route['running'] -= 1
+                return
+
+            request, completed = route['pending'].popleft()
+
+        self._executor.submit(self._execute, request, route, completed)
+
+    def _complete(self, completed):
+        """ call completion callback """
+        try:
+            completed()
+        except Exception as exc:
+            self._logger.error('Failed to complete request, caused by ' + get_exception_traceback(exc))
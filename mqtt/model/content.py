@@ -1,7 +1,6 @@
-import six
-
 from mqtt.model.common.type import ContentType
 from mqtt.model.file_content import FileContent
+from utils.serializer import Serializer
 
 class Content:
     """
@@ -63,27 +62,7 @@ class Content:
         to dict from self instance
         :return:
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_content_type(self):
         """
@@ -1,6 +1,6 @@
 import base64
 import os
-import six
+from utils.serializer import Serializer
 
 
 class FileContent:
@@ -23,27 +23,7 @@ class FileContent:
         to dict from self instance
         :return:
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     @classmethod
     def _validate(cls, _dict: dict):
@@ -1,9 +1,8 @@
-import six
-
 from mqtt.model.common.type import Method
 from urllib.parse import urlparse, parse_qs
 from mqtt.model.content import Content
 from utils.validate import Validator
+from utils.serializer import Serializer
 
 
 class Request:
@@ -72,26 +71,7 @@ class Request:
         get dictionary from instance
         :return:
         """
-        result = {}
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_request_id(self):
         """
@@ -1,3 +1,4 @@
+import functools
 import json
 import threading
 import time
@@ -11,9 +12,12 @@ from gw_agent.common.error import get_exception_traceback
 from cluster.command.kubernetes import KubeCommand
 from cluster.command.submariner import SubmarinerCommand
 from cluster.command.localhost import LocalHostCommand
+from cluster.watcher.informer import InformerFactory
+from repository.cache.provision import ProvisionGraph
 from repository.cache.network import NetworkStatusRepository
 from repository.cache.resources import ResourceRepository
 from repository.common import prometheus_client, nfs_server_client
+from repository.common.type import Kubernetes
 from repository.common.type import ConnectionStatus, MultiClusterRole, CommandType, CommandResult, ExecutionStatus
 from repository.common.type import SubmarinerState, MultiClusterConfigState, MultiClusterNetworkDiagnosis
 from cluster.data_access_object import ClusterDAO
@@ -32,6 +36,7 @@ class ComponentRepository:
     _logger = None
     _initialized = False
     _checklist = None
+    _compiled_checklist = None  # [(condition key, [(kind, namespace, name)])] for *Created, *Ready conditions
     _master_name = None
     _cluster_id = None
     _prometheus_connector = None
@@ -45,6 +50,12 @@ class ComponentRepository:
     __scheduled = False
     _once_validated = False
     _is_mc_provision_executed = False
+    _provision_graph = None  # ProvisionGraph for CEdge components, built in first provisioning
+    # {provision step: (checklist key, condition key)}; readiness of steps that other steps depend on
+    _provision_readiness = {
+        'GEdgeNamespace': ('GEdgeNamespaceCreated', 'GEdgeNamespaceCreated'),
+        'NfsServer': ('LocalNfsServerReady', 'LocalNfsServerConnected'),
+    }
 
     _component_status = {
         'GEdgeNamespace': {
@@ -378,6 +389,7 @@ class ComponentRepository:
         checklist = checklist.replace("{cluster_id}", _cluster_id)
         checklist = checklist.replace("{master_node}", _master_name)
         self._checklist = json.loads(checklist)
+        self._compiled_checklist = self._compile_checklist(self._checklist)
 
         ''' get service connector '''
         self._prometheus_connector = prometheus_client.Connector()
@@ -549,10 +561,15 @@ class ComponentRepository:
         if not obj:
             return False, 'Invalid key for \'condition\' param({})'.format(condition)
 
+        changed = obj.get_status() != Condition.bool_to_str(status)
+
         obj.set_status(Condition.bool_to_str(status))
         obj.set_message(error)
         obj.set_updated(DateFormatter.current_datetime())
 
+        if changed:
+            self._on_condition_changed(condition)
+
         return True, ''
 
     def _get_condition_object(self,
@@ -692,160 +709,198 @@ class ComponentRepository:
             self._set_condition(key, True, error)
             return
 
-    def _validate_gedge_components(self):
+    def _compile_checklist(self, checklist):
         """
-        validate CEdge components
-        :return:
+        compile resource checklist(*Created, *Ready conditions) to resource lookup keys
+        :param checklist: (dict) component checklist
+        :return: (list) [(condition key, [(kind, namespace, name)])]
         """
-        for key, value in self._checklist.items():
-            if key[-7:] == 'Created' or key[-5:] == 'Ready':
-                not_created_namespaces = []
-                not_created_services = []
-                not_created_daemonsets = []
-                not_ready_daemonsets = []
-                not_created_deployments = []
-                not_ready_deployments = []
-                not_created_pods = []
-                not_ready_pods = []
-                condition = self._get_condition_object(key)
-
-                for val in value:
-                    if 'kind' not in val:
-                        self._logger.error('key={}, val={}'.format(key, val))
-
-                    if val['kind'] == 'namespace':
-                        # check created
-                        # if not ResourceRepository().is_namespace_deployed(val['name']):
-                        ok, stdout, stderr = KubeCommand().is_namespace_deployed(val['name'])
-
-                        if not ok:
-                            not_created_namespaces.append(val['name'])
-                        continue
+        compiled = []
 
-                    if val['kind'] == 'service':
-                        # check created
-                        # if not ResourceRepository().is_service_deployed(val['namespace'], val['name']):
-                        ok, stdout, stderr = KubeCommand().is_service_deployed(val['namespace'], val['name'])
+        for key, value in checklist.items():
+            if key[-7:] != 'Created' and key[-5:] != 'Ready':
+                continue
 
-                        if not ok:
-                            not_created_services.append(val['name'])
+            items = []
+            for val in value:
+                if 'kind' not in val:
+                    self._logger.error('key={}, val={}'.format(key, val))
+                    continue
+                items.append((val['kind'], val.get('namespace'), val['name']))
 
-                        continue
+            compiled.append((key, items))
 
-                    if val['kind'] == 'deployment':
-                        # check created
-                        # if not ResourceRepository().is_deployment_deployed(val['namespace'], val['name']):
-                        ok, stdout, stderr = KubeCommand().is_deployment_deployed(val['namespace'], val['name'])
+        return compiled
 
-                        if not ok:
-                            not_created_deployments.append(val['name'])
+    def _get_checklist_items(self, key) -> list:
+        """
+        get resources in compiled checklist for key
+        :param key: (str) condition key for *Created, *Ready conditions
+        :return: (list) [(kind, namespace, name)]
+        """
+        for compiled_key, items in self._compiled_checklist:
+            if compiled_key == key:
+                return items
 
-                        # check ready
-                        # if not ResourceRepository().is_all_deployment_replicas_ready(val['namespace'],
-                        #                                                                   val['name']):
-                        ok = KubeCommand().is_all_deployment_replicas_ready(val['namespace'], val['name'])
+        return []
 
-                        if not ok:
-                            if val['name'] not in not_created_deployments:
-                                not_ready_deployments.append(val['name'])
+    _informer_kinds = {
+        'namespace': Kubernetes.NAMESPACE,
+        'service': Kubernetes.SERVICE,
+        'deployment': Kubernetes.DEPLOYMENT,
+        'daemonset': Kubernetes.DAEMONSET,
+        'pod': Kubernetes.POD,
+    }
 
-                        continue
+    @classmethod
+    def _is_cache_synced(cls, kind) -> bool:
+        """
+        whether resource cache for kind is synced by its informer, so a cache miss means not exist
+        :param kind: (str) 'namespace', 'service', 'deployment', 'daemonset', 'pod'
+        :return: (bool)
+        """
+        return kind in cls._informer_kinds and InformerFactory().has_synced(cls._informer_kinds[kind])
 
-                    if val['kind'] == 'daemonset':
-                        name = val['name']
+    @classmethod
+    def _is_resource_created(cls, kind, namespace, name) -> bool:
+        """
+        check whether resource is created with resource cache, and kubernetes api for cache miss before synced
+        :param kind: (str) 'namespace', 'service', 'deployment', 'daemonset', 'pod'
+        :param namespace: (str)
+        :param name: (str)
+        :return: (bool)
+        """
+        repository = ResourceRepository()
+        synced = cls._is_cache_synced(kind)
 
-                        if key == 'RemoteNfsClientReady':
-                            remote_cluster_id = NetworkStatusRepository().get_remote_mc_network_name()
+        if kind == 'namespace':
+            if repository.is_namespace_deployed(name):
+                return True
+            if synced:
+                return False
+            ok, _, _ = KubeCommand.is_namespace_deployed(name)
+        elif kind == 'service':
+            if repository.is_service_deployed(namespace, name):
+                return True
+            if synced:
+                return False
+            ok, _, _ = KubeCommand.is_service_deployed(namespace, name)
+        elif kind == 'deployment':
+            if repository.is_deployment_deployed(namespace, name):
+                return True
+            if synced:
+                return False
+            ok, _, _ = KubeCommand.is_deployment_deployed(namespace, name)
+        elif kind == 'daemonset':
+            if repository.is_daemonset_deployed(namespace, name):
+                return True
+            if synced:
+                return False
+            ok, _, _ = KubeCommand.is_daemonset_deployed(namespace, name)
+        elif kind == 'pod':
+            if repository.is_pod_deployed(namespace, name):
+                return True
+            if synced:
+                return False
+            ok, _, _ = KubeCommand.is_pod_deployed(namespace, name)
+        else:
+            return False
 
-                            if remote_cluster_id:
-                                name = val['name'].replace('{remote_cluster_id}', remote_cluster_id)
+        return ok
 
-                        # check created
-                        # if not ResourceRepository().is_daemonset_deployed(val['namespace'], name):
-                        ok, stdout, stderr = KubeCommand().is_daemonset_deployed(val['namespace'], name)
+    @classmethod
+    def _is_resource_ready(cls, kind, namespace, name) -> bool:
+        """
+        check whether resource is ready with resource cache, and kubernetes api for cache miss before synced
+        :param kind: (str) 'deployment', 'daemonset', 'pod'
+        :param namespace: (str)
+        :param name: (str)
+        :return: (bool)
+        """
+        repository = ResourceRepository()
+        if kind in ('deployment', 'daemonset', 'pod') and cls._is_cache_synced(kind):
+            if kind == 'deployment':
+                return repository.is_all_deployment_replicas_ready(namespace, name)
+            if kind == 'daemonset':
+                return repository.is_all_daemonset_replicas_ready(namespace, name)
+            return repository.is_pod_running(namespace, name)
+
+        if kind == 'deployment':
+            if repository.is_deployment_deployed(namespace, name):
+                return repository.is_all_deployment_replicas_ready(namespace, name)
+            ok, _, _ = KubeCommand.is_all_deployment_replicas_ready(namespace, name)
+        elif kind == 'daemonset':
+            if repository.is_daemonset_deployed(namespace, name):
+                return repository.is_all_daemonset_replicas_ready(namespace, name)
+            ok, _, _ = KubeCommand.is_all_daemonset_replicas_ready(namespace, name)
+        elif kind == 'pod':
+            if repository.is_pod_deployed(namespace, name):
+                return repository.is_pod_running(namespace, name)
+            result = KubeCommand.is_pod_running(namespace, name)
+            ok = result is not None and result[0]
+        else:
+            return True
 
-                        if not ok:
-                            not_created_daemonsets.append(name)
+        return ok
+
+    def _validate_gedge_components(self):
+        """
+        validate CEdge components with compiled checklist
+        resources are looked up in resource cache(ResourceRepository), and kubernetes api is called for cache miss
+        :return:
+        """
+        for key, items in self._compiled_checklist:
+            not_created = {
+                'namespace': [],
+                'service': [],
+                'daemonset': [],
+                'deployment': [],
+                'pod': [],
+            }
+            not_ready = {
+                'daemonset': [],
+                'deployment': [],
+                'pod': [],
+            }
+            condition = self._get_condition_object(key)
 
-                        # check ready
-                        # if not ResourceRepository().is_all_daemonset_replicas_ready(val['namespace'], name):
-                        ok, stdout, stderr = KubeCommand().is_all_daemonset_replicas_ready(val['namespace'], name)
+            for kind, namespace, name in items:
+                if kind not in not_created:
+                    continue
 
-                        if not ok:
-                            if name not in not_created_deployments:
-                                not_ready_daemonsets.append(name)
+                if kind == 'daemonset' and key == 'RemoteNfsClientReady':
+                    remote_cluster_id = NetworkStatusRepository().get_remote_mc_network_name()
 
-                        continue
+                    if remote_cluster_id:
+                        name = name.replace('{remote_cluster_id}', remote_cluster_id)
 
-                    if val['kind'] == 'pod':
-                        # check created
-                        # if not ResourceRepository().is_pod_deployed(val['namespace'], val['name']):
-                        ok, stdout, stderr = KubeCommand().is_pod_deployed(val['namespace'], val['name'])
+                # check created
+                if not self._is_resource_created(kind, namespace, name):
+                    not_created[kind].append(name)
+                    continue
 
-                        if not ok:
-                            not_created_pods.append(val['name'])
+                # check ready
+                if kind in not_ready and not self._is_resource_ready(kind, namespace, name):
+                    not_ready[kind].append(name)
 
-                        # check ready
-                        # if not ResourceRepository().is_pod_running(val['namespace'], val['name']):
-                        ok, stdout, stderr = KubeCommand().is_pod_running(val['namespace'], val['name'])
+            messages = []
 
-                        if not ok:
-                            if val['name'] not in not_created_pods:
-                                not_ready_pods.append(val['name'])
-                        continue
+            for kind in ('namespace', 'service', 'daemonset', 'deployment', 'pod'):
+                if len(not_created[kind]) > 0:
+                    messages.append('{} {} not created.'.format(','.join(not_created[kind]), kind))
 
-                fail_count = 0
-                messages = []
-
-                if len(not_created_namespaces) > 0:
-                    val = ','.join(not_created_namespaces)
-                    messages.append('{} namespace not created.'.format(val))
-                    fail_count += 1
-
-                if len(not_created_services) > 0:
-                    val = ','.join(not_created_services)
-                    messages.append('{} service not created.'.format(val))
-                    fail_count += 1
-
-                if len(not_created_daemonsets) > 0:
-                    val = ','.join(not_created_daemonsets)
-                    messages.append('{} daemonset not created.'.format(val))
-                    fail_count += 1
-
-                if len(not_ready_daemonsets) > 0:
-                    val = ','.join(not_ready_daemonsets)
-                    messages.append('{} daemonset not ready.'.format(val))
-                    fail_count += 1
-
-                if len(not_created_deployments) > 0:
-                    val = ','.join(not_created_deployments)
-                    messages.append('{} deployment not created.'.format(val))
-                    fail_count += 1
-
-                if len(not_ready_deployments) > 0:
-                    val = ','.join(not_created_namespaces)
-                    messages.append('{} deployment not ready.'.format(val))
-                    fail_count += 1
-
-                if len(not_created_pods) > 0:
-                    val = ','.join(not_created_pods)
-                    messages.append('{} pod not created.'.format(val))
-                    fail_count += 1
-
-                if len(not_ready_pods) > 0:
-                    val = ','.join(not_ready_pods)
-                    messages.append('{} pod not ready.'.format(val))
-                    fail_count += 1
-
-                # error check
-                if len(messages) > 0:
-                    if condition.get_message() == ExecutionStatus.CREATING.value:
-                        continue
+                if kind in not_ready and len(not_ready[kind]) > 0:
+                    messages.append('{} {} not ready.'.format(','.join(not_ready[kind]), kind))
 
-                    self._set_condition(key, False, ';'.join(messages))
+            # error check
+            if len(messages) > 0:
+                if condition.get_message() == ExecutionStatus.CREATING.value:
+                    continue
 
-                else:
-                    self._set_condition(key, True, '')
+                self._set_condition(key, False, ';'.join(messages))
+
+            else:
+                self._set_condition(key, True, '')
         return
 
     def _validate_local_prometheus_connection(self):
@@ -2316,7 +2371,6 @@ class ComponentRepository:
 
         # validate CEdge components such as nfs-server/client, prometheus, exporters
         # i.e., validate resource are daemonsets, deployments, pods, services
-        # todo: too slow
         self._validate_gedge_components()
 
         # validate CEdge services
@@ -2341,115 +2395,219 @@ class ComponentRepository:
             # validate whether remote nfs-server are connectable
             self._validate_remote_nfs_server_connection()
 
-    def _do_provision(self):
+    def _build_provision_graph(self) -> ProvisionGraph:
         """
-        provisioning CEdge components
-        :return:
+        build provisioning graph for CEdge components
+        - gedge namespace, prometheus, node-exporter, k8s-state-metric and submariner are independent
+        - nfs-server waits gedge namespace, local nfs-client waits nfs-server ready and connected
+        - multi-cluster network(nfs-server export, remote nfs-client) waits submariner only,
+          so multi-cluster state is corrected whatever local nfs state is
+        :return: (ProvisionGraph)
         """
-        # provision local gedge namespace
-        self._provision_gedge_namespace()
+        graph = ProvisionGraph(settings.NUMBER_OF_PROVISION_WORKERS, settings.PROVISION_READY_TIMEOUT)
+        graph.add_step('GEdgeNamespace', self._provision_gedge_namespace,
+                       ready=functools.partial(self._is_provision_step_ready, 'GEdgeNamespace'))
+        graph.add_step('PrometheusServer', self._provision_prometheus)
+        graph.add_step('NodeExporter', self._provision_node_exporter)
+        graph.add_step('K8sStateMetric', self._provision_k8s_state_metric)
+        graph.add_step('SubmarinerComponents', self._provision_submariner)
+        graph.add_step('NfsServer', self._provision_nfs_server,
+                       depends=['GEdgeNamespace'], ready=functools.partial(self._is_provision_step_ready, 'NfsServer'))
+        graph.add_step('NfsClient', self._provision_local_nfs_client, depends=['NfsServer'])
+        graph.add_step('MultiClusterNetwork', self._provision_multi_cluster_network, depends=['SubmarinerComponents'])
 
-        # provision local prometheus
-        self._provision_prometheus()
+        return graph
 
-        # provision local node exporter
-        self._provision_node_exporter()
+    def _on_resource_event(self, kind, event):
+        """
+        informer subscriber; wake up provisioning graph when a resource that a waited step needs is changed
+        :param kind: (str) 'namespace', 'service', 'deployment', 'daemonset', 'pod'
+        :param event: (dict) watch event
+        :return:
+        """
+        graph = self._provision_graph
 
-        # provision k8s-state-metric
-        self._provision_k8s_state_metric()
+        if graph is None:
+            return
 
-        # provision local nfs server
-        self._provision_nfs_server()
+        metadata = event['object'].metadata
+        resource = (kind, metadata.namespace, metadata.name)
 
-        # provision local nfs client
-        self._provision_local_nfs_client()
+        for step in graph.get_waited_steps():
+            if step not in self._provision_readiness:
+                continue
 
-        # provision multi cluster network
-        submariner_state = self._provision_submariner()
-        self._logger.debug('Submariner state[{}]'.format(submariner_state.value))
+            checklist_key, _ = self._provision_readiness[step]
 
-        if submariner_state == SubmarinerState.GATEWAY_CONNECTED:
-            # In case of no multi-cluster info(role, mc_config_state, mc_connect_id) in cluster table,
-            # correct invalid state
-            self._set_multi_cluster_to_connected()
+            if resource in self._get_checklist_items(checklist_key):
+                graph.notify()
+                return
+
+    def _on_condition_changed(self, key):
+        """
+        wake up provisioning graph when a condition that a waited step needs is changed
+        :param key: (str) condition key
+        :return:
+        """
+        graph = self._provision_graph
 
-            ok, is_provisioned, error_message = ClusterDAO.get_multi_cluster_provisioned()
+        if graph is None:
+            return
 
-            if not ok:
-                self._logger.error('Failed in ClusterDAO.get_multi_cluster_provisioned()')
+        for step in graph.get_waited_steps():
+            if step in self._provision_readiness and self._provision_readiness[step][1] == key:
+                graph.notify()
                 return
 
-            if is_provisioned:
-                # already multi-cluster network provisioned, pass
-                return
+    def _is_provision_step_ready(self, step) -> bool:
+        """
+        check whether resources of provision step are ready for dependent steps
+        it only reads resource cache and conditions(updated by validator), since it is called on every wake-up
+        :param step: (str) provision step name in _provision_readiness
+        :return: (bool)
+        """
+        checklist_key, condition_key = self._provision_readiness[step]
+        condition = self._get_condition_object(condition_key)
 
-            # get cluster role, local cluster id, remote cluster id
-            ok, cluster_object, error_message = ClusterDAO.get_cluster()
-            if not ok:
-                self._logger.error('Failed in ClusterDAO.get_cluster()')
-                return
+        if not condition or condition.get_status() != 'True':
+            return False
 
-            role = cluster_object.role
-            local_cluster_id = cluster_object.cluster_name
-            remote_cluster_id = cluster_object.remote_cluster_name
+        repository = ResourceRepository()
+
+        for kind, namespace, name in self._get_checklist_items(checklist_key):
+            if kind == 'namespace':
+                ready = repository.is_namespace_deployed(name)
+            elif kind == 'service':
+                ready = repository.is_service_deployed(namespace, name)
+            elif kind == 'deployment':
+                ready = repository.is_all_deployment_replicas_ready(namespace, name)
+            elif kind == 'daemonset':
+                ready = repository.is_all_daemonset_replicas_ready(namespace, name)
+            elif kind == 'pod':
+                ready = repository.is_pod_running(namespace, name)
+            else:
+                ready = True
 
-            if not self._is_mc_provision_executed:
-                self._is_mc_provision_executed = True
+            if not ready:
+                return False
 
-                """ provisioning multi-cluster network applications """
-                if role == MultiClusterRole.NONE.value or not role:
-                    self._logger.error('Not found cluster role in database')
-                    return
+        return True
 
-                if not local_cluster_id:
-                    self._logger.error('Not found local cluster name')
-                    return
+    def get_provision_timings(self) -> dict:
+        """
+        get per-step timings of the last provisioning round
+        :return: (dict) {step name: {'status', 'depends', 'waited', 'elapsed'}}; {} - not provisioned yet
+        """
+        if self._provision_graph is None:
+            return {}
 
-                if not remote_cluster_id:
-                    self._logger.debug('Not found remote cluster name')
-                    return
+        return self._provision_graph.get_timings()
 
-                # clean invalid remote nfs client
-                self._cleanup_invalid_remote_nfs_clients(local_cluster_id=local_cluster_id,
-                                                         remote_cluster_id=remote_cluster_id)
+    def _do_provision(self):
+        """
+        provisioning CEdge components
+        :return:
+        """
+        if self._provision_graph is None:
+            self._provision_graph = self._build_provision_graph()
 
-                # check whether REMOTE NFS client is exist.
-                # ex) daemonset.apps/nfs-client-gedge-cls2
-                remote_nfs_client_daemonset = 'nfs-client-' + remote_cluster_id
-                remote_nfs_client_ns = 'gedge'
-                ok, _, error = KubeCommand().is_daemonset_deployed(
-                    namespace=remote_nfs_client_ns, daemonset=remote_nfs_client_daemonset)
+            for kind, target in self._informer_kinds.items():
+                InformerFactory().get_informer(target).subscribe(functools.partial(self._on_resource_event, kind))
 
-                if ok:
-                    ok, _, error = KubeCommand().delete_daemonset(
-                        namespace=remote_nfs_client_ns, daemonset=remote_nfs_client_daemonset)
+        self._provision_graph.run()
 
-                    if not ok:
-                        error_message = 'Failed to delete remote nfs client daemonset, caused by ' + error
-                        self._logger.error(error_message)
-                        return
+    def _provision_multi_cluster_network(self):
+        """
+        provision multi-cluster network applications(nfs-server export, remote nfs-client)
+        :return:
+        """
+        submariner_state = self._submariner_state
+        self._logger.debug('Submariner state[{}]'.format(submariner_state.value))
+
+        if submariner_state != SubmarinerState.GATEWAY_CONNECTED:
+            return
 
-                # provision remote NFS client
-                if role == MultiClusterRole.LOCAL.value:
-                    # check nfs-server is exported
-                    if not self._unexport_local_nfs_server():
-                        return
-                    if not self._export_local_nfs_server():
-                        return
+        # In case of no multi-cluster info(role, mc_config_state, mc_connect_id) in cluster table,
+        # correct invalid state
+        self._set_multi_cluster_to_connected()
 
-            # remote cluster role
-            # self._unexport_local_nfs_server()
-            if role == MultiClusterRole.REMOTE.value:
-                ok, error_message = self._provision_remote_nfs_client()
+        ok, is_provisioned, error_message = ClusterDAO.get_multi_cluster_provisioned()
+
+        if not ok:
+            self._logger.error('Failed in ClusterDAO.get_multi_cluster_provisioned()')
+            return
+
+        if is_provisioned:
+            # already multi-cluster network provisioned, pass
+            return
+
+        # get cluster role, local cluster id, remote cluster id
+        ok, cluster_object, error_message = ClusterDAO.get_cluster()
+        if not ok:
+            self._logger.error('Failed in ClusterDAO.get_cluster()')
+            return
+
+        role = cluster_object.role
+        local_cluster_id = cluster_object.cluster_name
+        remote_cluster_id = cluster_object.remote_cluster_name
+
+        if not self._is_mc_provision_executed:
+            self._is_mc_provision_executed = True
+
+            """ provisioning multi-cluster network applications """
+            if role == MultiClusterRole.NONE.value or not role:
+                self._logger.error('Not found cluster role in database')
+                return
+
+            if not local_cluster_id:
+                self._logger.error('Not found local cluster name')
+                return
+
+            if not remote_cluster_id:
+                self._logger.debug('Not found remote cluster name')
+                return
+
+            # clean invalid remote nfs client
+            self._cleanup_invalid_remote_nfs_clients(local_cluster_id=local_cluster_id,
+                                                     remote_cluster_id=remote_cluster_id)
+
+            # check whether REMOTE NFS client is exist.
+            # ex) daemonset.apps/nfs-client-gedge-cls2
+            remote_nfs_client_daemonset = 'nfs-client-' + remote_cluster_id
+            remote_nfs_client_ns = 'gedge'
+            ok, _, error = KubeCommand().is_daemonset_deployed(
+                namespace=remote_nfs_client_ns, daemonset=remote_nfs_client_daemonset)
+
+            if ok:
+                ok, _, error = KubeCommand().delete_daemonset(
+                    namespace=remote_nfs_client_ns, daemonset=remote_nfs_client_daemonset)
 
                 if not ok:
-                    self._logger.debug(error_message)
+                    error_message = 'Failed to delete remote nfs client daemonset, caused by ' + error
+                    self._logger.error(error_message)
                     return
 
-            # set Cluster table with is_mc_provisioned=True
-            ok, error_message = ClusterDAO.set_multi_cluster_provisioned()
+            # provision remote NFS client
+            if role == MultiClusterRole.LOCAL.value:
+                # check nfs-server is exported
+                if not self._unexport_local_nfs_server():
+                    return
+                if not self._export_local_nfs_server():
+                    return
+
+        # remote cluster role
+        # self._unexport_local_nfs_server()
+        if role == MultiClusterRole.REMOTE.value:
+            ok, error_message = self._provision_remote_nfs_client()
+
             if not ok:
-                self._logger.error('Failed in ClusterDAO.set_multi_cluster_provisioned(), caused by ' + error_message)
+                self._logger.debug(error_message)
+                return
+
+        # set Cluster table with is_mc_provisioned=True
+        ok, error_message = ClusterDAO.set_multi_cluster_provisioned()
+        if not ok:
+            self._logger.error('Failed in ClusterDAO.set_multi_cluster_provisioned(), caused by ' + error_message)
 
     def is_submariner_broker_ready(self) -> bool:
         """
@@ -1,17 +1,30 @@
+import copy
+import threading
+
+from gw_agent import settings
 from gw_agent.settings import get_logger
 from repository.model.metric.cpu import CPUMetric
 from repository.model.metric.memory import MemoryMetric
 from repository.model.metric.multi_cluster import MultiClusterMetric
 from repository.model.metric.network import NetworkMetric
 from repository.model.metric.node import NodeMetric
+from repository.model.metric.series import TimeSeries, RollupTier
 
 
 class MetricRepository(object):
     """
     Cluster Metric management class
+    - node metrics are indexed by node name; node metric list is replaced(copy-on-write) on add or delete,
+      so a list got from get_nodes() is safe to iterate while nodes are added or deleted
+    - every time-series is rolled up to METRIC_ROLLUP_TIERS(i.e., 1m, 5m; min, max, avg, last),
+      and get_updates() returns only points newer than the last call for each consumer and tier
     """
     _logger = None
     _nodes = []
+    _node_map = {}  # {node name: NodeMetric}
+    _rollup_lock = threading.Lock()
+    _rollups = {}   # {series path: {tier name: RollupTier}}
+    _cursors = {}   # {(consumer, tier name, series path): (float) last timestamp sent}
     _mc_network = None
 
     def __new__(cls, *args, **kwargs):
@@ -27,8 +40,13 @@ class MetricRepository(object):
         :return:
         """
         self._nodes = []
+        self._node_map = {}
         self._mc_network.delete_all_endpoints()
 
+        with self._rollup_lock:
+            self._rollups.clear()
+            self._cursors.clear()
+
     def _find_node_index(self, name:str):
         """
         find node index for name
@@ -58,7 +76,8 @@ class MetricRepository(object):
         index = self._find_node_index(obj.name)
 
         if index < 0:
-            self._nodes.append(obj)
+            self._nodes = self._nodes + [obj]
+            self._node_map[obj.name] = obj
         else:
             self._nodes[index].cpu_metric = obj.cpu_metric
             self._nodes[index].mem_metric = obj.mem_metric
@@ -67,13 +86,14 @@ class MetricRepository(object):
     def set_node(self, name:str):
         """
         add node metric
-        :return: (NodeMetric)
+        :return: (NodeMetric) added or existing node metric
         """
-        index = self._find_node_index(name)
-        node = NodeMetric(name=name)
+        node = self._node_map.get(name)
 
-        if index < 0:
-            self._nodes.append(node)
+        if node is None:
+            node = NodeMetric(name=name)
+            self._nodes = self._nodes + [node]
+            self._node_map[name] = node
 
         return node
 
@@ -83,10 +103,11 @@ class MetricRepository(object):
         :param name: (str) node name
         :return:
         """
-        index = self._find_node_index(name)
+        node = self._node_map.pop(name, None)
 
-        if index > 0:
-            del self._nodes[index]
+        if node is not None:
+            self._nodes = [item for item in self._nodes if item is not node]
+            self._prune_series(self._get_root_path(node))
 
     def get_nodes(self):
         """
@@ -101,11 +122,7 @@ class MetricRepository(object):
         :param name: (str) node name
         :return: (NodeMetric); None - not exist
         """
-        index = self._find_node_index(name)
-        if index < 0:
-            return None
-
-        return self._nodes[index]
+        return self._node_map.get(name)
 
     def set_node_cpu_metric(self, name:str, obj:CPUMetric):
         """
@@ -158,6 +175,9 @@ class MetricRepository(object):
         delete mc network metric
         :return:
         """
+        if self._mc_network is not None:
+            self._prune_series(self._get_root_path(self._mc_network))
+
         self._mc_network = None
 
     def delete_endpoint(self, name:str):
@@ -167,6 +187,20 @@ class MetricRepository(object):
         :return:
         """
         self._mc_network.delete_endpoint(name)
+        self._prune_series(self._get_root_path(self._mc_network) + ('endpoints', name))
+
+    def retain_endpoints(self, names):
+        """
+        delete endpoints except names(i.e., endpoints removed from multi-cluster network)
+        :param names: (set[str]) endpoint network names(cluster_id) to keep
+        :return:
+        """
+        if self._mc_network is None or not self._mc_network.endpoints:
+            return
+
+        for endpoint in list(self._mc_network.endpoints):
+            if endpoint.get_name() not in names:
+                self.delete_endpoint(endpoint.get_name())
 
     def set_mc_network_latency(self, name:str, latency:float, timestamp:float):
         """
@@ -178,6 +212,16 @@ class MetricRepository(object):
         """
         self._mc_network.set_endpoint_latency(name=name, latency=latency, timestamp=timestamp)
 
+    def set_mc_network_latency_percentiles(self, name: str, percentiles: dict, timestamp: float):
+        """
+        set multi cluster latency percentiles
+        :param name: (str) endpoint network name(cluster_id)
+        :param percentiles: (dict) {50: (float) ms, 90: (float) ms, 99: (float) ms}
+        :param timestamp: (float) time.time()
+        :return:
+        """
+        self._mc_network.set_endpoint_latency_percentiles(name=name, percentiles=percentiles, timestamp=timestamp)
+
     def set_mc_network_tx_byte(self, name:str, tx_byte:int, timestamp:float):
         """
         set multi cluster TX byte
@@ -197,3 +241,175 @@ class MetricRepository(object):
         :return:
         """
         self._mc_network.set_endpoint_rx_byte(name=name, rx_byte=rx_byte, timestamp=timestamp)
+
+    @classmethod
+    def _walk_series(cls, obj, path):
+        """
+        walk time-series attributes in metric model
+        :param obj: (object) metric model, i.e., NodeMetric, MultiClusterMetric
+        :param path: (tuple) path of obj
+        :return: (generator) ((tuple) series path, owner object, (str) attribute name, series)
+        series is TimeSeries in repository, or list of points in object from get_updates()
+        """
+        for attr in type(obj).fields.keys():
+            value = getattr(obj, attr, None)
+
+            if isinstance(value, TimeSeries):
+                yield path + (attr,), obj, attr, value
+
+            elif isinstance(value, list):
+                if value and hasattr(type(value[0]), 'fields'):
+                    for item in value:
+                        yield from cls._walk_series(item, path + (attr, item.get_name()))
+                else:
+                    yield path + (attr,), obj, attr, value
+
+            elif value is not None and hasattr(type(value), 'fields'):
+                yield from cls._walk_series(value, path + (attr,))
+
+    @staticmethod
+    def _get_root_path(obj) -> tuple:
+        """
+        get series path of metric model
+        :param obj: (object) metric model
+        :return: (tuple) (kind, name)
+        """
+        return obj.get_kind(), getattr(obj, 'name', None)
+
+    @staticmethod
+    def _clone(obj):
+        """
+        copy metric model structure(models are copied, series are shared)
+        :param obj: (object) metric model
+        :return: (object)
+        """
+        clone = copy.copy(obj)
+
+        for attr in type(obj).fields.keys():
+            value = getattr(obj, attr, None)
+
+            if isinstance(value, list) and value and hasattr(type(value[0]), 'fields'):
+                setattr(clone, attr, [MetricRepository._clone(item) for item in value])
+            elif value is not None and not isinstance(value, TimeSeries) and hasattr(type(value), 'fields'):
+                setattr(clone, attr, MetricRepository._clone(value))
+
+        return clone
+
+    def _prune_series(self, prefix: tuple):
+        """
+        drop rollups and cursors of series under prefix(i.e., deleted node or endpoint)
+        :param prefix: (tuple) series path prefix
+        :return:
+        """
+        size = len(prefix)
+
+        with self._rollup_lock:
+            for path in [path for path in self._rollups.keys() if path[:size] == prefix]:
+                del self._rollups[path]
+
+            for key in [key for key in self._cursors.keys() if key[2][:size] == prefix]:
+                del self._cursors[key]
+
+    def rollup(self, obj):
+        """
+        roll up samples added to time-series of metric model since the last rollup
+        :param obj: (object) metric model, i.e., NodeMetric, MultiClusterMetric
+        :return:
+        """
+        with self._rollup_lock:
+            for path, _, _, series in self._walk_series(obj, self._get_root_path(obj)):
+                if not isinstance(series, TimeSeries):
+                    continue
+
+                tiers = self._rollups.get(path)
+                if tiers is None:
+                    tiers = {name: RollupTier(interval, capacity)
+                             for name, (interval, capacity) in settings.METRIC_ROLLUP_TIERS.items()}
+                    self._rollups[path] = tiers
+
+                for tier in tiers.values():
+                    last = tier.last_timestamp()
+                    tier.extend(series.to_list() if last is None else series.since(last))
+
+    def get_updates(self, obj, consumer: str, tier: str = 'raw'):
+        """
+        get metric model with only points newer than the last call for consumer and tier
+        :param obj: (object) metric model, i.e., NodeMetric, MultiClusterMetric
+        :param consumer: (str) consumer name, i.e., 'center'
+        :param tier: (str) 'raw'(samples: [timestamp, value]) or
+        a tier in METRIC_ROLLUP_TIERS(closed buckets: [start, min, max, avg, last])
+        :return: (object) copy of obj, series are list of points; None - no new point
+        """
+        if tier != 'raw' and tier not in settings.METRIC_ROLLUP_TIERS:
+            raise ValueError('Invalid tier({})'.format(tier))
+
+        updates = self._clone(obj)
+        updated = False
+
+        with self._rollup_lock:
+            for path, owner, attr, series in self._walk_series(updates, self._get_root_path(obj)):
+                cursor_key = (consumer, tier, path)
+                cursor = self._cursors.get(cursor_key)
+
+                if tier == 'raw':
+                    if not isinstance(series, TimeSeries):
+                        continue
+                    points = series.to_list() if cursor is None else series.since(cursor)
+                else:
+                    if path not in self._rollups:
+                        setattr(owner, attr, [])
+                        continue
+                    points = self._rollups[path][tier].since(cursor)
+
+                setattr(owner, attr, points)
+                if points:
+                    self._cursors[cursor_key] = points[-1][0]
+                    updated = True
+
+        return updates if updated else None
+
+    @classmethod
+    def merge_updates(cls, older, newer):
+        """
+        merge points of older updates into newer updates(for same metric model from get_updates())
+        series and models(i.e., endpoints) only in older are carried over to newer, not to lose points
+        :param older: (object) metric model from get_updates()
+        :param newer: (object) metric model from get_updates()
+        :return: (object) newer
+        """
+        for attr in type(newer).fields.keys():
+            previous = getattr(older, attr, None)
+            value = getattr(newer, attr, None)
+
+            if isinstance(previous, list) and previous and hasattr(type(previous[0]), 'fields'):
+                # list of models, matched by name
+                items = {item.get_name(): item for item in value or []}
+                merged = list(value or [])
+
+                for item in previous:
+                    if item.get_name() in items:
+                        cls.merge_updates(item, items[item.get_name()])
+                    else:
+                        merged.append(item)
+
+                setattr(newer, attr, merged)
+
+            elif isinstance(previous, list):
+                # series points
+                if not previous:
+                    continue
+
+                if not isinstance(value, list):
+                    setattr(newer, attr, previous)
+                    continue
+
+                last = previous[-1][0]
+                setattr(newer, attr, previous + [point for point in value if point[0] > last])
+
+            elif previous is not None and hasattr(type(previous), 'fields'):
+                if value is None:
+                    setattr(newer, attr, previous)
+                else:
+                    cls.merge_updates(previous, value)
+
+        return newer
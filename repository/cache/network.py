@@ -437,6 +437,14 @@ class NetworkStatusRepository:
         """
         return self._mc_network_service
 
+    def reset_mc_network_services(self):
+        """
+        reset multi cluster service exports, imports; next synchronization reports all of them as added
+        :return:
+        """
+        self._mc_network_service.set_service_exports([])
+        self._mc_network_service.set_service_imports([])
+
     def set_mc_network_service_exports(self, val: List[ServiceExport]):
         """
         synchronize multi cluster service exports
@@ -452,6 +460,22 @@ class NetworkStatusRepository:
         """
         return self._mc_network_service.get_service_exports()
 
+    def synchronize_mc_network_service_exports(self, val: List[ServiceExport]) -> list:
+        """
+        synchronize multi cluster service exports, and get changes
+        :param val: (list(ServiceExport))
+        :return: (list(dict)) event objects; empty - not changed
+        """
+        return self._mc_network_service.synchronize_service_exports(val)
+
+    def synchronize_mc_network_service_imports(self, val: List[ServiceImport]) -> list:
+        """
+        synchronize multi cluster service imports, and get changes
+        :param val: (list(ServiceImport))
+        :return: (list(dict)) event objects; empty - not changed
+        """
+        return self._mc_network_service.synchronize_service_imports(val)
+
     def get_mc_network_service_imports(self) -> List[ServiceImport]:
         """
         get multi cluster service exports
@@ -474,13 +498,7 @@ class NetworkStatusRepository:
         :param name: (str) service name
         :return:
         """
-        exports = self.get_mc_network_service_exports()
-
-        for item in exports:
-            if item.get_name() == name and item.get_namespace() == namespace:
-                return True
-
-        return False
+        return self._mc_network_service.is_service_exported(namespace, name)
 
     def is_service_imported(self, namespace: str, name: str) -> bool:
         """
@@ -489,14 +507,7 @@ class NetworkStatusRepository:
         :param name: (str) service name
         :return:
         """
-
-        imports = self.get_mc_network_service_imports()
-
-        for item in imports:
-            if item.get_name() == name and item.get_namespace() == namespace:
-                return True
-
-        return False
+        return self._mc_network_service.is_service_imported(namespace, name)
 
     def get_imported_service(self, namespace, name) -> ServiceImport:
         """
@@ -505,10 +516,4 @@ class NetworkStatusRepository:
         :param name: (str) name
         :return: (ServiceImport)
         """
-        imports = self.get_mc_network_service_imports()
-
-        for item in imports:
-            if item.get_name() == name and item.get_namespace() == namespace:
-                return item
-
-        return None
+        return self._mc_network_service.get_service_import(namespace, name)
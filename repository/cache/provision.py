@@ -0,0 +1,234 @@
+"""
+    desc: dependency-aware provisioning graph for CEdge components
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gw_agent.common.error import get_exception_traceback
+from gw_agent.settings import get_logger
+from repository.common.type import ExecutionStatus
+
+
+class ProvisionStep:
+    """
+    a node of provisioning graph
+    """
+    def __init__(self, name, callback, depends=None, ready=None):
+        """
+        ProvisionStep()
+        :param name: (str) step name
+        :param callback: (callable) provisioning method; callback()
+        :param depends: (list[str]) names of steps that must be completed and ready before this step
+        :param ready: (callable) ready() -> bool; whether provisioned resources are ready for dependent steps.
+            None - ready when callback is completed
+        """
+        self.name = name
+        self.callback = callback
+        self.depends = depends or []
+        self.ready = ready
+        self.status = ExecutionStatus.PENDING
+        self.waited = 0.0   # seconds waited for dependencies
+        self.elapsed = 0.0  # seconds taken by callback
+
+    def reset(self):
+        """
+        reset step for a new provisioning round
+        :return:
+        """
+        self.status = ExecutionStatus.PENDING
+        self.waited = 0.0
+        self.elapsed = 0.0
+
+    def to_dict(self) -> dict:
+        """
+        get step timing
+        :return: (dict) {'status', 'depends', 'waited', 'elapsed'}
+        """
+        return {
+            'status': self.status.value,
+            'depends': list(self.depends),
+            'waited': round(self.waited, 3),
+            'elapsed': round(self.elapsed, 3),
+        }
+
+
+class ProvisionGraph:
+    """
+    run provisioning steps as a DAG
+    - steps whose dependencies are completed and ready run concurrently in a bounded worker pool
+    - dependency readiness is re-evaluated when notify() is called(i.e., by resource watch events
+      for resources that waited steps need) or a step is completed, not by polling
+    - ready callables must be pure reads(resource cache, conditions), since they are re-evaluated on every wake-up
+    - steps whose dependencies are not ready until ready_timeout stay PENDING,
+      and are retried in the next round
+    """
+    def __init__(self, max_workers, ready_timeout):
+        """
+        ProvisionGraph()
+        :param max_workers: (int) number of concurrent steps
+        :param ready_timeout: (int) seconds to wait for dependencies ready in a round
+        """
+        self._logger = get_logger(__name__)
+        self._steps = {}  # {name: ProvisionStep}, in insertion(topological) order
+        self._waited = frozenset()  # names of completed steps whose readiness is waited by dependent steps
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._ready_timeout = ready_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='provisioner')
+
+    def add_step(self, name, callback, depends=None, ready=None):
+        """
+        add provisioning step; dependencies must be added before, so the graph is always acyclic
+        :param name: (str) step name
+        :param callback: (callable) provisioning method
+        :param depends: (list[str]) names of dependency steps
+        :param ready: (callable) readiness check for dependent steps
+        :return:
+        """
+        if name in self._steps:
+            raise ValueError('Duplicated provision step({})'.format(name))
+
+        for depend in depends or []:
+            if depend not in self._steps:
+                raise ValueError('Not found dependency({}) for provision step({})'.format(depend, name))
+
+        self._steps[name] = ProvisionStep(name, callback, depends, ready)
+
+    def notify(self):
+        """
+        wake up the graph to re-evaluate dependency readiness; it does not block
+        :return:
+        """
+        self._changed.set()
+
+    def get_waited_steps(self) -> frozenset:
+        """
+        get completed steps whose readiness is waited by dependent steps in current round
+        :return: (frozenset[str]) step names; empty - not waiting
+        """
+        return self._waited
+
+    def get_timings(self) -> dict:
+        """
+        get step timings of the last round
+        :return: (dict) {step name: {'status', 'depends', 'waited', 'elapsed'}}
+        """
+        with self._lock:
+            return {name: step.to_dict() for name, step in self._steps.items()}
+
+    def _is_ready(self, step, cache) -> bool:
+        """
+        check whether step is completed and its resources are ready
+        :param step: (ProvisionStep)
+        :param cache: (dict) {step name: bool}; readiness evaluated in current wake-up
+        :return: (bool)
+        """
+        if step.status != ExecutionStatus.SUCCEEDED:
+            return False
+
+        if step.ready is None:
+            return True
+
+        if step.name not in cache:
+            try:
+                cache[step.name] = bool(step.ready())
+            except Exception as exc:
+                self._logger.error('Failed to check {} ready, caused by {}'.format(
+                    step.name, get_exception_traceback(exc)))
+                cache[step.name] = False
+
+        return cache[step.name]
+
+    def _execute(self, step):
+        """
+        run step callback in worker
+        :param step: (ProvisionStep)
+        :return:
+        """
+        started = time.time()
+        status = ExecutionStatus.SUCCEEDED
+
+        try:
+            step.callback()
+        except Exception as exc:
+            self._logger.error('Failed in provision step({}), caused by {}'.format(
+                step.name, get_exception_traceback(exc)))
+            status = ExecutionStatus.FAILED
+
+        with self._lock:
+            step.elapsed = time.time() - started
+            step.status = status
+
+        self._changed.set()
+
+    def run(self) -> dict:
+        """
+        run a provisioning round, and wait until all launched steps are completed
+        :return: (dict) step timings; see get_timings()
+        """
+        started = time.time()
+        deadline = started + self._ready_timeout
+
+        with self._lock:
+            for step in self._steps.values():
+                step.reset()
+
+        while True:
+            self._changed.clear()
+            cache = {}
+            waiting = False
+            running = False
+            waited = set()
+
+            with self._lock:
+                steps = list(self._steps.values())
+
+            for step in steps:
+                if step.status == ExecutionStatus.RUNNING:
+                    running = True
+                    continue
+
+                if step.status != ExecutionStatus.PENDING:
+                    continue
+
+                depends = [self._steps[depend] for depend in step.depends]
+
+                # dependency is failed or will not be launched in this round
+                if any(depend.status == ExecutionStatus.FAILED for depend in depends):
+                    continue
+
+                if not all(self._is_ready(depend, cache) for depend in depends):
+                    if time.time() < deadline:
+                        waiting = True
+                        waited.update(depend.name for depend in depends
+                                      if depend.status == ExecutionStatus.SUCCEEDED and
+                                      not self._is_ready(depend, cache))
+                    continue
+
+                with self._lock:
+                    step.status = ExecutionStatus.RUNNING
+                    step.waited = time.time() - started
+                running = True
+                self._executor.submit(self._execute, step)
+
+            self._waited = frozenset(waited)
+
+            if not running and not waiting:
+                break
+
+            if not running:
+                # only waiting for dependencies ready
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                self._changed.wait(timeout)
+            else:
+                self._changed.wait()
+
+        self._waited = frozenset()
+        timings = self.get_timings()
+        self._logger.debug('Provisioning round is completed in {:.3f}s, steps={}'.format(
+            time.time() - started, timings))
+
+        return timings
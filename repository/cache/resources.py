@@ -1,10 +1,18 @@
+import copy
+import threading
+import time
+from collections import deque, OrderedDict
+from types import MappingProxyType
 from typing import List
 
+from gw_agent import settings
 from gw_agent.settings import get_logger
 from cluster.command.localhost import LocalHostCommand
 from repository.common.k8s_client import Connector
+from cluster.common.type import Event
 from repository.common.type import Kubernetes, ActiveStatus, PodStatus
 from repository.model.k8s.condition import Condition
+from repository.model.k8s.container_status import ContainerStatus
 from repository.model.k8s.daemonset import DaemonSet
 from repository.model.k8s.deployment import Deployment
 from repository.model.k8s.namespace import Namespace
@@ -18,16 +26,41 @@ from utils.dateformat import DateFormatter
 class ResourceRepository(object):
     """
     Kubernetes resource management class
+    - resources are cached in dict for each kind, key: (namespace, name)
+      namespace is None for cluster scoped resources(Node, Namespace)
+    - secondary indexes: namespace(all namespaced kinds), node(Pod), label(Pod)
+    - readers get immutable snapshots(tuple for each kind) published per generation;
+      a write bumps generation and only the written kind is copied again on next read,
+      so list reads are lock-free and consistent across kinds while watches keep writing
+    - generation is also the change sequence; every write is recorded in a bounded change log
+      to send only changes since the sequence acknowledged by center(delta-sync)
     """
     _logger = None
     _connector = None
     _cluster_id = None
-    _nodes = []
-    _daemonsets = []
-    _deployments = []
-    _namespaces = []
-    _pods = []
-    _services = []
+    _lock = threading.RLock()
+    _nodes = {}
+    _daemonsets = {}
+    _deployments = {}
+    _namespaces = {}
+    _pods = {}
+    _services = {}
+
+    # secondary indexes
+    _namespace_index = {}   # {Kubernetes(Enum): {namespace: set((namespace, name))}}
+    _pod_label_index = {}   # {'key=value': set((namespace, name))}
+
+    # published snapshot
+    # generation(change sequence) starts from current time in microseconds,
+    # so sequences of the previous agent process are older than change log
+    _generation = int(time.time() * 1000000)
+    _snapshot = None        # (generation, {Kubernetes(Enum): (tuple) resources}); None - stale
+    _snapshot_views = {}    # last published views
+    _dirty_kinds = set()    # kinds written after last published snapshot
+
+    # change log
+    _change_log = deque(maxlen=settings.RESOURCE_CHANGE_LOG_SIZE)  # (sequence, Event, kind, key, resource)
+    _change_log_floor = _generation     # changes after this sequence are in change log
 
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "_instance"):
@@ -42,12 +75,16 @@ class ResourceRepository(object):
         clear entire cache
         :return:
         """
-        self._nodes.clear()
-        self._daemonsets.clear()
-        self._deployments.clear()
-        self._namespaces.clear()
-        self._pods.clear()
-        self._services.clear()
+        with self._lock:
+            for resources in self._get_resource_maps().values():
+                resources.clear()
+
+            self._namespace_index.clear()
+            self._pod_label_index.clear()
+            self._invalidate_snapshot(*self._get_resource_maps().keys())
+
+            self._change_log.clear()
+            self._change_log_floor = self._generation
 
     def set_cluster_id(self, cluster_id):
         """
@@ -64,112 +101,275 @@ class ResourceRepository(object):
         """
         return self._cluster_id
 
+    def _get_resource_maps(self) -> dict:
+        """
+        get resource cache for each kind
+        :return: (dict) key: Kubernetes(Enum), value: (dict) resource map
+        """
+        return {
+            Kubernetes.NODE: self._nodes,
+            Kubernetes.NAMESPACE: self._namespaces,
+            Kubernetes.POD: self._pods,
+            Kubernetes.DEPLOYMENT: self._deployments,
+            Kubernetes.DAEMONSET: self._daemonsets,
+            Kubernetes.SERVICE: self._services,
+        }
+
+    def _invalidate_snapshot(self, *kinds):
+        """
+        mark kinds as written; must be called with _lock held
+        :param kinds: (Kubernetes(Enum))
+        :return:
+        """
+        self._generation += 1
+        self._dirty_kinds.update(kinds)
+        self._snapshot = None
+
+    def get_snapshot(self) -> (int, MappingProxyType):
+        """
+        get immutable point-in-time view of all kinds
+        :return: (int) generation, (MappingProxyType) {Kubernetes(Enum): (tuple) resources}
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None:
+                published = self._snapshot_views
+                views = {}
+
+                for kind, resources in self._get_resource_maps().items():
+                    if kind in self._dirty_kinds or kind not in published:
+                        views[kind] = tuple(resources.values())
+                    else:
+                        views[kind] = published[kind]   # not written, reuse published tuple
+
+                self._dirty_kinds.clear()
+                self._snapshot_views = views
+                self._snapshot = (self._generation, MappingProxyType(views))
+
+            return self._snapshot
+
+    def get_generation(self) -> int:
+        """
+        get cache generation(change sequence); increased whenever any resource is written
+        :return: (int)
+        """
+        return self._generation
+
+    def _log_change(self, event_type, kind, key, resource) -> int:
+        """
+        record change of resource; must be called with _lock held after _invalidate_snapshot()
+        :param event_type: (Event) ADDED, MODIFIED or DELETED
+        :param kind: (Kubernetes(Enum))
+        :param key: (tuple) (namespace, name)
+        :param resource: (object) written or deleted resource
+        :return: (int) change sequence
+        """
+        sequence = self._generation
+
+        if len(self._change_log) == self._change_log.maxlen:
+            # the oldest change is evicted
+            self._change_log_floor = self._change_log[0][0]
+
+        self._change_log.append((sequence, event_type, kind, key, resource))
+
+        return sequence
+
+    def get_changes_since(self, sequence):
+        """
+        get compacted changes after sequence(the latest change for each resource)
+        - ADDED followed by MODIFIED is ADDED, ADDED followed by DELETED is omitted
+        :param sequence: (int) last sequence acknowledged by center
+        :return: (int) current sequence, (list) [((int) sequence, (Event), (Kubernetes(Enum)), resource),];
+        None for list if change log has been truncated after sequence(full resync is required)
+        """
+        with self._lock:
+            current = self._generation
+
+            if type(sequence) != int or sequence < self._change_log_floor or sequence > current:
+                return current, None
+
+            changes = OrderedDict()  # {(kind, key): (sequence, Event, kind, resource)}
+
+            for change_sequence, event_type, kind, key, resource in self._change_log:
+                if change_sequence <= sequence:
+                    continue
+
+                previous = changes.pop((kind, key), None)
+
+                if previous is not None and previous[1] == Event.ADDED:
+                    if event_type == Event.DELETED:
+                        continue
+                    event_type = Event.ADDED
+
+                elif previous is not None and previous[1] == Event.DELETED and event_type == Event.ADDED:
+                    event_type = Event.MODIFIED
+
+                changes[(kind, key)] = (change_sequence, event_type, kind, resource)
+
+        return current, list(changes.values())
+
+    @staticmethod
+    def _get_key(resource) -> tuple:
+        """
+        get cache key for resource
+        :param resource: (object) Node or Namespace or Pod or Service or Deployment or Daemonset
+        :return: (tuple) (namespace, name)
+        """
+        return getattr(resource, 'namespace', None), resource.name
+
+    @staticmethod
+    def _add_to_index(index: dict, value, key: tuple):
+        """ add key to index[value] """
+        if value not in index:
+            index[value] = set()
+        index[value].add(key)
+
+    @staticmethod
+    def _remove_from_index(index: dict, value, key: tuple):
+        """ remove key from index[value] """
+        if value not in index:
+            return
+        index[value].discard(key)
+        if len(index[value]) == 0:
+            del index[value]
+
+    def _index(self, kind, resource):
+        """
+        add resource to secondary indexes
+        :param kind: (Kubernetes(Enum))
+        :param resource: (object)
+        :return:
+        """
+        key = self._get_key(resource)
+
+        if key[0] is not None:
+            if kind not in self._namespace_index:
+                self._namespace_index[kind] = {}
+            self._add_to_index(self._namespace_index[kind], key[0], key)
+
+        if kind == Kubernetes.POD:
+            for label in resource.get_labels():
+                self._add_to_index(self._pod_label_index, label, key)
+
+    def _unindex(self, kind, resource):
+        """
+        remove resource from secondary indexes
+        :param kind: (Kubernetes(Enum))
+        :param resource: (object)
+        :return:
+        """
+        key = self._get_key(resource)
+
+        if key[0] is not None and kind in self._namespace_index:
+            self._remove_from_index(self._namespace_index[kind], key[0], key)
+
+        if kind == Kubernetes.POD:
+            for label in resource.get_labels():
+                self._remove_from_index(self._pod_label_index, label, key)
+
     def create_or_update(self, resource):
         """
         create or update resource
         :param resource: (object) Node or Namespace or Pod or Service or Deployment or Daemonset
-        :return:
+        :return: (int) change sequence
         """
-        if type(resource) == Node:
-            iterate_item = self._nodes
-        elif type(resource) == Namespace:
-            iterate_item = self._namespaces
-        elif type(resource) == Pod:
-            iterate_item = self._pods
-        elif type(resource) == Deployment:
-            iterate_item = self._deployments
-        elif type(resource) == DaemonSet:
-            iterate_item = self._daemonsets
-        elif type(resource) == Service:
-            iterate_item = self._services
-        else:
+        if type(resource) not in (Node, Namespace, Pod, Deployment, DaemonSet, Service):
             raise ValueError('Invalid resource')
 
-        index = -1
-        if hasattr(resource, 'namespace'):
-            for i in range(0, len(iterate_item)):
-                if iterate_item[i].name == resource.name and \
-                        iterate_item[i].namespace == resource.namespace:
-                    index = i
-        else:
-            for i in range(0, len(iterate_item)):
-                if iterate_item[i].name == resource.name:
-                    index = i
-        # print(resource.to_dict())
-
-        # create or update resource
-        if index >= 0:
-            iterate_item[index] = resource
-        else:
-            iterate_item.append(resource)
+        kind = Kubernetes.to_enum(resource.get_kind())
+        resources = self._get_resource_maps()[kind]
+        key = self._get_key(resource)
+
+        with self._lock:
+            event_type = Event.ADDED
+            if key in resources:
+                event_type = Event.MODIFIED
+                self._unindex(kind, resources[key])
+
+            resources[key] = resource
+            self._index(kind, resource)
+            self._invalidate_snapshot(kind)
+
+            return self._log_change(event_type, kind, key, resource)
 
     def delete(self, resource):
         """
         delete resource
         :param resource: (object) Node or Namespace or Pod or Service or Deployment or Daemonset
-        :return:
+        :return: (int) change sequence; None - not cached
         """
-        iterate_item = None
-
-        if not hasattr(resource, 'to_dict') or 'kind' not in resource.to_dict():
+        if not hasattr(resource, 'get_kind'):
             raise KeyError('Invalid resource')
 
-        resource_dict = resource.to_dict()
+        kind = Kubernetes.to_enum(resource.get_kind())
+        if kind not in self._get_resource_maps():
+            self._logger.info('Not support Kubernetes resource kind=({})'.format(resource.get_kind()))
+            return None
 
-        if resource_dict['kind'] == Kubernetes.NODE.value:
-            iterate_item = self._nodes
+        resources = self._get_resource_maps()[kind]
+        key = self._get_key(resource)
 
-        elif resource_dict['kind'] == Kubernetes.NAMESPACE.value:
-            iterate_item = self._namespaces
+        with self._lock:
+            if key not in resources:
+                return None
 
-        elif resource_dict['kind'] == Kubernetes.POD.value:
-            iterate_item = self._pods
+            self._unindex(kind, resources.pop(key))
+            self._invalidate_snapshot(kind)
 
-        elif resource_dict['kind'] == Kubernetes.DEPLOYMENT.value:
-            iterate_item = self._deployments
+            return self._log_change(Event.DELETED, kind, key, resource)
 
-        elif resource_dict['kind'] == Kubernetes.DAEMONSET.value:
-            iterate_item = self._daemonsets
+    def get_resources(self, kind) -> list:
+        """
+        get resources for kind from published snapshot
+        :param kind: (Kubernetes(Enum) or str) resource kind
+        :return: (list) resource list; empty list if kind is not supported
+        """
+        kind = Kubernetes.to_enum(kind)
+        _, views = self.get_snapshot()
 
-        elif resource_dict['kind'] == Kubernetes.SERVICE.value:
-            iterate_item = self._services
+        if kind not in views:
+            return []
 
-        else:
-            self._logger.info('Not support Kubernetes resource kind=({})'.format(resource['kind']))
+        return list(views[kind])
 
-        index = -1
-        name = resource_dict['metadata']['name']
+    def _get_namespaced_resources(self, kind, namespace) -> list:
+        """
+        get resources in namespace with namespace index
+        :param kind: (Kubernetes(Enum))
+        :param namespace: (str)
+        :return: (list)
+        """
+        resources = self._get_resource_maps()[kind]
 
-        if hasattr(resource, 'namespace'):
-            namespace = resource.get_namespace()
-            for i in range(0, len(iterate_item)):
-                if iterate_item[i].name == name and iterate_item[i].namespace == namespace:
-                    index = i
-        else:
-            for i in range(0, len(iterate_item)):
-                if iterate_item[i].name == name:
-                    index = i
+        with self._lock:
+            if kind not in self._namespace_index or namespace not in self._namespace_index[kind]:
+                return []
 
-        # delete
-        if index > 0:
-            del iterate_item[index]
+            return [resources[key] for key in self._namespace_index[kind][namespace]]
 
-    def get_bulk_resource(self) -> ResourceBulk:
+    def get_bulk_resource(self, snapshot=None) -> ResourceBulk:
         """
         get all k8s resource collected
+        - built from a single published snapshot, so it is consistent across kinds;
+          resource objects are replaced(not mutated) on update and resource watches do not have to be suspended
+        :param snapshot: (tuple) snapshot from get_snapshot(); None - the latest snapshot
         :return: (ResourceBulk)
         """
         if not self._cluster_id:
             return False, 'Not found cluster name', None
 
         resource_bulk = ResourceBulk(self._cluster_id)
-        resource_bulk.set_nodes(self.get_nodes())
+        _, views = snapshot if snapshot is not None else self.get_snapshot()
 
-        resource_bulk.set_namespaces(self.get_namespaces())
-        resource_bulk.set_daemonsets(self.get_daemonsets())
-        resource_bulk.set_deployments(self.get_deployments())
-        resource_bulk.set_pods(self.get_pods())
-        resource_bulk.set_services(self.get_services())
+        resource_bulk.set_nodes(list(views[Kubernetes.NODE]))
+        resource_bulk.set_namespaces(list(views[Kubernetes.NAMESPACE]))
+        resource_bulk.set_daemonsets(list(views[Kubernetes.DAEMONSET]))
+        resource_bulk.set_deployments(list(views[Kubernetes.DEPLOYMENT]))
+        resource_bulk.set_pods(list(views[Kubernetes.POD]))
+        resource_bulk.set_services(list(views[Kubernetes.SERVICE]))
 
         return resource_bulk
 
@@ -179,21 +379,21 @@ class ResourceRepository(object):
         get nodes from repository
         :return:
         """
-        return self._nodes
+        return self.get_resources(Kubernetes.NODE)
 
     def get_namespaces(self) -> List[Namespace]:
         """
         get namespaces from repository
         :return:
         """
-        return self._namespaces
+        return self.get_resources(Kubernetes.NAMESPACE)
 
     def get_k8s_version(self):
         """
         get k8s version
         :return:
         """
-        for node in self._nodes:
+        for node in self.get_nodes():
             k8s_version = node.get_k8s_version()
             if k8s_version is not None:
                 return k8s_version
@@ -205,28 +405,45 @@ class ResourceRepository(object):
         get pods from repository
         :return:
         """
-        return self._pods
+        return self.get_resources(Kubernetes.POD)
+
+    def get_pod(self, namespace, name) -> Pod:
+        """
+        get pod from repository
+        :param namespace: (str)
+        :param name: (str) pod name
+        :return: (Pod); None - not exist
+        """
+        return self._pods.get((namespace, name))
+
+    def get_pods_by_namespace(self, namespace) -> List[Pod]:
+        """
+        get pods in namespace
+        :param namespace: (str) namespace
+        :return: (list[Pod])
+        """
+        return self._get_namespaced_resources(Kubernetes.POD, namespace)
 
     def get_services(self) -> List[Service]:
         """
         get services from repository
         :return:
         """
-        return self._services
+        return self.get_resources(Kubernetes.SERVICE)
 
     def get_daemonsets(self) -> List[DaemonSet]:
         """
         get daemonsets from repository
         :return:
         """
-        return self._daemonsets
+        return self.get_resources(Kubernetes.DAEMONSET)
 
     def get_deployments(self) -> List[Deployment]:
         """
         get deployments from repository
         :return:
         """
-        return self._deployments
+        return self.get_resources(Kubernetes.DEPLOYMENT)
 
     def to_model(self, event_object):
         """
@@ -439,6 +656,21 @@ class ResourceRepository(object):
         for container in spec.containers:
             images.append(container.image)  # 'rancher/fleet-agent:v0.3.9'
 
+        # set container statuses
+        container_statuses = []
+        if item.status.container_statuses is not None:
+            for elm in item.status.container_statuses:
+                # type(elm): kubernetes.client.model.v1_container_status.V1ContainerStatus
+                obj = ContainerStatus(name=elm.name)
+                obj.set_ready(bool(elm.ready))
+                obj.set_restart_count(elm.restart_count or 0)
+                if elm.state is not None:
+                    for container_state in ('running', 'waiting', 'terminated'):
+                        if getattr(elm.state, container_state, None) is not None:
+                            obj.set_state(container_state)
+                            break
+                container_statuses.append(obj)
+
         pod = Pod(name=name)
         pod.set_namespace(namespace)
         pod.set_state(state)
@@ -448,6 +680,7 @@ class ResourceRepository(object):
         pod.set_node_name(node)
         pod.set_conditions(conditions)
         pod.set_images(images)
+        pod.set_container_statuses(container_statuses)
         pod.set_stime(DateFormatter.datetime_to_str(stime))
 
         return pod
@@ -480,7 +713,7 @@ class ResourceRepository(object):
         selector = []
         for key, value in spec.selector.match_labels.items():
             selector.append('{}={}'.format(key, value))
-        restart = self.get_restarts_for_labeled_pods(selector[0])
+        restart = self.get_restarts_for_labeled_pods(namespace, selector)
 
         # set conditions
         conditions = []
@@ -644,33 +877,70 @@ class ResourceRepository(object):
 
         return service
 
-    def get_restarts_for_labeled_pods(self, label_selector):
+    def get_restarts_for_labeled_pods(self, namespace, selector) -> int:
         """
-        get pod restarts count for a label
-        :param label_selector:
-        :return:
+        get restarts of all containers in cached pods matched to selector
+        :param namespace: (str) namespace
+        :param selector: (list[str]) match labels, i.e., ['app=nginx',]
+        :return: (int)
+        """
+        with self._lock:
+            return sum(self._pods[key].get_restarts() for key in self._select_pods(namespace, selector))
+
+    def _select_pods(self, namespace, selector) -> set:
+        """
+        select cached pod keys matched to all labels of selector; must be called with _lock held
+        :param namespace: (str) namespace
+        :param selector: (list[str]) match labels
+        :return: (set) set((namespace, name))
         """
-        result = self._connector.core_v1_api().list_pod_for_all_namespaces(label_selector=label_selector)
-        if result.items is None or len(result.items) == 0:
-            return 0
+        if not selector:
+            return set()
+
+        keys = None
+        for label in sorted(selector, key=lambda x: len(self._pod_label_index.get(x, ()))):
+            matched = self._pod_label_index.get(label)
+            if not matched:
+                return set()
+            keys = set(matched) if keys is None else keys & matched
 
-        if result.items[0].status is None:
-            return 0
+        return {key for key in keys if key[0] == namespace}
 
-        if result.items[0].status.container_statuses is None or \
-                len(result.items[0].status.container_statuses) == 0:
-            return 0
+    def update_deployment_restarts(self, pod, previous=None) -> list:
+        """
+        update restarts of cached deployments selecting pod with its current or previous labels
+        called on pod event(ADDED, MODIFIED, DELETED) after pod cache is updated
+        :param pod: (Pod)
+        :param previous: (Pod) cached pod before the event; None - not cached
+        :return: (list) [((Deployment) updated deployment, (int) change sequence),]
+        """
+        updated = []
+        labels = [set(pod.get_labels())]
+        if previous is not None:
+            labels.append(set(previous.get_labels()))
 
-        if result.items[0].status.container_statuses[0].restart_count is None:
-            return 0
+        with self._lock:
+            keys = self._namespace_index.get(Kubernetes.DEPLOYMENT, {}).get(pod.get_namespace(), ())
 
-        try:
-            restarts = result.items[0].status.container_statuses[0].restart_count
+            for key in list(keys):
+                deployment = self._deployments[key]
+                selector = deployment.get_selector()
+                if not selector or not any(item.issuperset(selector) for item in labels):
+                    continue
+
+                restart = self.get_restarts_for_labeled_pods(key[0], selector)
+                if restart == deployment.get_restart():
+                    continue
 
-        except IndexError:
-            return 0
+                # replace(not mutate) cached deployment, since published snapshots refer to it
+                deployment = copy.copy(deployment)
+                deployment.set_restart(restart)
+                self._deployments[key] = deployment
+                self._invalidate_snapshot(Kubernetes.DEPLOYMENT)
+                sequence = self._log_change(Event.MODIFIED, Kubernetes.DEPLOYMENT, key, deployment)
+                updated.append((deployment, sequence))
 
-        return restarts
+        return updated
 
     def is_deployment_deployed(self, namespace, name):
         """
@@ -679,13 +949,7 @@ class ResourceRepository(object):
         :param name: (str) deployment name
         :return: True - deployed, False - not deployed
         """
-        found = False
-
-        for deployment in self._deployments:
-            if deployment.get_name() == name and deployment.get_namespace() == namespace:
-                found = True
-
-        return found
+        return (namespace, name) in self._deployments
 
     def is_all_deployment_replicas_ready(self, namespace, name):
         """
@@ -694,12 +958,7 @@ class ResourceRepository(object):
         :param name: (str) deployment name
         :return:
         """
-        deployment = None
-
-        for item in self._deployments:
-            if item.get_namespace() == namespace and item.get_name() == name:
-                deployment = item
-                break
+        deployment = self._deployments.get((namespace, name))
 
         if deployment is None:
             return False
@@ -716,13 +975,7 @@ class ResourceRepository(object):
         :param name: (str) daemonset name
         :return: True - deployed, False - not deployed
         """
-        found = False
-
-        for daemonset in self._daemonsets:
-            if daemonset.get_name() == name and daemonset.get_namespace() == namespace:
-                found = True
-
-        return found
+        return (namespace, name) in self._daemonsets
 
     def is_all_daemonset_replicas_ready(self, namespace, name):
         """
@@ -731,12 +984,7 @@ class ResourceRepository(object):
         :param name: (str) daemonset name
         :return:
         """
-        daemonset = None
-
-        for item in self._daemonsets:
-            if item.get_namespace() == namespace and item.get_name() == name:
-                daemonset = item
-                break
+        daemonset = self._daemonsets.get((namespace, name))
 
         if daemonset is None:
             return False
@@ -744,6 +992,8 @@ class ResourceRepository(object):
         if daemonset.get_desired() == daemonset.get_ready():
             return True
 
+        return False
+
     def is_service_deployed(self, namespace, name):
         """
         check whether service is deployed or not
@@ -751,13 +1001,7 @@ class ResourceRepository(object):
         :param name: (str) service name
         :return: True - deployed, False - not deployed
         """
-        found = False
-
-        for service in self._services:
-            if service.get_name() == name and service.get_namespace() == namespace:
-                found = True
-
-        return found
+        return (namespace, name) in self._services
 
     def get_service(self, namespace, name):
         """
@@ -771,27 +1015,22 @@ class ResourceRepository(object):
         if not name and type(name) != str:
             return False, None
 
-        for service in self._services:
-            if service.get_name() == name and service.get_namespace() == namespace:
-                return True, service
+        service = self._services.get((namespace, name))
 
-        return False, None
+        if service is None:
+            return False, None
+
+        return True, service
 
     def get_namespace_services(self, namespace: str) -> List[Service]:
         """
         get namespace services from repository
         :return: list[Service]
         """
-        services = []
-
         if type(namespace) != str or len(namespace) <= 0:
             raise ValueError('Invalid parameter(namespace) value')
 
-        for service in self._services:
-            if service.get_namespace() == namespace:
-                services.append(service)
-
-        return services
+        return self._get_namespaced_resources(Kubernetes.SERVICE, namespace)
 
     def get_namespace_services_by_pod(self,
                                       namespace: str,
@@ -803,31 +1042,24 @@ class ResourceRepository(object):
         :return: List[Service]
         """
         filtrated_services = []
-        filtrated_pods = []
-        namespace_services = self.get_namespace_services(namespace)
+        item = self.get_pod(namespace, pod)
 
-        if len(namespace_services) == 0:
+        if item is None:
             return []
 
-        # select pod for pod name
-        for item in self._pods:
-            if item.get_name() == pod:
-                filtrated_pods.append(item)
-
         # select service for pod's label
-        for item in filtrated_pods:
-            labels = item.get_labels()
-            if labels is None or len(labels) <= 0:
+        labels = item.get_labels()
+        if labels is None or len(labels) <= 0:
+            return []
+
+        for service in self.get_namespace_services(namespace):
+            selectors = service.get_selector()
+            if selectors is None or len(selectors) <= 0:
                 continue
-            for service in namespace_services:
-                if item.get_namespace() == service.get_namespace():
-                    selectors = service.get_selector()
-                    if selectors is None or len(selectors) <= 0:
-                        continue
-                    for selector in selectors:
-                        if selector in labels:
-                            filtrated_services.append(service)
-                            break
+            for selector in selectors:
+                if selector in labels:
+                    filtrated_services.append(service)
+                    break
 
         return filtrated_services
 
@@ -838,13 +1070,7 @@ class ResourceRepository(object):
         :param name: (str) pod name
         :return:
         """
-        found = False
-
-        for pod in self._pods:
-            if pod.get_name() == name and pod.get_namespace() == namespace:
-                found = True
-
-        return found
+        return (namespace, name) in self._pods
 
     def is_pod_running_for_prefix(self, namespace, prefix):
         """
@@ -854,8 +1080,8 @@ class ResourceRepository(object):
         :return: (bool)
         """
         name_pattern = '{}-'.format(prefix)
-        for pod in self._pods:
-            if name_pattern in pod.get_name() and pod.get_namespace() == namespace:
+        for pod in self._get_namespaced_resources(Kubernetes.POD, namespace):
+            if name_pattern in pod.get_name():
                 if pod.get_state() == PodStatus.RUNNING.value:
                     return True
 
@@ -868,12 +1094,12 @@ class ResourceRepository(object):
         :param name: (str) pod name
         :return: (bool)
         """
-        for pod in self._pods:
-            if name == pod.get_name() and pod.get_namespace() == namespace:
-                if pod.get_state() == PodStatus.RUNNING.value:
-                    return True
+        pod = self._pods.get((namespace, name))
 
-        return False
+        if pod is None:
+            return False
+
+        return pod.get_state() == PodStatus.RUNNING.value
 
     def is_namespace_deployed(self, namespace):
         """
@@ -881,11 +1107,7 @@ class ResourceRepository(object):
         :param namespace: (str)
         :return: (bool)
         """
-        for item in self._namespaces:
-            if item.get_name() == namespace:
-                return True
-
-        return False
+        return (None, namespace) in self._namespaces
 
     def get_namespace_service_account(self, namespace):
         """
@@ -902,8 +1124,8 @@ class ResourceRepository(object):
         :return: (list(str))
         """
         pods = []
-        for item in self._pods:
-            if namespace == item.get_namespace() and deployment+'-' in item.get_name():
+        for item in self._get_namespaced_resources(Kubernetes.POD, namespace):
+            if deployment+'-' in item.get_name():
                 pods.append(item.get_name())
 
         return pods
@@ -916,8 +1138,8 @@ class ResourceRepository(object):
         :return:
         """
         pods = []
-        for item in self._pods:
-            if namespace == item.get_namespace() and deployment + '-' in item.get_name():
+        for item in self._get_namespaced_resources(Kubernetes.POD, namespace):
+            if deployment + '-' in item.get_name():
                 pods.append(item.get_name())
 
         return pods
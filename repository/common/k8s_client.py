@@ -21,6 +21,8 @@ class Connector(object):
     _certificates_v1_api = None        # CertificatesApi
     _rbac_authorization_v1_api = None  # RbacAuthorizationApi
     _networking_v1_api = None          # NetworkingApi
+    _api_client = None
+    _dynamic_client = None             # DynamicClient(created on demand; resource discovery is expensive)
     _logger = None
 
 
@@ -38,6 +40,8 @@ class Connector(object):
         :return:
         """
         config.load_kube_config(config_file=settings.KUBECONFIG_FILE)
+        self._api_client = client.ApiClient()
+        self._dynamic_client = None
         self._core_v1_api = client.CoreV1Api()
         self._app_v1_api = client.AppsV1Api()
         self._node_v1_api = client.NodeV1Api()
@@ -60,4 +64,18 @@ class Connector(object):
         return self._custom_objects_api
 
     def events_v1_api(self):
-        return self._events_v1_api
\ No newline at end of file
+        return self._events_v1_api
+
+    def api_client(self):
+        return self._api_client
+
+    def dynamic_client(self):
+        """
+        get dynamic client for generic(manifest) resources
+        :return: (kubernetes.dynamic.DynamicClient)
+        """
+        if self._dynamic_client is None:
+            from kubernetes import dynamic
+            self._dynamic_client = dynamic.DynamicClient(self._api_client)
+
+        return self._dynamic_client
\ No newline at end of file
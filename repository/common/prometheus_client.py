@@ -1,7 +1,9 @@
-import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import json
 import requests
+import requests.adapters
 from urllib import parse
 
 from gw_agent import settings
@@ -13,16 +15,36 @@ from utils.validate import Validator
 class Connector(object):
     """
     metric connector
+    - queries are sent with a pooled session, and fanned out concurrently
+    - range queries are incremental; only samples newer than the last one seen are requested,
+      and merged to cached series within the period
+    - static series(number of cpu, total memory) are cached for PROM_STATIC_METRIC_CACHE_TTL seconds
     """
     _endpoint = None
     _logger = None
+    _session = None
+    _executor = None
+    _lock = threading.Lock()
     _step = '5s'
+    _step_seconds = 5
     _period = 59
+    _static_cache = {}  # {key: (expire time, value)}
+    _series_cache = {}  # {key: {(instance, device): [[timestamp, value], ...]}}
 
     probe_format = 'http://{endpoint}'
     range_query_format = 'http://{endpoint}/api/v1/query_range?query={query}&start={start}&end={end}&step={step}'
     query_format = 'http://{endpoint}/api/v1/query?query={query}'
 
+    number_of_cpu_query = 'node_cpu_seconds_total{mode="system"}'
+    cpu_usage_query = 'sum(rate(node_cpu_seconds_total{mode!~"idle|iowait"}[10s])) by (instance) ' \
+                      '/ count(node_cpu_seconds_total{mode="system"}) by (instance) * 100'
+    total_memory_query = 'node_memory_MemTotal_bytes'
+    memory_usage_query = 'sum(node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) by (instance) / ' \
+                         'sum(node_memory_MemTotal_bytes) by (instance)'
+    network_info_query = 'node_network_info'
+    rx_bytes_query = 'node_network_receive_bytes_total{device="eth0"}'
+    tx_bytes_query = 'node_network_transmit_bytes_total{device="eth0"}'
+
     def __new__(cls, *args, **kwargs):
         if not hasattr(cls, "_instance"):
             cls._instance = super().__new__(cls)
@@ -32,6 +54,12 @@ class Connector(object):
 
     def _config(self):
         self._logger = get_logger(__name__)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1,
+                                                pool_maxsize=settings.PROM_QUERY_WORKERS)
+        self._session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=settings.PROM_QUERY_WORKERS,
+                                            thread_name_prefix='prometheus')
 
     def is_ready(self):
         if self._endpoint is None:
@@ -45,6 +73,7 @@ class Connector(object):
         :return:
         """
         self._endpoint = None
+        self.clear_cache()
 
     def set_endpoint(self, ip, port):
         """
@@ -57,7 +86,12 @@ class Connector(object):
         if not Validator.is_int(port):
             raise ValueError('Invalid value in port({}). Must input int as port'.format(port))
 
-        self._endpoint = '{}:{}'.format(ip, port)
+        endpoint = '{}:{}'.format(ip, port)
+
+        if endpoint != self._endpoint:
+            self.clear_cache()
+
+        self._endpoint = endpoint
 
     def get_endpoint(self):
         """
@@ -66,6 +100,15 @@ class Connector(object):
         """
         return self._endpoint
 
+    def clear_cache(self):
+        """
+        clear cached static metrics and series
+        :return:
+        """
+        with self._lock:
+            self._static_cache.clear()
+            self._series_cache.clear()
+
     def is_connectable(self):
         """
         check whether prometheus server is connectable or not
@@ -76,7 +119,7 @@ class Connector(object):
         url = self.probe_format.format(endpoint=self._endpoint)
 
         try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
+            response = self._session.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
             if response.status_code == 200:
                 return True, ''
         except Exception as exc:
@@ -84,6 +127,204 @@ class Connector(object):
 
         return True, ''
 
+    @staticmethod
+    def _to_usage(value):
+        """ convert usage sample value """
+        return round(float(value), 2)
+
+    def _request(self, url):
+        """
+        request prometheus query
+        :param url: (str) query url
+        :return: (list) result; None if query status is not success
+        """
+        try:
+            response = self._session.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
+            if response.status_code != 200:
+                raise SystemError('Fail to request query to prometheus({})'.format(url))
+
+            content = response.json()
+        except Exception as exc:
+            raise SystemError('Fail to connect to prometheus server({}) '
+                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+
+        if content['status'] != 'success':
+            return None
+
+        return content['data']['result']
+
+    def _query(self, query):
+        """
+        instant query
+        :param query: (str) PromQL
+        :return: (list) result; None if query status is not success
+        """
+        url = self.query_format.format(endpoint=self._endpoint, query=parse.quote(query))
+
+        return self._request(url)
+
+    def _cached_query(self, key, query):
+        """
+        instant query for static series, cached for PROM_STATIC_METRIC_CACHE_TTL seconds
+        :param key: (str) cache key
+        :param query: (str) PromQL
+        :return: (list) result; None if query status is not success
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            if key in self._static_cache and self._static_cache[key][0] > now:
+                return self._static_cache[key][1]
+
+        result = self._query(query)
+
+        if result is not None:
+            with self._lock:
+                self._static_cache[key] = (now + settings.PROM_STATIC_METRIC_CACHE_TTL, result)
+
+        return result
+
+    def _range_request(self, query, start, end):
+        """
+        range query request
+        :param query: (str) PromQL
+        :param start: (float) start timestamp
+        :param end: (float) end timestamp
+        :return: (list) result; None if query status is not success
+        """
+        if start > end:
+            return []
+
+        url = self.range_query_format.format(endpoint=self._endpoint,
+                                             query=parse.quote(query),
+                                             start=start,
+                                             end=end,
+                                             step=self._step)
+
+        return self._request(url)
+
+    def _range_query(self, key, query, convert):
+        """
+        incremental range query for the last period
+        - queried from the oldest last sample of cached series, so that a lagging series does not miss samples
+        - re-queried for the full period when a series not cached yet(i.e., new instance) is found
+        :param key: (str) series cache key
+        :param query: (str) PromQL
+        :param convert: (callable) sample value converter, i.e., float, int
+        :return: (dict) {(instance, device): [[timestamp, value], ...]}; None if query status is not success
+        """
+        end = time.time()
+        start = end - self._period
+
+        with self._lock:
+            series = self._series_cache.get(key, {})
+            cached = set(series_key for series_key, values in series.items() if values)
+            last = min((series[series_key][-1][0] for series_key in cached), default=None)
+
+        if last is not None and last + self._step_seconds > start:
+            result = self._range_request(query, last + self._step_seconds, end)
+            if result is None:
+                return None
+
+            if any((item['metric'].get('instance'), item['metric'].get('device')) not in cached
+                   for item in result):
+                result = self._range_request(query, start, end)
+        else:
+            result = self._range_request(query, start, end)
+
+        if result is None:
+            return None
+
+        merged = {}
+        expired = end - self._period
+
+        with self._lock:
+            series = self._series_cache.get(key, {})
+            for item in result:
+                series_key = (item['metric'].get('instance'), item['metric'].get('device'))
+                values = series.setdefault(series_key, [])
+                for sample in item['values']:
+                    if not values or sample[0] > values[-1][0]:
+                        values.append([sample[0], convert(sample[1])])
+
+            for series_key, values in series.items():
+                values = [value for value in values if value[0] > expired]
+                if values:
+                    merged[series_key] = values
+
+            self._series_cache[key] = merged
+
+        # return copies not to share cached series with metric models
+        return {series_key: [list(value) for value in values] for series_key, values in merged.items()}
+
+    @staticmethod
+    def _to_number_of_cpu(result):
+        """ convert number of cpu query result to metrics """
+        metrics = {}
+
+        for item in result:
+            instance = item['metric']['instance']
+            if instance not in metrics:
+                metrics[instance] = {
+                    'instance': instance,
+                    'usages': [],
+                    'total': 0,
+                }
+            metrics[instance]['total'] += 1
+
+        return list(metrics.values())
+
+    @staticmethod
+    def _to_total_memory(result):
+        """ convert total memory query result to metrics """
+        metrics = {}
+
+        for item in result:
+            instance = item['metric']['instance']
+            if instance not in metrics:
+                metrics[instance] = {
+                    'instance': instance,
+                    'usages': [],
+                    'total': str(round(int(item['value'][1])/1024**2, 0))+'MiB',
+                }
+
+        return list(metrics.values())
+
+    @staticmethod
+    def _to_network_info(result):
+        """ convert network info query result to metrics """
+        metrics = {}
+
+        for item in result:
+            instance = item['metric']['instance']
+            if instance not in metrics:
+                metrics[instance] = {
+                    'instance': instance,
+                    'rx_bytes': [],
+                    'tx_types': [],
+                    'device': 'eth0',
+                }
+
+        return list(metrics.values())
+
+    @staticmethod
+    def _set_usages(metrics, series):
+        """ set usages series to metrics """
+        for metric in metrics:
+            metric['usages'] = series.get((metric['instance'], None), [])
+
+        return metrics
+
+    @staticmethod
+    def _set_network_bytes(metrics, field, series):
+        """ set rx_bytes or tx_bytes series to metrics """
+        for metric in metrics:
+            values = series.get((metric['instance'], metric['device']))
+            if values is not None:
+                metric[field] = values
+
+        return metrics
+
     def get_number_of_cpu(self):
         """
         get number of cpus
@@ -93,44 +334,12 @@ class Connector(object):
             "total": 2 # number of cpus
         }]
         """
-        query = 'node_cpu_seconds_total{mode="system"}'
-        query = parse.quote(query)
-        url = self.query_format.format(endpoint=self._endpoint, query=query)
-        metrics = []
+        result = self._cached_query('number_of_cpu', self.number_of_cpu_query)
 
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
+        if result is None:
+            return []
 
-            if response.status_code == 200:
-                content = json.loads(response.content)
-
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        if not any(d['instance'] == item['metric']['instance'] for d in metrics):
-                            var = {
-                                'instance': item['metric']['instance'],
-                                'usages': [],
-                                'total': 0,
-                            }
-                            metrics.append(var)
-
-                    for item in result:
-                        for metric in metrics:
-                            if item['metric']['instance'] == metric['instance']:
-                                metric['total'] += 1
-
-                else:
-                    return metrics
-
-            else:
-                raise SystemError('Fail to get number of cpu from prometheus({}})'.format(url))
-
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
-
-        return metrics
+        return self._to_number_of_cpu(result)
 
     def get_cpu_usages(self):
         """
@@ -143,39 +352,13 @@ class Connector(object):
             "usages": # list[list[int, float], ...]; list[[timestamp, cpu_usage]]
         }]
         """
-
         metrics = self.get_number_of_cpu()
-        end = datetime.datetime.utcnow()
-        start = end - datetime.timedelta(seconds=self._period)
-        query = 'sum(rate(node_cpu_seconds_total{mode!~"idle|iowait"}[10s])) by (instance) ' \
-                '/ count(node_cpu_seconds_total{mode="system"}) by (instance) * 100'
-        query = parse.quote(query)
-        url = self.range_query_format.format(endpoint=self._endpoint,
-                                             query=query,
-                                             start=start.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             end=end.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             step=self._step)
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        for metric in metrics:
-                            if metric['instance'] == item['metric']['instance']:
-                                metric['usages'] = item['values']
-                                for usage in metric['usages']:
-                                    usage[1] = round(float(usage[1]), 2)
-                else:
-                    return []
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+        series = self._range_query('cpu_usages', self.cpu_usage_query, self._to_usage)
 
-        return metrics
+        if series is None:
+            return []
+
+        return self._set_usages(metrics, series)
 
     def get_total_memory(self):
         """
@@ -186,34 +369,12 @@ class Connector(object):
             "total": 16G # size of memory
         }]
         """
-        query = 'node_memory_MemTotal_bytes'
-        query = parse.quote(query)
-        url = self.query_format.format(endpoint=self._endpoint, query=query)
-        metrics = []
+        result = self._cached_query('total_memory', self.total_memory_query)
 
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        if not any(d['instance'] == item['metric']['instance'] for d in metrics):
-                            var = {
-                                'instance': item['metric']['instance'],
-                                'usages': [],
-                                'total': str(round(int(item['value'][1])/1024**2, 0))+'MiB',
-                            }
-                            metrics.append(var)
-                else:
-                    return metrics
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+        if result is None:
+            return []
 
-        return metrics
+        return self._to_total_memory(result)
 
     def get_memory_usages(self):
         """
@@ -221,37 +382,12 @@ class Connector(object):
         :return:
         """
         metrics = self.get_total_memory()
-        end = datetime.datetime.utcnow()
-        start = end - datetime.timedelta(seconds=self._period)
-        query = 'sum(node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes) by (instance) / ' \
-                'sum(node_memory_MemTotal_bytes) by (instance)'
-        query = parse.quote(query)
-        url = self.range_query_format.format(endpoint=self._endpoint,
-                                             query=query,
-                                             start=start.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             end=end.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             step=self._step)
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        for metric in metrics:
-                            if metric['instance'] == item['metric']['instance']:
-                                metric['usages'] = item['values']
-                                for usage in metric['usages']:
-                                    usage[1] = round(float(usage[1]), 2)
-                else:
-                    return []
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+        series = self._range_query('memory_usages', self.memory_usage_query, self._to_usage)
 
-        return metrics
+        if series is None:
+            return []
+
+        return self._set_usages(metrics, series)
 
     def get_network_info(self):
         """
@@ -262,37 +398,12 @@ class Connector(object):
             "device": "eth0", # network device
         }]
         """
-        query = 'node_network_info'
-        query = parse.quote(query)
-        url = self.query_format.format(endpoint=self._endpoint, query=query)
-        metrics = []
+        result = self._cached_query('network_info', self.network_info_query)
 
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        if not any(d['instance'] == item['metric']['instance'] for d in metrics):
-                            var = {
-                                'instance': item['metric']['instance'],
-                                'rx_bytes': [],
-                                'tx_types': [],
-                                'device': 'eth0',
-                            }
-                            metrics.append(var)
-                else:
-                    return metrics
-
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
+        if result is None:
+            return []
 
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
-
-        return metrics
+        return self._to_network_info(result)
 
     def get_rx_bytes(self, metrics):
         """
@@ -305,37 +416,12 @@ class Connector(object):
             "rx_bytes": [[timestamp, rx_byte], ...]
         }]
         """
-        end = datetime.datetime.utcnow()
-        start = end - datetime.timedelta(seconds=self._period)
-        query = 'node_network_receive_bytes_total'
-        query = parse.quote(query)
-        url = self.range_query_format.format(endpoint=self._endpoint,
-                                             query=query,
-                                             start=start.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             end=end.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             step=self._step)
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        for metric in metrics:
-                            if metric['instance'] == item['metric']['instance'] and \
-                                    item['metric']['device'] == 'eth0':
-                                metric['rx_bytes'] = item['values']
-                                for rx_byte in metric['rx_bytes']:
-                                    rx_byte[1] = int(rx_byte[1])
-                else:
-                    return []
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+        series = self._range_query('rx_bytes', self.rx_bytes_query, int)
 
-        return metrics
+        if series is None:
+            return []
+
+        return self._set_network_bytes(metrics, 'rx_bytes', series)
 
     def get_tx_bytes(self, metrics):
         """
@@ -349,37 +435,12 @@ class Connector(object):
             "tx_bytes": [[timestamp, tx_byte], ...]
         }]
         """
-        end = datetime.datetime.utcnow()
-        start = end - datetime.timedelta(seconds=self._period)
-        query = 'node_network_transmit_bytes_total'
-        query = parse.quote(query)
-        url = self.range_query_format.format(endpoint=self._endpoint,
-                                             query=query,
-                                             start=start.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             end=end.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                                             step=self._step)
-        try:
-            response = requests.get(url, timeout=settings.REST_REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                content = json.loads(response.content)
-                if content['status'] == 'success':
-                    result = content['data']['result']
-                    for item in result:
-                        for metric in metrics:
-                            if metric['instance'] == item['metric']['instance'] and \
-                                    item['metric']['device'] == 'eth0':
-                                metric['tx_bytes'] = item['values']
-                                for tx_byte in metric['tx_bytes']:
-                                    tx_byte[1] = int(tx_byte[1])
-                else:
-                    return []
-            else:
-                raise SystemError('Fail to get cpu usage from prometheus({}})'.format(url))
-        except Exception as exc:
-            raise SystemError('Fail to connect to prometheus server({}) '
-                              'caused by {}'.format(self._endpoint, get_exception_traceback(exc)))
+        series = self._range_query('tx_bytes', self.tx_bytes_query, int)
 
-        return metrics
+        if series is None:
+            return []
+
+        return self._set_network_bytes(metrics, 'tx_bytes', series)
 
     def get_network_usages(self):
         """
@@ -397,4 +458,36 @@ class Connector(object):
         metrics = self.get_rx_bytes(metrics)
         metrics = self.get_tx_bytes(metrics)
 
-        return metrics
\ No newline at end of file
+        return metrics
+
+    def get_node_usages(self):
+        """
+        get cpu, memory and network usages for each node
+        all queries are requested concurrently
+        :return: (list(dict), list(dict), list(dict)) cpu usages, memory usages, network usages
+        raise SystemError when a query is failed
+        """
+        submit = self._executor.submit
+        number_of_cpu = submit(self._cached_query, 'number_of_cpu', self.number_of_cpu_query)
+        cpu_usages = submit(self._range_query, 'cpu_usages', self.cpu_usage_query, self._to_usage)
+        total_memory = submit(self._cached_query, 'total_memory', self.total_memory_query)
+        memory_usages = submit(self._range_query, 'memory_usages', self.memory_usage_query, self._to_usage)
+        network_info = submit(self._cached_query, 'network_info', self.network_info_query)
+        rx_bytes = submit(self._range_query, 'rx_bytes', self.rx_bytes_query, int)
+        tx_bytes = submit(self._range_query, 'tx_bytes', self.tx_bytes_query, int)
+
+        cpu = []
+        if number_of_cpu.result() is not None and cpu_usages.result() is not None:
+            cpu = self._set_usages(self._to_number_of_cpu(number_of_cpu.result()), cpu_usages.result())
+
+        memory = []
+        if total_memory.result() is not None and memory_usages.result() is not None:
+            memory = self._set_usages(self._to_total_memory(total_memory.result()), memory_usages.result())
+
+        network = []
+        if network_info.result() is not None and rx_bytes.result() is not None and tx_bytes.result() is not None:
+            network = self._to_network_info(network_info.result())
+            network = self._set_network_bytes(network, 'rx_bytes', rx_bytes.result())
+            network = self._set_network_bytes(network, 'tx_bytes', tx_bytes.result())
+
+        return cpu, memory, network
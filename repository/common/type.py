@@ -65,6 +65,7 @@ class Kubernetes(Enum):
     SERVICE = 'Service'
     CONDITION = 'Condition'
     SERVICE_PORT = 'ServicePort'
+    CONTAINER_STATUS = 'ContainerStatus'
     COMPONENTS = 'Components'
     UNKNOWN = 'Unknown'
 
@@ -223,6 +224,59 @@ class NetStat(Enum):
 
         return True
 
+class CustomResource(Enum):
+    """
+    custom resources(plural.group) watched by informers
+    """
+    SUBMARINER_CLUSTER = 'clusters.submariner.io'
+    SUBMARINER = 'submariners.submariner.io'
+    SERVICE_DISCOVERY = 'servicediscoveries.submariner.io'
+    SERVICE_IMPORT = 'serviceimports.multicluster.x-k8s.io'
+    UNKNOWN = 'Unknown'
+
+    @classmethod
+    def to_enum(cls, obj):
+        """
+        cast value(str) to own class's Enum attribute
+        if value is Enum, validate it and returns itself.
+        :param obj: (object)
+        :return:
+            a Enum type in own class
+        """
+        result = cls.UNKNOWN
+
+        if type(obj) is str:
+            value_map = getattr(cls, "_value2member_map_")
+            for key, value in value_map.items():
+                if obj == key:
+                    result = value
+                    break
+        else:
+            if not cls.validate(obj):
+                result = cls.UNKNOWN
+            else:
+                result = obj
+
+        return result
+
+    @classmethod
+    def validate(cls, obj):
+        """
+        validate whether value is included in own class
+        :param obj: (str or own class's attribute)
+        :return:
+        """
+        if type(obj) is str:
+            value_map = getattr(cls, "_value2member_map_")
+            if obj not in value_map.keys():
+                return False
+        else:
+            if obj not in cls.__dict__.values():
+                return False
+
+        return True
+
+
 class MultiClusterRole(Enum):
     """
      role enum for repository.model.netstat.MultiClusterNetwork
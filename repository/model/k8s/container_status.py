@@ -0,0 +1,118 @@
+from repository.common.type import Kubernetes
+from utils.serializer import Serializer
+
+
+class ContainerStatus:
+    # state: [ 'running', 'waiting', 'terminated' ]
+
+    fields = {
+        'kind': 'str',
+        'name': 'str',              # container name
+        'ready': 'bool',            # container readiness
+        'restart_count': 'int',     # container restarts
+        'state': 'str',             # container state
+    }
+
+    def __init__(self, name):
+        """
+        ContainerStatus()
+        :param name: (str) container name
+        """
+        self.kind = Kubernetes.CONTAINER_STATUS.value
+        self.name = name
+        self.ready = False
+        self.restart_count = 0
+        self.state = None
+
+    def get_kind(self) -> str:
+        """
+        getter
+        :return: (str)
+        """
+        return self.kind
+
+    def get_name(self) -> str:
+        """
+        getter
+        :return: (str)
+        """
+        return self.name
+
+    def set_ready(self, val):
+        """
+        setter
+        :param val: (bool)
+        :return:
+        """
+        if type(val) != bool:
+            raise TypeError('Invalid type for val({}). Must input val as bool type'.format(type(val)))
+        self.ready = val
+
+    def get_ready(self) -> bool:
+        """
+        getter
+        :return: (bool)
+        """
+        return self.ready
+
+    def set_restart_count(self, val):
+        """
+        setter
+        :param val: (int)
+        :return:
+        """
+        if type(val) != int:
+            raise TypeError('Invalid type for val({}). Must input val as int type'.format(type(val)))
+        self.restart_count = val
+
+    def get_restart_count(self) -> int:
+        """
+        getter
+        :return: (int)
+        """
+        return self.restart_count
+
+    def set_state(self, val):
+        """
+        setter
+        :param val: (str) 'running', 'waiting', 'terminated'
+        :return:
+        """
+        if val is not None and type(val) != str:
+            raise TypeError('Invalid type for val({}). Must input val as str type'.format(type(val)))
+        self.state = val
+
+    def get_state(self):
+        """
+        getter
+        :return: (str)
+        """
+        return self.state
+
+    @classmethod
+    def validate_dict(cls, _dict):
+        """
+        validate _dict
+        """
+        for key in _dict.keys():
+            if key not in cls.fields.keys():
+                raise KeyError('Invalid key({})'.format(key))
+
+    @classmethod
+    def to_object(cls, _dict):
+        """
+        Returns the model object
+        """
+        cls.validate_dict(_dict)
+
+        instance = cls(name=_dict['name'])
+        for key, value in _dict.items():
+            setattr(instance, key, value)
+
+        return instance
+
+    def to_dict(self):
+        """
+        Returns the model properties as a dict
+        """
+        return Serializer.to_dict(self)
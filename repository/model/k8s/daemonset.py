@@ -1,9 +1,9 @@
 from typing import List
 
-import six
 
 from repository.common.type import Kubernetes, ActiveStatus
 from repository.model.k8s.condition import Condition
+from utils.serializer import Serializer
 
 
 class DaemonSet:
@@ -229,27 +229,7 @@ class DaemonSet:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     @staticmethod
     def validate_dict(_dict: dict):
@@ -1,6 +1,6 @@
-import six
 from repository.common.type import Kubernetes, ActiveStatus
 from repository.model.k8s.condition import Condition
+from utils.serializer import Serializer
 
 
 class Namespace:
@@ -131,27 +131,7 @@ class Namespace:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def _find_condition_index(self, condition):
         """
@@ -1,7 +1,7 @@
-import six
-
 from repository.model.k8s.condition import Condition
+from repository.model.k8s.container_status import ContainerStatus
 from repository.common.type import Kubernetes, NodeStatus, PodStatus
+from utils.serializer import Serializer
 
 
 class Pod:
@@ -22,6 +22,7 @@ class Pod:
         'node': 'str',          # node hostname
         'conditions': 'list[Condition]',    # pod conditions
         'images': 'list[str]',  # docker images
+        'container_statuses': 'list[ContainerStatus]',  # container statuses
         'stime': 'str',         # start time
     }
 
@@ -40,6 +41,7 @@ class Pod:
         self.node = None
         self.images = []
         self.conditions = []
+        self.container_statuses = []
         self.stime = None
 
     def set_namespace(self, val):
@@ -207,6 +209,37 @@ class Pod:
         """
         return self.images
 
+    def set_container_statuses(self, val):
+        """
+        setter
+        :param val: (list[ContainerStatus])
+        :return:
+        """
+        if val is None:
+            raise TypeError('Invalid type for val(None). Must input val as list[ContainerStatus] type')
+        if type(val) != list:
+            raise TypeError('Invalid type for val({}). '
+                            'Must input val as list[ContainerStatus] type'.format(type(val)))
+        for item in val:
+            if type(item) != ContainerStatus:
+                raise TypeError('Invalid type for val[i]({}). '
+                                'Must input val[i] as ContainerStatus type'.format(type(item)))
+        self.container_statuses = val
+
+    def get_container_statuses(self):
+        """
+        getter
+        :return: (list[ContainerStatus])
+        """
+        return self.container_statuses
+
+    def get_restarts(self) -> int:
+        """
+        get restarts of all containers
+        :return: (int)
+        """
+        return sum(item.get_restart_count() for item in self.container_statuses)
+
     def set_stime(self, val):
         """
         setter
@@ -225,27 +258,7 @@ class Pod:
 
     def to_dict(self):
         """Returns the model properties as a dict"""
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     @classmethod
     def validate_dict(cls, _dict):
@@ -261,12 +274,17 @@ class Pod:
 
         instance = cls(name=_dict['name'])
         conditions = []
+        container_statuses = []
 
         for key, value in _dict.items():
             if key == 'conditions':
                 for item in value:  # list(Condition)
                     conditions.append(Condition.to_object(item))
                 setattr(instance, key, conditions)
+            elif key == 'container_statuses':
+                for item in value:  # list(ContainerStatus)
+                    container_statuses.append(ContainerStatus.to_object(item))
+                setattr(instance, key, container_statuses)
             else:
                 setattr(instance, key, value)
 
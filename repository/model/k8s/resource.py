@@ -1,6 +1,5 @@
 from typing import List
 
-import six
 
 from repository.model.k8s.daemonset import DaemonSet
 from repository.model.k8s.deployment import Deployment
@@ -8,6 +7,7 @@ from repository.model.k8s.namespace import Namespace
 from repository.model.k8s.node import Node
 from repository.model.k8s.pod import Pod
 from repository.model.k8s.service import Service
+from utils.serializer import Serializer
 
 
 class ResourceBulk:
@@ -94,27 +94,7 @@ class ResourceBulk:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def set_nodes(self, val: List[Node]):
         """
@@ -1,10 +1,10 @@
 from typing import List
 
-import six
 
 from repository.model.k8s.condition import Condition
 from repository.common.type import Kubernetes, ActiveStatus
 from repository.model.k8s.service_port import ServicePort
+from utils.serializer import Serializer
 
 
 class Service:
@@ -269,27 +269,7 @@ class Service:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def _find_condition_index(self, condition: str) -> int:
         """
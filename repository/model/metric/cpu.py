@@ -1,12 +1,14 @@
-import six
-
 from repository.common.type import Metric
+from repository.model.metric.series import TimeSeries
+from utils.serializer import Serializer
 
 
 class CPUMetric:
     """
     CPUMetric model class
     """
+    buffer_size = 12  # prometheus range query(59 seconds, step=5s)
+
     fields = {
         'kind': 'kind',
         'usages': 'list(list())', # [[int,float], [int,float], [int,float]]
@@ -21,32 +23,12 @@ class CPUMetric:
         :param usages: list(list()) cpu usages
         """
         self.kind = Metric.CPU_METRIC.value
-        self.usages = usages
+        self.usages = TimeSeries.from_list(usages, max(len(usages), self.buffer_size), float)
         self.total = total
 
     def to_dict(self):
         """Returns the model properties as a dict"""
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
 
     @classmethod
@@ -73,4 +55,19 @@ class CPUMetric:
         getter
         :return: (str)
         """
-        return self.kind
\ No newline at end of file
+        return self.kind
+
+    def update_usages(self, usages):
+        """
+        append usages newer than the last usage
+        :param usages: list(list()) cpu usages
+        :return: (int) number of appended usages
+        """
+        return self.usages.extend_newer(usages)
+
+    def get_usages(self):
+        """
+        getter
+        :return: list(list()) cpu usages
+        """
+        return self.usages.to_list()
@@ -1,6 +1,7 @@
-import six
 from repository.common.type import Metric
+from repository.model.metric.series import TimeSeries
 from utils.validate import Validator
+from utils.serializer import Serializer
 
 
 class EndpointNetworkMetric:
@@ -12,7 +13,9 @@ class EndpointNetworkMetric:
     fields = {
         'kind': 'str',
         'name': 'str',
-        'latencies': 'list',    # latency list: [[(float)timestamp, (float)latency_ms],]
+        'latencies': 'list',    # latency list: [[(float)timestamp, (float)latency_ms],]; median if probed
+        'latencies_p90': 'list',    # 90th percentile latency list: [[(float)timestamp, (float)latency_ms],]
+        'latencies_p99': 'list',    # 99th percentile latency list: [[(float)timestamp, (float)latency_ms],]
         'tx_bytes': 'list',     # tx byte list: [[(float)timestamp, (int)tx_byte],]
         'rx_bytes': 'list',     # tx byte list: [[(float)timestamp, (int)rx_byte],]
     }
@@ -23,9 +26,11 @@ class EndpointNetworkMetric:
         """
         self.kind = Metric.ENDPOINT_NETWORK_METRIC.value
         self.name = name
-        self.latencies = []
-        self.tx_bytes = []
-        self.rx_bytes = []
+        self.latencies = TimeSeries(self.buffer_size, float)
+        self.latencies_p90 = TimeSeries(self.buffer_size, float)
+        self.latencies_p99 = TimeSeries(self.buffer_size, float)
+        self.tx_bytes = TimeSeries(self.buffer_size, int)
+        self.rx_bytes = TimeSeries(self.buffer_size, int)
 
     @classmethod
     def validate_dict(cls, _dict):
@@ -44,7 +49,18 @@ class EndpointNetworkMetric:
         cls.validate_dict(_dict)
         instance = cls(name=_dict['name'])
         for key, value in _dict.items():
-            setattr(instance, key, value)
+            if key == 'latencies':
+                instance.latencies.extend(value)
+            elif key == 'latencies_p90':
+                instance.latencies_p90.extend(value)
+            elif key == 'latencies_p99':
+                instance.latencies_p99.extend(value)
+            elif key == 'tx_bytes':
+                instance.tx_bytes.extend(value)
+            elif key == 'rx_bytes':
+                instance.rx_bytes.extend(value)
+            else:
+                setattr(instance, key, value)
 
         return instance
 
@@ -52,26 +68,7 @@ class EndpointNetworkMetric:
         """
         Returns the model properties as a dict
         """
-        result = {}
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_kind(self) -> str:
         """
@@ -102,11 +99,22 @@ class EndpointNetworkMetric:
             raise ValueError('Invalid latency type(({}){}).'
                              'Must input float as latency'.format(type(latency), latency))
 
-        if len(self.latencies) >= self.buffer_size:
-            # del last item
-            del self.latencies[0]
+        self.latencies.append(timestamp, latency)
 
-        self.latencies.append([timestamp, latency])
+    def set_latency_percentiles(self, percentiles: dict, timestamp: float):
+        """
+        set latency percentiles of a probe round
+        :param percentiles: (dict) {50: (float) ms, 90: (float) ms, 99: (float) ms}
+        :param timestamp: (float) time.time()
+        :return:
+        """
+        if timestamp is None or type(timestamp) != float:
+            raise ValueError('Invalid timestamp(({}){}). '
+                             'Must input float as timestamp'.format(type(timestamp), timestamp))
+
+        self.latencies.append(timestamp, percentiles[50])
+        self.latencies_p90.append(timestamp, percentiles[90])
+        self.latencies_p99.append(timestamp, percentiles[99])
 
     def get_latencies(self):
         """
@@ -114,7 +122,7 @@ class EndpointNetworkMetric:
         :return:
         (int): list([(float)timestamp, (float)latency_ms])
         """
-        return self.latencies
+        return self.latencies.to_list()
 
     def set_tx_byte(self, tx_byte:int, timestamp:float):
         """
@@ -130,11 +138,7 @@ class EndpointNetworkMetric:
             raise ValueError('Invalid timestamp(({}){}). '
                              'Must input float as timestamp'.format(type(timestamp), timestamp))
 
-        if len(self.tx_bytes) >= self.buffer_size:
-            # del last item
-            del self.tx_bytes[0]
-
-        self.tx_bytes.append([timestamp, tx_byte])
+        self.tx_bytes.append(timestamp, tx_byte)
 
     def set_rx_byte(self, rx_byte:int, timestamp:float):
         """
@@ -150,8 +154,4 @@ class EndpointNetworkMetric:
             raise ValueError('Invalid timestamp(({}){}). '
                              'Must input float as timestamp'.format(type(timestamp), timestamp))
 
-        if len(self.rx_bytes) >= self.buffer_size:
-            # del last item
-            del self.rx_bytes[0]
-
-        self.rx_bytes.append([timestamp, rx_byte])
+        self.rx_bytes.append(timestamp, rx_byte)
@@ -1,12 +1,13 @@
-import six
-
 from repository.common.type import Metric
+from repository.model.metric.series import TimeSeries
+from utils.serializer import Serializer
 
 
 class MemoryMetric:
     """
     MemoryMetric model class
     """
+    buffer_size = 12  # prometheus range query(59 seconds, step=5s)
 
     fields = {
         'kind': 'kind',
@@ -23,7 +24,7 @@ class MemoryMetric:
         """
         self.kind = Metric.MEM_METRIC.value
         self.total = total
-        self.usages = usages
+        self.usages = TimeSeries.from_list(usages, max(len(usages), self.buffer_size), float)
 
     @classmethod
     def validate_dict(cls, _dict):
@@ -49,27 +50,7 @@ class MemoryMetric:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_kind(self) -> str:
         """
@@ -77,3 +58,19 @@ class MemoryMetric:
         :return: (str)
         """
         return self.kind
+
+    def update_usages(self, usages):
+        """
+        append usages newer than the last usage
+        :param usages: list(list()) memory usages
+        :return: (int) number of appended usages
+        """
+        return self.usages.extend_newer(usages)
+
+    def get_usages(self):
+        """
+        getter
+        :return: list(list()) memory usages
+        """
+        return self.usages.to_list()
+
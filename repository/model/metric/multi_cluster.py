@@ -1,7 +1,7 @@
-import six
 from repository.common.type import Metric
 from repository.model.metric.endpoint import EndpointNetworkMetric
 from utils.validate import Validator
+from utils.serializer import Serializer
 
 
 class MultiClusterMetric(object):
@@ -52,27 +52,7 @@ class MultiClusterMetric(object):
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_kind(self) -> str:
         """
@@ -133,9 +113,28 @@ class MultiClusterMetric(object):
             endpoint = EndpointNetworkMetric(name)
             endpoint.set_latency(latency=latency, timestamp=timestamp)
             self.endpoints.append(endpoint)
+            return
 
         self.endpoints[index].set_latency(latency=latency, timestamp=timestamp)
 
+    def set_endpoint_latency_percentiles(self, name: str, percentiles: dict, timestamp: float):
+        """
+        set endpoint latency percentiles
+        :param name: (str) endpoint network name(cluster_id)
+        :param percentiles: (dict) {50: (float) ms, 90: (float) ms, 99: (float) ms}
+        :param timestamp: (float) time.time()
+        :return:
+        """
+        index = self._get_endpoint_index(name)
+
+        if index < 0:
+            endpoint = EndpointNetworkMetric(name)
+            endpoint.set_latency_percentiles(percentiles=percentiles, timestamp=timestamp)
+            self.endpoints.append(endpoint)
+            return
+
+        self.endpoints[index].set_latency_percentiles(percentiles=percentiles, timestamp=timestamp)
+
     def get_endpoint_latencies(self, name:str):
         """
         getter
@@ -181,5 +180,6 @@ class MultiClusterMetric(object):
             endpoint = EndpointNetworkMetric(name)
             endpoint.set_rx_byte(rx_byte=rx_byte, timestamp=timestamp)
             self.endpoints.append(endpoint)
+            return
 
         self.endpoints[index].set_rx_byte(rx_byte=rx_byte, timestamp=timestamp)
@@ -1,12 +1,13 @@
-import six
-
 from repository.common.type import Metric
+from repository.model.metric.series import TimeSeries
+from utils.serializer import Serializer
 
 
 class NetworkMetric:
     """
     NetworkMetric model class
     """
+    buffer_size = 12  # prometheus range query(59 seconds, step=5s)
 
     fields = {
         'kind': 'kind',
@@ -24,8 +25,8 @@ class NetworkMetric:
         """
         self.kind = Metric.NETWORK_METRIC.value
         self.device = device
-        self.rx_bytes = rx_bytes
-        self.tx_bytes = tx_bytes
+        self.rx_bytes = TimeSeries.from_list(rx_bytes, max(len(rx_bytes), self.buffer_size), int)
+        self.tx_bytes = TimeSeries.from_list(tx_bytes, max(len(tx_bytes), self.buffer_size), int)
 
     @classmethod
     def validate_dict(cls, _dict):
@@ -49,31 +50,21 @@ class NetworkMetric:
         """
         Returns the model properties as a dict
         """
-        result = {}
-
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_kind(self) -> str:
         """
         getter
         :return: (str)
         """
-        return self.kind
\ No newline at end of file
+        return self.kind
+
+    def update(self, rx_bytes, tx_bytes):
+        """
+        append rx/tx bytes newer than the last ones
+        :param rx_bytes: list(list()) receive bytes
+        :param tx_bytes: list(list()) send bytes
+        :return:
+        """
+        self.rx_bytes.extend_newer(rx_bytes)
+        self.tx_bytes.extend_newer(tx_bytes)
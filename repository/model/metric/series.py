@@ -0,0 +1,261 @@
+from array import array
+from collections import deque
+
+
+class TimeSeries:
+    """
+    fixed-capacity ring buffer for time-series samples([timestamp, value])
+    - timestamps and values are kept in array('d'), append is O(1)
+    - windowed views are memoryview slices of the buffers(no copy)
+    - serialized as list([timestamp, value]) like the prometheus range query result
+    """
+
+    def __init__(self, capacity: int, value_type=float):
+        """
+        TimeSeries()
+        :param capacity: (int) max number of samples
+        :param value_type: (type) sample value type in serialization, i.e., float, int
+        """
+        if type(capacity) != int or capacity <= 0:
+            raise ValueError('Invalid capacity({}). Must input positive int as capacity'.format(capacity))
+
+        self._capacity = capacity
+        self._value_type = value_type
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._head = 0   # index of the oldest sample
+        self._count = 0
+
+    @classmethod
+    def from_list(cls, samples, capacity: int = None, value_type=float):
+        """
+        create TimeSeries from sample list
+        :param samples: (list) [[(float)timestamp, value],]
+        :param capacity: (int) max number of samples; default is len(samples)
+        :param value_type: (type) sample value type
+        :return: (TimeSeries)
+        """
+        if capacity is None:
+            capacity = max(len(samples), 1)
+
+        series = cls(capacity, value_type)
+        series.extend(samples)
+
+        return series
+
+    def __len__(self):
+        return self._count
+
+    def get_capacity(self) -> int:
+        """
+        getter
+        :return: (int) max number of samples
+        """
+        return self._capacity
+
+    def append(self, timestamp: float, value):
+        """
+        append sample; the oldest sample is overwritten when full
+        :param timestamp: (float)
+        :param value: (float or int)
+        :return:
+        """
+        tail = (self._head + self._count) % self._capacity
+        self._timestamps[tail] = timestamp
+        self._values[tail] = value
+
+        if self._count < self._capacity:
+            self._count += 1
+        else:
+            self._head = (self._head + 1) % self._capacity
+
+    def extend(self, samples):
+        """
+        append samples
+        :param samples: (list) [[(float)timestamp, value],]
+        :return:
+        """
+        for timestamp, value in samples:
+            self.append(timestamp, value)
+
+    def extend_newer(self, samples) -> int:
+        """
+        append samples newer than the last sample
+        :param samples: (list) [[(float)timestamp, value],] sorted by timestamp
+        :return: (int) number of appended samples
+        """
+        last = self.last_timestamp()
+        appended = 0
+
+        for timestamp, value in samples:
+            if last is None or timestamp > last:
+                self.append(timestamp, value)
+                appended += 1
+
+        return appended
+
+    def clear(self):
+        """
+        clear samples
+        :return:
+        """
+        self._head = 0
+        self._count = 0
+
+    def last_timestamp(self):
+        """
+        get the latest sample timestamp
+        :return: (float) timestamp; None if empty
+        """
+        if self._count == 0:
+            return None
+
+        return self._timestamps[(self._head + self._count - 1) % self._capacity]
+
+    def segments(self):
+        """
+        get zero-copy views of samples in time order
+        :return: (list) [(memoryview)timestamps, (memoryview)values] segments(at most 2)
+        """
+        if self._count == 0:
+            return []
+
+        timestamps = memoryview(self._timestamps)
+        values = memoryview(self._values)
+        end = self._head + self._count
+
+        if end <= self._capacity:
+            return [(timestamps[self._head:end], values[self._head:end])]
+
+        end = end % self._capacity
+
+        return [(timestamps[self._head:], values[self._head:]),
+                (timestamps[:end], values[:end])]
+
+    def since(self, timestamp: float) -> list:
+        """
+        get samples newer than timestamp
+        :param timestamp: (float)
+        :return: (list) [[(float)timestamp, value],]
+        """
+        value_type = self._value_type
+        result = []
+
+        for timestamps, values in self.segments():
+            for index in range(len(timestamps)):
+                if timestamps[index] > timestamp:
+                    result.append([timestamps[index], value_type(values[index])])
+
+        return result
+
+    def to_list(self) -> list:
+        """
+        get all samples
+        :return: (list) [[(float)timestamp, value],]
+        """
+        value_type = self._value_type
+        result = []
+
+        for timestamps, values in self.segments():
+            result.extend([t, value_type(v)] for t, v in zip(timestamps.tolist(), values.tolist()))
+
+        return result
+
+    def to_dict(self) -> list:
+        """
+        Returns the samples as a list(serialized in model to_dict())
+        """
+        return self.to_list()
+
+
+class RollupTier:
+    """
+    fixed-interval rollup of a time-series(i.e., 1 minute, 5 minutes)
+    - each bucket keeps min, max, sum, count and the last value of samples in the interval
+    - serialized as list([bucket start timestamp, min, max, avg, last]); only closed buckets are serialized
+    """
+
+    def __init__(self, interval: int, capacity: int):
+        """
+        RollupTier()
+        :param interval: (int) bucket interval seconds
+        :param capacity: (int) max number of buckets
+        """
+        if type(interval) != int or interval <= 0:
+            raise ValueError('Invalid interval({}). Must input positive int as interval'.format(interval))
+        if type(capacity) != int or capacity <= 0:
+            raise ValueError('Invalid capacity({}). Must input positive int as capacity'.format(capacity))
+
+        self._interval = interval
+        self._buckets = deque(maxlen=capacity)  # [start, min, max, sum, count, last]
+        self._last_timestamp = None
+
+    def get_interval(self) -> int:
+        """
+        getter
+        :return: (int) bucket interval seconds
+        """
+        return self._interval
+
+    def last_timestamp(self):
+        """
+        get the latest sample timestamp added
+        :return: (float) timestamp; None if empty
+        """
+        return self._last_timestamp
+
+    def add(self, timestamp: float, value):
+        """
+        add sample; samples older than the last sample are ignored
+        :param timestamp: (float)
+        :param value: (float or int)
+        :return:
+        """
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            return
+
+        self._last_timestamp = timestamp
+        start = timestamp - timestamp % self._interval
+
+        if self._buckets and self._buckets[-1][0] == start:
+            bucket = self._buckets[-1]
+            bucket[1] = min(bucket[1], value)
+            bucket[2] = max(bucket[2], value)
+            bucket[3] += value
+            bucket[4] += 1
+            bucket[5] = value
+            return
+
+        self._buckets.append([start, value, value, value, 1, value])
+
+    def extend(self, samples):
+        """
+        add samples
+        :param samples: (list) [[(float)timestamp, value],]
+        :return:
+        """
+        for timestamp, value in samples:
+            self.add(timestamp, value)
+
+    def since(self, timestamp) -> list:
+        """
+        get closed buckets started after timestamp
+        :param timestamp: (float) bucket start timestamp; None - all closed buckets
+        :return: (list) [[(float)start, min, max, (float)avg, last],]
+        """
+        result = []
+
+        for start, minimum, maximum, total, count, last in self._buckets:
+            if start + self._interval > self._last_timestamp:
+                break  # open bucket
+            if timestamp is None or start > timestamp:
+                result.append([start, minimum, maximum, total / count, last])
+
+        return result
+
+    def to_list(self) -> list:
+        """
+        get all closed buckets
+        :return: (list) [[(float)start, min, max, (float)avg, last],]
+        """
+        return self.since(None)
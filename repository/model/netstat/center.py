@@ -1,8 +1,7 @@
-import six
-
 from gw_agent import settings
 from repository.common.type import NetStat, ClusterSessionStatus, ClusterNetworkConnectionStatus
 from utils.dateformat import DateFormatter
+from utils.serializer import Serializer
 
 
 class CenterNetwork:
@@ -68,26 +67,7 @@ class CenterNetwork:
         """
         Returns the model properties as a dict
         """
-        result = {}
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def set_cluster_session_status(self, val):
         """
@@ -1,10 +1,15 @@
-import six
-
 from cluster.common.type import Event
 from repository.common.type import NetStat
 from utils.validate import Validator
+from utils.serializer import Serializer
 
 class MultiClusterService:
+    """
+    multi-cluster service(exports, imports)
+    - exports and imports are indexed by (cluster_id, namespace, name) and (namespace, name),
+      so lookups are O(1) and synchronization is a set difference of keys
+    - 'exports', 'imports' lists are kept in table order for serialization
+    """
 
     fields = {
         'kind': 'str',
@@ -17,6 +22,10 @@ class MultiClusterService:
         self.kind = NetStat.MULTI_CLUSTER_SERVICE.value
         self.exports = []
         self.imports = []
+        self._export_table = {}     # {(cluster_id, namespace, name): ServiceExport}
+        self._export_index = {}     # {(namespace, name): {(cluster_id, namespace, name): ServiceExport}}
+        self._import_table = {}     # {(cluster_id, namespace, name): ServiceImport}
+        self._import_index = {}     # {(namespace, name): {(cluster_id, namespace, name): ServiceImport}}
 
     @classmethod
     def validate_dict(cls, _dict):
@@ -33,40 +42,75 @@ class MultiClusterService:
         cls.validate_dict(_dict)
 
         instance = cls()
-        exports = []
-        imports = []
 
         for key, value in _dict.items():
             if key == 'exports':
-                for item in value:  # list(ServiceExport)
-                    exports.append(ServiceExport.to_object(item))
-                setattr(instance, key, exports)
-            if key == 'imports':
-                for item in value:  # list(ServiceImport)
-                    imports.append(ServiceImport.to_object(item))
-                setattr(instance, key, imports)
+                instance.set_service_exports([ServiceExport.to_object(item) for item in value])
+            elif key == 'imports':
+                instance.set_service_imports([ServiceImport.to_object(item) for item in value])
             else:
                 setattr(instance, key, value)
 
         return instance
 
-    """ service export """
-    def _get_export_index(self, val):
+    """ service table """
+    @staticmethod
+    def _build_table(val) -> (dict, dict):
         """
-        get service export index
-        :param val: (ServiceExport)
-        :return: (int) index; -1: not exist index, 0 or positive number: index
+        build service table and (namespace, name) index
+        :param val: (list(ServiceExport) or list(ServiceImport))
+        :return:
+        (dict) {(cluster_id, namespace, name): service}
+        (dict) {(namespace, name): {(cluster_id, namespace, name): service}}
+        """
+        table = {}
+        index = {}
+
+        for item in val:
+            key = item.get_service_key()
+            table[key] = item
+            index.setdefault(key[1:], {})[key] = item
+
+        return table, index
+
+    @staticmethod
+    def _diff_table(table, val, object_type) -> (dict, list):
         """
-        if len(self.exports) <= 0:
-            return -1
+        diff service table with new services
+        :param table: (dict) current service table
+        :param val: (list(ServiceExport) or list(ServiceImport)) new services
+        :param object_type: (str) NetStat.SERVICE_EXPORT.value or NetStat.SERVICE_IMPORT.value
+        :return:
+        (dict) new service table
+        (list(dict)) event objects
+        """
+        new_table = {item.get_service_key(): item for item in val}
+        event_objects = []
 
-        service_id = ''.join([val.cluster_id, val.name, val.namespace])
-        for index in range(0, len(self.exports)):
-            if self.exports[index].get_service_id() == service_id:
-                return index
+        for key, item in new_table.items():
+            orig = table.get(key)
+            if orig is None:
+                event_type = Event.ADDED.value
+            elif orig.to_dict() != item.to_dict():
+                event_type = Event.MODIFIED.value
+            else:
+                continue
+            event_objects.append({
+                'event_type': event_type,
+                'object_type': object_type,
+                'object_value': item
+            })
+
+        for key in [key for key in table.keys() if key not in new_table]:
+            event_objects.append({
+                'event_type': Event.DELETED.value,
+                'object_type': object_type,
+                'object_value': table[key]
+            })
 
-        return -1
+        return new_table, event_objects
 
+    """ service export """
     @staticmethod
     def _validate_service_export(val):
         """
@@ -86,23 +130,28 @@ class MultiClusterService:
     def set_service_exports(self, val):
         """
         set service export
-        :param val: (ServiceExport)
+        :param val: (list(ServiceExport))
         :return:
         """
         self._validate_service_export(val)
-        self.exports = val
+        self._export_table, self._export_index = self._build_table(val)
+        self.exports = list(self._export_table.values())
 
     def delete_service_export(self, val):
         """
         delete service export
-        :param val:
+        :param val: (ServiceExport)
         :return:
         """
-        self._validate_service_export(val)
+        self._validate_service_export([val])
 
-        index = self._get_export_index(val)
-        if index >= 0:
-            del self.exports[index]
+        key = val.get_service_key()
+        if key in self._export_table:
+            del self._export_table[key]
+            del self._export_index[key[1:]][key]
+            if not self._export_index[key[1:]]:
+                del self._export_index[key[1:]]
+            self.exports = list(self._export_table.values())
 
     def get_service_exports(self):
         """
@@ -111,106 +160,45 @@ class MultiClusterService:
         """
         return self.exports
 
-    def synchronize_service_exports(self, val):
+    def get_service_export(self, cluster_id, namespace, name):
         """
-        set service exports
-        :param val: (list(ServiceExport))
-        :return:
+        get service export
+        :param cluster_id: (str) source cluster id
+        :param namespace: (str) service namespace
+        :param name: (str) service name
+        :return: (ServiceExport) None - not exist
         """
-        if val is None:
-            raise ValueError('val is None')
-        for item in val:
-            self._validate_service_export(item)
-
-        event_objects = []
-
-        # check ADDED or MODIFIED event and store to repository
-        for item in val:
-            index = self._get_export_index(item)
-            if index < 0:
-                event_object = {
-                    'event_type': Event.ADDED.value,
-                    'object_type': NetStat.SERVICE_EXPORT.value,
-                    'object_value': item
-                }
-                self.exports.append(item)
-                event_objects.append(event_object)
-            else:
-                new = str(item.to_dict())
-                orig = str(self.exports[index].to_dict())
-
-                if new != orig:
-                    event_object ={
-                        'event_type': Event.MODIFIED.value,
-                        'object_type': NetStat.SERVICE_EXPORT.value,
-                        'object_value': item
-                    }
-                    self.exports[index] = item
-                    event_objects.append(event_object)
-
-        # check DELETED event and store to repository
-        service_ids = []
-        deleted_items = []
-        deleted = False
-        first = True
+        return self._export_table.get((cluster_id, namespace, name))
 
-        for item in val:
-            service_ids.append(item.get_service_id())
-
-        while True:
-            if not deleted and not first:
-                break
-            first = False
-            for index in range(0, len(self.exports)):
-                deleted = False
-                if self.exports[index].get_service_id() not in service_ids:
-                    deleted_items.append(self.exports.pop(index))
-                    deleted = True
-                    break
-
-        for item in deleted_items:
-            event_object = {
-                'event_type': Event.DELETED.value,
-                'object_type': NetStat.SERVICE_EXPORT.value,
-                'object_value': item
-            }
-            event_objects.append(event_object)
-
-        return event_objects
-
-    """ service import """
-    def _get_import_index(self, val):
+    def is_service_exported(self, namespace, name) -> bool:
         """
-        get service import index
-        :param val: (ServiceImport)
-        :return: (int) index; -1: not exist index, 0 or positive number: index
+        check whether service is exported from any cluster
+        :param namespace: (str) service namespace
+        :param name: (str) service name
+        :return: (bool)
         """
-        if len(self.imports) <= 0:
-            return -1
-
-        service_id = ''.join([val.cluster_id, val.name, val.namespace])
-        for index in range(0, len(self.imports)):
-            if self.imports[index].get_service_id() == service_id:
-                return index
+        return (namespace, name) in self._export_index
 
-        return -1
-
-    def set_service_imports(self, val):
+    def synchronize_service_exports(self, val):
         """
-        set service import
-        :param val: (ServiceImport)
-        :return:
+        synchronize service exports
+        :param val: (list(ServiceExport))
+        :return: (list(dict)) event objects
+        [{
+            'event_type': Event.MODIFIED.value, # Event.ADDED.value or Event.MODIFIED.value or Event.DELETED.value
+            'object_type': NetStat.SERVICE_EXPORT.value,
+            'object_value': item
+        }]
         """
-        self._validate_service_import(val)
-        self.imports = val
-        #
-        #
-        # index = self._get_import_index(val)
-        # if index < 0:
-        #     self.imports.append(val)
-        # else:
-        #     self.imports[index] = val
+        self._validate_service_export(val)
 
+        table, event_objects = self._diff_table(self._export_table, val, NetStat.SERVICE_EXPORT.value)
+        if event_objects:
+            self.set_service_exports(list(table.values()))
+
+        return event_objects
+
+    """ service import """
     @staticmethod
     def _validate_service_import(val):
         """
@@ -229,17 +217,31 @@ class MultiClusterService:
             if type(v) != ServiceImport:
                 raise TypeError('Invalid type for val({}). Must input val as List[ServiceImport]'.format(type(val)))
 
+    def set_service_imports(self, val):
+        """
+        set service import
+        :param val: (list(ServiceImport))
+        :return:
+        """
+        self._validate_service_import(val)
+        self._import_table, self._import_index = self._build_table(val)
+        self.imports = list(self._import_table.values())
+
     def delete_service_import(self, val):
         """
         delete service import
-        :param val:
+        :param val: (ServiceImport)
         :return:
         """
-        self._validate_service_import(val)
-        index = self._get_import_index(val)
+        self._validate_service_import([val])
 
-        if index >= 0:
-            del self.imports[index]
+        key = val.get_service_key()
+        if key in self._import_table:
+            del self._import_table[key]
+            del self._import_index[key[1:]][key]
+            if not self._import_index[key[1:]]:
+                del self._import_index[key[1:]]
+            self.imports = list(self._import_table.values())
 
     def get_service_imports(self):
         """
@@ -248,6 +250,28 @@ class MultiClusterService:
         """
         return self.imports
 
+    def get_service_import(self, namespace, name):
+        """
+        get service import for namespace and name
+        :param namespace: (str) service namespace
+        :param name: (str) service name
+        :return: (ServiceImport) the first imported one if imported from multiple clusters; None - not exist
+        """
+        services = self._import_index.get((namespace, name))
+        if not services:
+            return None
+
+        return next(iter(services.values()))
+
+    def is_service_imported(self, namespace, name) -> bool:
+        """
+        check whether service is imported from any cluster
+        :param namespace: (str) service namespace
+        :param name: (str) service name
+        :return: (bool)
+        """
+        return (namespace, name) in self._import_index
+
     def synchronize_service_imports(self, val):
         """
         synchronize service imports
@@ -260,64 +284,11 @@ class MultiClusterService:
             'object_value': item
         }]
         """
-        if val is None:
-            raise ValueError('val is None')
-        for item in val:
-            self._validate_service_import(item)
-
-        event_objects = []
-
-        # check ADDED or MODIFIED event and store to repository
-        for item in val:
-            index = self._get_import_index(item)
-            if index < 0:
-                event_object = {
-                    'event_type': Event.ADDED.value,
-                    'object_type': NetStat.SERVICE_IMPORT.value,
-                    'object_value': item
-                }
-                self.imports.append(item)
-                event_objects.append(event_object)
-            else:
-                new = str(item.to_dict())
-                orig = str(self.imports[index].to_dict())
-
-                if new != orig:
-                    event_object ={
-                        'event_type': Event.MODIFIED.value,
-                        'object_type': NetStat.SERVICE_IMPORT.value,
-                        'object_value': item
-                    }
-                    self.imports[index] = item
-                    event_objects.append(event_object)
-
-        # check DELETED event and store to repository
-        service_ids = []
-        deleted_items = []
-        deleted = False
-        first = True
+        self._validate_service_import(val)
 
-        for item in val:
-            service_ids.append(item.get_service_id())
-
-        while True:
-            if not deleted and not first:
-                break
-            first = False
-            for index in range(0, len(self.imports)):
-                deleted = False
-                if self.imports[index].get_service_id() not in service_ids:
-                    deleted_items.append(self.imports.pop(index))
-                    deleted = True
-                    break
-
-        for item in deleted_items:
-            event_object = {
-                'event_type': Event.DELETED.value,
-                'object_type': NetStat.SERVICE_IMPORT.value,
-                'object_value': item
-            }
-            event_objects.append(event_object)
+        table, event_objects = self._diff_table(self._import_table, val, NetStat.SERVICE_IMPORT.value)
+        if event_objects:
+            self.set_service_imports(list(table.values()))
 
         return event_objects
 
@@ -373,26 +344,7 @@ class ServiceImport:
         """
         Returns the model properties as a dict
         """
-        result = {}
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_service_id(self):
         """
@@ -401,6 +353,13 @@ class ServiceImport:
         """
         return ''.join([self.cluster_id, self.name, self.namespace])
 
+    def get_service_key(self) -> tuple:
+        """
+        get unique key
+        :return: (tuple) (cluster_id, namespace, name)
+        """
+        return self.cluster_id, self.namespace, self.name
+
     def set_cluster_id(self, val):
         """
         setter
@@ -487,6 +446,13 @@ class ServiceImport:
 
         self.port = val
 
+    def get_port(self):
+        """
+        getter
+        :return: (int) service port
+        """
+        return self.port
+
     def set_protocol(self, val):
         """
         setter
@@ -564,26 +530,7 @@ class ServiceExport:
         """
         Returns the model properties as a dict
         """
-        result = {}
-        for attr, _ in six.iteritems(self.fields):
-            value = getattr(self, attr)
-            if isinstance(value, list):
-                result[attr] = list(map(
-                    lambda x: x.to_dict() if hasattr(x, "to_dict") else x,
-                    value
-                ))
-            elif hasattr(value, "to_dict"):
-                result[attr] = value.to_dict()
-            elif isinstance(value, dict):
-                result[attr] = dict(map(
-                    lambda item: (item[0], item[1].to_dict())
-                    if hasattr(item[1], "to_dict") else item,
-                    value.items()
-                ))
-            else:
-                result[attr] = value
-
-        return result
+        return Serializer.to_dict(self)
 
     def get_service_id(self):
         """
@@ -592,6 +539,13 @@ class ServiceExport:
         """
         return ''.join([self.cluster_id, self.name, self.namespace])
 
+    def get_service_key(self) -> tuple:
+        """
+        get unique key
+        :return: (tuple) (cluster_id, namespace, name)
+        """
+        return self.cluster_id, self.namespace, self.name
+
     def set_cluster_id(self, val):
         """
         setter
@@ -678,6 +632,13 @@ class ServiceExport:
 
         self.port = val
 
+    def get_port(self):
+        """
+        getter
+        :return: (int) service port
+        """
+        return self.port
+
     def set_protocol(self, val):
         """
         setter
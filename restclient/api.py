@@ -1,10 +1,10 @@
 import json
-import requests
 
-from gw_agent import settings
 from gw_agent.common.error import get_exception_traceback
 from gw_agent.settings import get_logger
 from repository.cache.network import NetworkStatusRepository
+from restclient.center import CenterSession
+from utils.serializer import Serializer
 
 logger = get_logger(__name__)
 
@@ -88,7 +88,6 @@ class RestClient:
         if result is None:
             result = ''
 
-        headers = {'Content-Type': 'application/json; charset=utf-8'}
         body = {
             'success': success,
             'error': error,
@@ -98,7 +97,7 @@ class RestClient:
             }
         }
         try:
-            response = requests.put(url=url, headers=headers, data=json.dumps(body), timeout=settings.REST_REQUEST_TIMEOUT)
+            response = CenterSession().put(url=url, data=Serializer.dumps(body))
             if response.status_code == 200:
                 return True, ''
         except Exception as exc:
@@ -125,7 +124,7 @@ class RestClient:
                          '/cluster/{cluster_name}/mcn/diagnosis'.format(cluster_name=cluster_name)
 
         try:
-            response = requests.get(url=url, timeout=settings.REST_REQUEST_TIMEOUT)
+            response = CenterSession().get(url=url)
 
             if response.status_code == 200:
                 body = json.loads(response.content)
@@ -170,7 +169,7 @@ class RestClient:
                          '/mcn/{mc_connect_id}/broker'.format(mc_connect_id=mc_connect_id)
 
         try:
-            response = requests.get(url=url, timeout=settings.REST_REQUEST_TIMEOUT)
+            response = CenterSession().get(url=url)
 
             if response.status_code == 200:
                 body = json.loads(response.content)
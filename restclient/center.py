@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+
+import requests
+import requests.adapters
+
+from gw_agent import settings
+from gw_agent.settings import get_logger
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    raised when circuit to center is open(requests are not sent until reset timeout)
+    subclass of requests.exceptions.ConnectionError, so callers handle it as a connection failure
+    """
+    pass
+
+
+class CenterSession:
+    """
+    shared HTTP session for all center-bound REST calls
+    - keep-alive connections are pooled per host(CENTER_POOL_MAXSIZE)
+    - connection errors and CENTER_RETRY_STATUS responses are retried with jittered exponential backoff;
+      streaming(generator) request bodies are not retried
+    - circuit breaker: open after CENTER_CIRCUIT_FAILURE_THRESHOLD consecutive failures,
+      and let a single trial request through(half-open) after CENTER_CIRCUIT_RESET_TIMEOUT seconds
+    """
+    _logger = None
+    _session = None
+    _lock = threading.Lock()
+    _failures = 0           # consecutive failures
+    _opened_at = None       # monotonic time when circuit is opened; None - closed
+    _trial = False          # True - a trial request is in flight in half-open state
+
+    def __new__(cls, *args, **kwargs):
+        if not hasattr(cls, "_instance"):
+            cls._instance = super().__new__(cls)
+            cls._instance._config()
+
+        return cls._instance
+
+    def _config(self):
+        self._logger = get_logger(__name__)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=settings.CENTER_POOL_CONNECTIONS,
+                                                pool_maxsize=settings.CENTER_POOL_MAXSIZE,
+                                                pool_block=True)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'Content-Type': 'application/json; charset=utf-8'})
+
+    def _acquire(self):
+        """
+        check circuit before request
+        :return:
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            if time.monotonic() - self._opened_at < settings.CENTER_CIRCUIT_RESET_TIMEOUT or self._trial:
+                raise CircuitOpenError('Circuit to center is open')
+
+            # half-open: let a trial request through
+            self._trial = True
+
+    def _record(self, success: bool):
+        """
+        update circuit with request result
+        :param success: (bool)
+        :return:
+        """
+        with self._lock:
+            self._trial = False
+
+            if success:
+                if self._opened_at is not None:
+                    self._logger.info('Circuit to center is closed')
+                self._failures = 0
+                self._opened_at = None
+                return
+
+            self._failures += 1
+            if self._failures >= settings.CENTER_CIRCUIT_FAILURE_THRESHOLD:
+                if self._opened_at is None:
+                    self._logger.error('Circuit to center is open, '
+                                       'consecutive failures={}'.format(self._failures))
+                self._opened_at = time.monotonic()
+
+    def is_available(self) -> bool:
+        """
+        whether circuit to center is closed(or ready to try)
+        :return: (bool)
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            return time.monotonic() - self._opened_at >= settings.CENTER_CIRCUIT_RESET_TIMEOUT
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """
+        get jittered exponential backoff seconds(full jitter)
+        :param attempt: (int) retry attempt, from 0
+        :return: (float) seconds
+        """
+        ceiling = min(settings.CENTER_RETRY_BACKOFF_MAX, settings.CENTER_RETRY_BACKOFF * (2 ** attempt))
+
+        return random.uniform(0, ceiling)
+
+    def request(self, method: str, url: str, retries: int = None, **kwargs) -> requests.Response:
+        """
+        request to center
+        :param method: (str) 'GET', 'PUT', 'POST', 'DELETE'
+        :param url: (str)
+        :param retries: (int) max retries; None - CENTER_RETRY_COUNT
+        :param kwargs: keyword arguments of requests.Session.request(); timeout is REST_REQUEST_TIMEOUT if not set
+        :return: (requests.Response)
+        raise CircuitOpenError, requests.exceptions.ConnectionError, requests.exceptions.Timeout
+        """
+        if retries is None:
+            retries = settings.CENTER_RETRY_COUNT
+
+        # generator body can not be sent again
+        data = kwargs.get('data')
+        if data is not None and not isinstance(data, (bytes, str, dict, list, tuple)):
+            retries = 0
+
+        kwargs.setdefault('timeout', settings.REST_REQUEST_TIMEOUT)
+        attempt = 0
+
+        while True:
+            self._acquire()
+
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(False)
+                if attempt >= retries:
+                    raise
+            except Exception:
+                self._record(False)
+                raise
+            else:
+                if response.status_code not in settings.CENTER_RETRY_STATUS:
+                    self._record(True)
+                    return response
+
+                self._record(False)
+                if attempt >= retries:
+                    return response
+
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """ GET request to center """
+        return self.request('GET', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        """ PUT request to center """
+        return self.request('PUT', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """ POST request to center """
+        return self.request('POST', url, **kwargs)
@@ -0,0 +1,198 @@
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+class Serializer:
+    """
+    model serializer
+    - per-class encoders are generated once from model's 'fields'
+    - dumps() encodes a model object to JSON in a single step(orjson if installed, otherwise json)
+    - iterdumps() encodes a model object to JSON chunks(optionally gzip compressed) for streaming request body
+    """
+    _encoders = {}          # {class: to_dict encoder}
+    _shallow_encoders = {}  # {class: shallow encoder for dumps()}
+
+    @staticmethod
+    def _encode_value(value):
+        """
+        encode field value same as model's reflective to_dict()
+        :param value: (object)
+        :return: (object)
+        """
+        if type(value) in _PRIMITIVE_TYPES:
+            return value
+
+        if isinstance(value, list):
+            return [x.to_dict() if hasattr(x, "to_dict") else x for x in value]
+
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+
+        if isinstance(value, dict):
+            return {k: v.to_dict() if hasattr(v, "to_dict") else v for k, v in value.items()}
+
+        return value
+
+    @classmethod
+    def _compile(cls, model_class, shallow):
+        """
+        generate encoder for model class
+        :param model_class: (class) model class with 'fields'
+        :param shallow: (bool) True - field values are not encoded(encoded later by json default hook)
+        :return: (callable) encoder(obj) -> dict
+        """
+        items = []
+        for attr in model_class.fields.keys():
+            if not attr.isidentifier():
+                raise ValueError('Invalid field name({}) in {}'.format(attr, model_class.__name__))
+            if shallow:
+                items.append('{!r}: obj.{}'.format(attr, attr))
+            else:
+                items.append('{!r}: encode(obj.{})'.format(attr, attr))
+
+        source = 'def encoder(obj):\n    return {' + ', '.join(items) + '}\n'
+        namespace = {'encode': cls._encode_value}
+        exec(source, namespace)
+
+        return namespace['encoder']
+
+    @classmethod
+    def to_dict(cls, obj) -> dict:
+        """
+        Returns the model properties as a dict
+        :param obj: (object) model object with 'fields'
+        :return: (dict)
+        """
+        model_class = type(obj)
+        encoder = cls._encoders.get(model_class)
+
+        if encoder is None:
+            encoder = cls._compile(model_class, False)
+            cls._encoders[model_class] = encoder
+
+        return encoder(obj)
+
+    @classmethod
+    def _default(cls, obj):
+        """
+        json default hook for model objects
+        :param obj: (object)
+        :return: (dict or list)
+        """
+        model_class = type(obj)
+        encoder = cls._shallow_encoders.get(model_class)
+
+        if encoder is None:
+            if not hasattr(model_class, 'fields') or not isinstance(model_class.fields, dict):
+                if hasattr(obj, 'to_dict'):
+                    return obj.to_dict()
+                raise TypeError('Object of type {} is not JSON serializable'.format(model_class.__name__))
+
+            encoder = cls._compile(model_class, True)
+            cls._shallow_encoders[model_class] = encoder
+
+        return encoder(obj)
+
+    @classmethod
+    def dumps(cls, obj) -> bytes:
+        """
+        encode model object(or list, dict of model objects) to JSON
+        :param obj: (object)
+        :return: (bytes) utf-8 encoded JSON
+        """
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=cls._default)
+            except TypeError:
+                # i.e., non-str dict keys, int overflow; retry with json
+                pass
+
+        return json.dumps(obj, default=cls._default).encode('utf-8')
+
+    @classmethod
+    def packb(cls, obj) -> bytes:
+        """
+        encode model object to msgpack
+        :param obj: (object)
+        :return: (bytes)
+        """
+        if msgpack is None:
+            raise SystemError('msgpack is not installed')
+
+        return msgpack.packb(obj, default=cls._default)
+
+    @classmethod
+    def _iterencode(cls, obj, depth):
+        """
+        encode object to JSON fragments; containers are expanded up to depth, deeper values are encoded at once
+        :param obj: (object)
+        :param depth: (int) container depth to expand
+        :return: (generator) bytes
+        """
+        if depth > 0 and hasattr(type(obj), 'fields') and isinstance(type(obj).fields, dict):
+            obj = cls._default(obj)
+
+        if depth <= 0 or not isinstance(obj, (dict, list)):
+            yield cls.dumps(obj)
+            return
+
+        if isinstance(obj, list):
+            yield b'['
+            for index, item in enumerate(obj):
+                if index > 0:
+                    yield b','
+                yield from cls._iterencode(item, depth - 1)
+            yield b']'
+            return
+
+        yield b'{'
+        for index, (key, value) in enumerate(obj.items()):
+            if index > 0:
+                yield b','
+            yield cls.dumps(str(key))
+            yield b':'
+            yield from cls._iterencode(value, depth - 1)
+        yield b'}'
+
+    @classmethod
+    def iterdumps(cls, obj, depth=3, chunk_size=65536, compress=False):
+        """
+        encode model object to JSON incrementally, i.e., streaming(chunked) http request body
+        - containers(dict, list, model object) are expanded up to depth,
+          so only a single list item is encoded in memory at once
+        :param obj: (object)
+        :param depth: (int) container depth to expand
+        :param chunk_size: (int) min bytes per chunk
+        :param compress: (bool) True - gzip compressed chunks
+        :return: (generator) bytes
+        """
+        compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+        buffer = bytearray()
+
+        for fragment in cls._iterencode(obj, depth):
+            buffer += fragment
+            if len(buffer) < chunk_size:
+                continue
+
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+        if compressor:
+            yield compressor.compress(bytes(buffer)) + compressor.flush()
+        elif buffer:
+            yield bytes(buffer)
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+
+class SysfsCounter:
+    """
+    sysfs counter file(i.e., /sys/class/net/<iface>/statistics/rx_bytes) reader
+    - file descriptor is kept open and read with os.pread(), so a read is a single syscall
+    - file is re-opened when read fails(i.e., interface is re-created)
+    """
+    _read_size = 32  # u64 decimal with newline
+
+    def __init__(self, path: str):
+        """
+        SysfsCounter()
+        :param path: (str) sysfs counter file path
+        """
+        self._path = path
+        self._fd = None
+
+    def _open(self):
+        """ open counter file """
+        self.close()
+        self._fd = os.open(self._path, os.O_RDONLY)
+
+    def close(self):
+        """
+        close counter file
+        :return:
+        """
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def read(self) -> int:
+        """
+        read counter
+        :return: (int) counter value
+        raise OSError if counter file is not available, ValueError if value is invalid
+        """
+        if self._fd is None:
+            self._open()
+
+        try:
+            data = os.pread(self._fd, self._read_size, 0)
+        except OSError:
+            # stale descriptor(i.e., interface is re-created), open again
+            self._open()
+            data = os.pread(self._fd, self._read_size, 0)
+
+        return int(data)
+
+
+class InterfaceCounterSampler:
+    """
+    network interface RX/TX bytes sampler
+    - RX/TX counters are read with SysfsCounter(open file descriptors, os.pread())
+    """
+
+    def __init__(self, iface: str):
+        """
+        InterfaceCounterSampler()
+        :param iface: (str) interface name
+        """
+        statistics = '/sys/class/net/{iface}/statistics/'.format(iface=iface)
+        self._iface = iface
+        self._rx = SysfsCounter(statistics + 'rx_bytes')
+        self._tx = SysfsCounter(statistics + 'tx_bytes')
+        self._lock = threading.Lock()
+
+    def get_iface(self) -> str:
+        """
+        getter
+        :return: (str) interface name
+        """
+        return self._iface
+
+    def sample(self) -> (bool, tuple, str):
+        """
+        sample RX/TX bytes
+        :return:
+        (bool) True - success, False - fail
+        (tuple) ((float) timestamp, (int) rx_bytes, (int) tx_bytes)
+        (str) error reason
+        """
+        with self._lock:
+            try:
+                timestamp = time.time()
+                rx_bytes = self._rx.read()
+                tx_bytes = self._tx.read()
+            except (OSError, ValueError) as exc:
+                self.close()
+                return False, None, 'Fail to read {} counters, caused by {}'.format(self._iface, exc)
+
+        return True, (timestamp, rx_bytes, tx_bytes), None
+
+    def close(self):
+        """
+        close counter files
+        :return:
+        """
+        self._rx.close()
+        self._tx.close()